@@ -0,0 +1,205 @@
+"""Benchmark duplicate detection against the size of the posted-score history.
+
+Fills `posted_scores` with 10, 1k, 10k and 100k realistic goal records (the
+shape `process_submission` stores) and times `find_duplicate_score` for a
+mix of lookups: reposts of a stored goal on another mirror with the usual
+title variations (team alias, abbreviated scorer, minute off by one), new
+goals, and non-goal titles. Reports lookup latency and the memory held by
+the history per entry.
+
+An alternative implementation with the same signature can be given with
+`--impl module:function`. The harness then checks it for accuracy on every
+case of tests/test_comprehensive_duplicates.py and
+tests/test_duplicate_detection.py, compares its answer with the current
+implementation for every timed lookup up to `--equivalence-max` entries, and
+times it instead.
+
+Usage:
+    python -m benchmarks.bench_dedup_scaling --sizes 10 1000 10000 100000
+    python -m benchmarks.bench_dedup_scaling --impl mymodule:find_duplicate_score
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import logging
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+from src.config.teams import premier_league_teams
+from src.utils.logger import app_logger
+from src.utils.score_utils import find_duplicate_score
+from simulation.fake_reddit import MIRROR_URLS
+from simulation.replay import percentiles
+
+OTHER_TEAMS = ['Real Madrid', 'Barcelona', 'Bayern Munich', 'Inter', 'PSG', 'Celtic', 'Benfica', 'Ajax']
+PLAYERS = [('Bukayo', 'Saka'), ('Mohamed', 'Salah'), ('Erling', 'Haaland'), ('Cole', 'Palmer'), ('Alexander', 'Isak'),
+           ('Ollie', 'Watkins'), ('Heung-min', 'Son'), ('Bryan', 'Mbeumo'), ('Bruno', 'Fernandes'), ('Luis', 'Díaz'),
+           ('Alexis', 'Mac Allister'), ('Gabriel', 'Jesus'), ('Jarrod', 'Bowen'), ('Dominic', 'Solanke')]
+START = datetime(2024, 8, 16, 19, 0, tzinfo=timezone.utc)
+
+def goal_title(rng: random.Random, teams: List[str]) -> str:
+    """A goal title with random teams, score state, scorer and minute."""
+    home, away = rng.sample(teams, 2)
+    if rng.random() < 0.1:
+        away = rng.choice(OTHER_TEAMS)  # Cup and European games
+    home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+    score = f"[{home_goals}] - {away_goals}" if rng.random() < 0.5 else f"{home_goals} - [{away_goals}]"
+    first, last = rng.choice(PLAYERS)
+    minute = f"{rng.randint(1, 90)}'" if rng.random() < 0.92 else f"90+{rng.randint(1, 6)}'"
+    return f"{home} {score} {away} - {first} {last} {minute}"
+
+def repost_title(rng: random.Random, title: str) -> str:
+    """The same goal as posted by someone else: alias, abbreviated scorer or nearby minute."""
+    variation = rng.random()
+    if variation < 0.3:
+        for team in premier_league_teams.values():
+            if title.startswith(team['name']) and team['aliases']:
+                return rng.choice(team['aliases']) + title[len(team['name']):]
+    if variation < 0.6:
+        for first, last in PLAYERS:
+            if f"{first} {last}" in title:
+                return title.replace(f"{first} {last}", f"{first[0]}. {last}")
+    if variation < 0.8 and "+" not in title:
+        minute = int(title.rsplit(' ', 1)[1].rstrip("'"))
+        return f"{title.rsplit(' ', 1)[0]} {max(1, minute + rng.choice((-1, 1)))}'"
+    return title
+
+def build_history(size: int, seed: int = 0) -> Dict[str, Dict[str, str]]:
+    """Posted scores of `size` goals, one every few minutes of a season."""
+    rng = random.Random(seed)
+    teams = [team['name'] for team in premier_league_teams.values()]
+    posted_scores = {}
+    moment = START
+    while len(posted_scores) < size:
+        moment += timedelta(seconds=rng.randint(30, 600))
+        clip = f"{rng.getrandbits(32):08x}"
+        posted_scores[goal_title(rng, teams)] = {
+            'timestamp': moment.isoformat(),
+            'url': rng.choice(MIRROR_URLS).format(id=clip),
+            'reddit_url': f"https://www.reddit.com/r/soccer/comments/{clip}/"
+        }
+    return posted_scores
+
+def build_lookups(posted_scores: Dict[str, Dict[str, str]], count: int, seed: int = 1) -> List[str]:
+    """Reposts of recent goals, new goals and non-goal titles, in equal parts."""
+    rng = random.Random(seed)
+    teams = [team['name'] for team in premier_league_teams.values()]
+    recent = list(posted_scores)[-50:]
+    lookups = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            lookups.append(repost_title(rng, rng.choice(recent)))
+        elif kind == 1:
+            lookups.append(goal_title(rng, teams))
+        else:
+            lookups.append(f"Post Match Thread: {' 2-1 '.join(rng.sample(teams, 2))}")
+    return lookups
+
+def history_bytes(size: int, seed: int) -> int:
+    """Memory held by a history of `size` entries."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        posted_scores = build_history(size, seed)
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del posted_scores
+    return held
+
+def load_impl(spec: str) -> Callable:
+    """Import `module:function`."""
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), function_name or 'find_duplicate_score')
+
+def check_accuracy(impl: Callable) -> Dict[str, List[str]]:
+    """Run the duplicate-detection test cases against an implementation.
+
+    Returns:
+        dict: 'passed' and 'failed' case descriptions
+    """
+    from tests import test_comprehensive_duplicates, test_duplicate_detection
+
+    def is_duplicate(title, posted_scores, timestamp, url=None) -> bool:
+        return impl(title, posted_scores, timestamp, url) is not None
+
+    report = {'passed': [], 'failed': []}
+    now = datetime.now(timezone.utc)
+    for case in test_comprehensive_duplicates.test_cases:
+        for first, second in ((case['title1'], case['title2']), (case['title2'], case['title1'])):
+            posted_scores = {first: {'timestamp': now.isoformat(), 'url': 'https://example.com/1'}}
+            outcome = is_duplicate(second, posted_scores, now, 'https://example.com/2')
+            label = f"comprehensive: {case['reason']}: {second!r} vs {first!r}"
+            report['passed' if outcome == case['should_match'] else 'failed'].append(label)
+
+    # test_duplicate_detection keeps its cases inside the test, which returns False on the first failure
+    with mock.patch.object(test_duplicate_detection, 'is_duplicate_score', is_duplicate), \
+            contextlib.redirect_stdout(io.StringIO()):
+        passed = test_duplicate_detection.test_duplicate_detection()
+    report['passed' if passed else 'failed'].append('test_duplicate_detection: all cases')
+    return report
+
+def run(sizes: List[int], lookups: int, max_seconds: float, impl: Callable, reference: Optional[Callable],
+        equivalence_max: int, seed: int) -> List[Dict]:
+    """Time lookups for every history size."""
+    rows = []
+    for size in sizes:
+        posted_scores = build_history(size, seed)
+        titles = build_lookups(posted_scores, lookups)
+        latencies, duplicates, mismatches = [], 0, 0
+        started = time.perf_counter()
+        for title in titles:
+            start = time.perf_counter()
+            found = impl(title, posted_scores, START, None)
+            latencies.append(time.perf_counter() - start)
+            duplicates += found is not None
+            if reference is not None and size <= equivalence_max:
+                mismatches += reference(title, posted_scores, START, None) != found
+            # Keep the largest histories within budget; every lookup kind still runs
+            if time.perf_counter() - started > max_seconds and len(latencies) >= 3:
+                break
+        rows.append({
+            'size': size,
+            'lookups': len(latencies),
+            'duplicates': duplicates,
+            'latency': percentiles(latencies),
+            'bytes_per_entry': history_bytes(size, seed) / size,
+            'mismatches': mismatches if reference is not None and size <= equivalence_max else None
+        })
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Duplicate detection scaling benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000, 100000], help='History sizes')
+    parser.add_argument('--lookups', type=int, default=60, help='Lookups per size')
+    parser.add_argument('--max-seconds', type=float, default=20.0, help='Time budget per size')
+    parser.add_argument('--impl', help='Implementation to benchmark as module:function (default: current)')
+    parser.add_argument('--equivalence-max', type=int, default=10000,
+                        help='Largest size at which --impl is compared with the current implementation')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    app_logger.setLevel(logging.ERROR)
+    impl = load_impl(args.impl) if args.impl else find_duplicate_score
+    reference = find_duplicate_score if args.impl else None
+
+    accuracy = check_accuracy(impl)
+    print(f"Accuracy: {len(accuracy['passed'])} passed, {len(accuracy['failed'])} failed")
+    for failure in accuracy['failed']:
+        print(f"  FAILED {failure}")
+
+    print(f"\n{'entries':>8} {'lookups':>8} {'dups':>5} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10} {'B/entry':>8}"
+          + (f" {'mismatches':>11}" if reference else ''))
+    for row in run(args.sizes, args.lookups, args.max_seconds, impl, reference, args.equivalence_max, args.seed):
+        latency = row['latency']
+        line = (f"{row['size']:>8,} {row['lookups']:>8} {row['duplicates']:>5} {latency['p50']:>10,.3f} "
+                f"{latency['p99']:>10,.3f} {latency['max']:>10,.3f} {row['bytes_per_entry']:>8,.0f}")
+        if reference:
+            line += f" {'-' if row['mismatches'] is None else row['mismatches']:>11}"
+        print(line)
@@ -0,0 +1,84 @@
+"""Benchmark Discord delivery during a goal burst against the local webhook stand-in.
+
+Fires `--goals` goal posts at once (each followed by its MP4 link, as the bot
+does when the MP4 is already known) through `post_to_discord` and
+`post_mp4_link`. The webhook enforces a bucket of `--limit` requests per
+`--window` seconds. Reports messages delivered and lost, 429s received, total
+time, throughput, per-message latency and whether each goal arrived in order
+and before its MP4 link.
+
+Usage:
+    python -m benchmarks.bench_discord_delivery --goals 20 --limit 5 --window 2
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from unittest import mock
+from src.services import discord_service
+from src.utils.logger import webhook_logger
+from simulation.fake_discord import FakeDiscordWebhook
+from simulation.replay import percentiles
+
+async def burst(goals: int, limit: int, window: float) -> dict:
+    """Send a burst of goals and their MP4 links and collect the results."""
+    server = FakeDiscordWebhook(limit=limit, window=window)
+    await server.start()
+    latencies = []
+
+    async def deliver(i: int) -> list:
+        title = f"Arsenal [{i + 1}] - 0 Chelsea - Saka {i + 1}'"
+        start = time.perf_counter()
+        posted = await discord_service.post_to_discord(
+            f"{title}\nhttps://streamff.live/v/{i}\nhttps://reddit.com/r/soccer/comments/{i}/")
+        latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        mp4 = await discord_service.post_mp4_link(title, f"https://ffedge.streamff.com/uploads/{i}.mp4")
+        latencies.append(time.perf_counter() - start)
+        return [posted, mp4]
+
+    try:
+        with mock.patch.object(discord_service, 'DISCORD_WEBHOOK_URL', server.webhook_url()):
+            start = time.perf_counter()
+            results = await asyncio.gather(*(deliver(i) for i in range(goals)))
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.stop()
+
+    # Goal i's messages, in the order the webhook accepted them
+    order = []
+    for message in server.messages:
+        if message['embeds']:
+            order.append(('goal', int(message['embeds'][0]['description'].split('/v/')[1].split()[0])))
+        else:
+            order.append(('mp4', int(message['content'].rsplit('/', 1)[1].split('.')[0])))
+    goal_order = [i for kind, i in order if kind == 'goal']
+    mp4_before_goal = sum(1 for i in range(goals)
+                          if ('mp4', i) in order and ('goal', i) in order and order.index(('mp4', i)) < order.index(('goal', i)))
+    return {
+        'sent': 2 * goals,
+        'delivered': len(server.messages),
+        'reported_ok': sum(ok for pair in results for ok in pair),
+        'rate_limited': server.stats['rate_limited'],
+        'seconds': elapsed,
+        'goals_in_order': goal_order == sorted(goal_order),
+        'mp4_before_goal': mp4_before_goal,
+        'latency': percentiles(latencies)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Discord delivery benchmark')
+    parser.add_argument('--goals', type=int, default=20, help='Goals in the burst (two messages each)')
+    parser.add_argument('--limit', type=int, default=5, help='Webhook requests per window')
+    parser.add_argument('--window', type=float, default=2.0, help='Bucket window in seconds')
+    args = parser.parse_args()
+
+    webhook_logger.setLevel(logging.ERROR)
+    result = asyncio.run(burst(args.goals, args.limit, args.window))
+    print(f"Burst of {args.goals} goals ({result['sent']} messages), bucket {args.limit} per {args.window}s")
+    print(f"Delivered:        {result['delivered']}/{result['sent']} (sender reported {result['reported_ok']} ok)")
+    print(f"429 responses:    {result['rate_limited']}")
+    print(f"Total time:       {result['seconds']:.2f}s ({result['delivered'] / result['seconds']:.1f} msg/s)")
+    print(f"Goals in order:   {result['goals_in_order']}, MP4 before its goal: {result['mp4_before_goal']}")
+    print(f"Latency (ms):     {result['latency']}")
@@ -0,0 +1,74 @@
+"""Benchmark time-to-MP4 of VideoExtractor against the local mirror stand-in.
+
+For every host layout (streamff, streamin, dubz, streamable) and scripted
+behaviour (ready, 404 until T, slow headers, HEAD rejected, HTML placeholder
+until T), a clip is added to `simulation/fake_mirrors.py` and
+`VideoExtractor.extract_mp4_url` is retried every `--interval` seconds until it
+returns an MP4. Reports the time until the MP4 was found, the attempts and the
+HTTP requests it took. No network access is needed.
+
+Usage:
+    python -m benchmarks.bench_mirror_extraction --available-after 2 --interval 0.5
+"""
+
+import argparse
+import logging
+import time
+from unittest import mock
+from src.services import video_service
+from src.services.video_service import VideoExtractor
+from src.utils.host_health import HostHealthRegistry
+from src.utils.logger import app_logger
+from src.utils.url_templates import UrlTemplateStore
+from simulation.fake_mirrors import PAGE_URLS, Behaviour, FakeMirrors, mirror_session
+
+def behaviours(available_after: float, header_delay: float):
+    return {
+        'ready': Behaviour(),
+        '404 until T': Behaviour(available_after=available_after),
+        'slow headers': Behaviour(header_delay=header_delay),
+        'HEAD rejected': Behaviour(head_rejected=True),
+        'placeholder until T': Behaviour(available_after=available_after, placeholder=True)
+    }
+
+def time_to_mp4(extractor: VideoExtractor, url: str, interval: float, timeout: float) -> dict:
+    """Retry extraction until an MP4 is found or `timeout` passes."""
+    start = time.perf_counter()
+    attempts = 0
+    while True:
+        attempts += 1
+        mp4_url = extractor.extract_mp4_url(url)
+        elapsed = time.perf_counter() - start
+        if mp4_url or elapsed >= timeout:
+            return {'found': bool(mp4_url), 'seconds': elapsed, 'attempts': attempts}
+        time.sleep(interval)
+
+def run(available_after: float, header_delay: float, interval: float, timeout: float) -> None:
+    """Run every host and behaviour and print the results."""
+    print(f"T = {available_after}s, slow headers = {header_delay}s, retry interval = {interval}s")
+    print(f"{'host':<12} {'behaviour':<20} {'time to MP4 (ms)':>17} {'attempts':>9} {'requests':>9}")
+    with FakeMirrors() as mirrors:
+        for host in PAGE_URLS:
+            for name, behaviour in behaviours(available_after, header_delay).items():
+                # Fresh learned templates and host health for every case
+                with mock.patch.object(video_service, 'url_templates', UrlTemplateStore(filename=None)), \
+                        mock.patch.object(video_service, 'host_health', HostHealthRegistry()):
+                    extractor = VideoExtractor(session=mirror_session(mirrors))
+                    url = mirrors.add_clip(host, f"{host}-{name.replace(' ', '-')}", behaviour)
+                    requests_before = sum(mirrors.requests.values())
+                    result = time_to_mp4(extractor, url, interval, timeout)
+                    requests = sum(mirrors.requests.values()) - requests_before
+                found = f"{result['seconds'] * 1000:,.0f}" if result['found'] else 'not found'
+                print(f"{host:<12} {name:<20} {found:>17} {result['attempts']:>9} {requests:>9}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Mirror extraction benchmark')
+    parser.add_argument('--available-after', type=float, default=2.0, help='T for the delayed behaviours (s)')
+    parser.add_argument('--header-delay', type=float, default=1.0, help='Delay before response headers (s)')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between extraction attempts')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Give up after this many seconds')
+    args = parser.parse_args()
+
+    # Misses are logged as warnings; keep the table readable
+    app_logger.setLevel(logging.ERROR)
+    run(args.available_after, args.header_delay, args.interval, args.timeout)
@@ -0,0 +1,126 @@
+"""Benchmark listing ingestion: asyncpraw models vs raw JSON snapshots.
+
+Parses a synthetic /r/<sub>/new listing shaped like Reddit's (about 100
+fields per item) and reports CPU time and retained memory per 1k items for:
+
+- asyncpraw: json.loads + Objector building Submission models (the default path)
+- snapshots (json): json.loads + SubmissionSnapshot
+- snapshots (orjson): orjson.loads + SubmissionSnapshot (if orjson is installed)
+
+Usage:
+    python -m benchmarks.bench_reddit_ingestion --items 1000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import time
+import tracemalloc
+import asyncpraw
+from src.services.reddit_json import SubmissionSnapshot
+from src.utils.logger import app_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fields of a typical listing item that the bot never reads
+FILLER_FIELDS = (
+    'approved_at_utc', 'selftext', 'author_fullname', 'saved', 'mod_reason_title', 'gilded', 'clicked',
+    'link_flair_richtext', 'subreddit_name_prefixed', 'hidden', 'pwls', 'link_flair_css_class', 'downs',
+    'thumbnail_height', 'top_awarded_type', 'hide_score', 'name', 'quarantine', 'link_flair_text_color',
+    'upvote_ratio', 'author_flair_background_color', 'ups', 'total_awards_received', 'thumbnail_width',
+    'author_flair_template_id', 'is_original_content', 'user_reports', 'is_reddit_media_domain', 'is_meta',
+    'category', 'link_flair_text', 'can_mod_post', 'score', 'approved_by', 'is_created_from_ads_ui',
+    'author_premium', 'thumbnail', 'edited', 'author_flair_css_class', 'author_flair_richtext', 'gildings',
+    'post_hint', 'content_categories', 'is_self', 'subreddit_type', 'created', 'link_flair_type', 'wls',
+    'removed_by_category', 'banned_by', 'author_flair_type', 'domain', 'allow_live_comments', 'selftext_html',
+    'likes', 'suggested_sort', 'banned_at_utc', 'url_overridden_by_dest', 'view_count', 'archived', 'no_follow',
+    'is_crosspostable', 'pinned', 'over_18', 'all_awardings', 'awarders', 'media_only', 'link_flair_template_id',
+    'can_gild', 'spoiler', 'locked', 'author_flair_text', 'treatment_tags', 'visited', 'removed_by',
+    'mod_note', 'distinguished', 'subreddit_id', 'author_is_blocked', 'mod_reason_by', 'num_reports',
+    'removal_reason', 'link_flair_background_color', 'is_robot_indexable', 'report_reasons', 'author',
+    'discussion_type', 'num_comments', 'send_replies', 'contest_mode', 'mod_reports', 'author_patreon_flair',
+    'author_flair_text_color', 'stickied', 'subreddit_subscribers', 'num_crossposts', 'is_video'
+)
+
+def make_listing(items: int) -> bytes:
+    """Build a listing JSON document with `items` goal posts."""
+    children = []
+    for i in range(items):
+        data = {name: f"value-{name}-{i % 7}" for name in FILLER_FIELDS}
+        data.update({
+            'id': f"t{i:06x}",
+            'title': f"Arsenal [{i % 5}] - 0 Chelsea - Bukayo Saka {i % 90}'",
+            'url': f"https://streamff.live/v/{i:08x}",
+            'permalink': f"/r/soccer/comments/t{i:06x}/arsenal_1_0_chelsea/",
+            'created_utc': 1_700_000_000.0 + i,
+            'subreddit': 'soccer',
+            'media': None,
+            'secure_media': None,
+            'media_embed': {},
+            'secure_media_embed': {},
+            'preview': {'images': [{'source': {'url': f"https://external-preview.redd.it/{i}.jpg", 'width': 1280, 'height': 720},
+                                    'resolutions': [{'url': f"https://external-preview.redd.it/{i}-{w}.jpg", 'width': w}
+                                                    for w in (108, 216, 320, 640, 960)],
+                                    'variants': {}, 'id': f"img{i}"}], 'enabled': False},
+        })
+        children.append({'kind': 't3', 'data': data})
+    return json.dumps({'kind': 'Listing', 'data': {'after': None, 'dist': items, 'children': children}}).encode()
+
+def measure(parse, payload: bytes, rounds: int) -> dict:
+    """Time `parse` over `rounds` runs and measure the memory its result retains."""
+    parse(payload)  # Warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parse(payload)
+    seconds = (time.perf_counter() - start) / rounds
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = parse(payload)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return {'seconds': seconds, 'bytes': retained}
+
+async def run(items: int, rounds: int) -> None:
+    """Run all parsers and print per-1k-item results."""
+    payload = make_listing(items)
+    reddit = asyncpraw.Reddit(client_id='bench', client_secret='bench', user_agent='bench', check_for_updates=False)
+
+    def parse_asyncpraw(data: bytes):
+        return list(reddit._objector.objectify(data=json.loads(data)).children)
+
+    def parse_snapshots_json(data: bytes):
+        return [SubmissionSnapshot.from_data(child['data']) for child in json.loads(data)['data']['children']]
+
+    parsers = {'asyncpraw': parse_asyncpraw, 'snapshots (json)': parse_snapshots_json}
+    if orjson is not None:
+        parsers['snapshots (orjson)'] = lambda data: [
+            SubmissionSnapshot.from_data(child['data']) for child in orjson.loads(data)['data']['children']
+        ]
+
+    print(f"Listing: {items} items, {len(payload) / 1024:,.0f} KiB of JSON, {rounds} rounds")
+    print(f"{'parser':<20} {'ms / 1k items':>14} {'KiB kept / 1k items':>20}")
+    for name, parse in parsers.items():
+        result = measure(parse, payload, rounds)
+        scale = 1000 / items
+        print(f"{name:<20} {result['seconds'] * 1000 * scale:>14.2f} {result['bytes'] / 1024 * scale:>20,.0f}")
+    if orjson is None:
+        print("orjson not installed; skipped")
+    await reddit.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Reddit listing ingestion benchmark')
+    parser.add_argument('--items', type=int, default=1000, help='Listing items to parse')
+    parser.add_argument('--rounds', type=int, default=20, help='Timed parses per parser')
+    args = parser.parse_args()
+
+    app_logger.setLevel(logging.WARNING)
+    asyncio.run(run(args.items, args.rounds))
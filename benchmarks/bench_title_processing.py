@@ -0,0 +1,217 @@
+"""Microbenchmarks of the title-processing hot path.
+
+Runs every function each submission goes through before dedup over a corpus
+of r/soccer titles and URLs: synthetic goal and non-goal posts, plus the
+titles of a recording made with RECORD_SUBMISSIONS_FILE if one is given.
+Reports per function:
+
+- ns/op: mean wall time per call over the whole corpus (best of --repeat runs)
+- B/op: mean bytes allocated by one call, measured with tracemalloc as the
+  peak heap growth during the call on a sample of the corpus
+- retained B: heap still held after the sample (caches growing per input)
+
+`--save FILE` stores the results as a baseline, `--compare FILE` compares
+against one and exits with status 1 when any function is more than
+`--tolerance` slower or allocates more than that much extra.
+
+Usage:
+    python -m benchmarks.bench_title_processing --size 100000
+    python -m benchmarks.bench_title_processing --compare benchmarks/baselines/title_processing.json
+    python -m benchmarks.bench_title_processing --recorded data/recording.jsonl --save my-baseline.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from src.main import contains_excluded_term, contains_goal_keyword
+from src.config.teams import premier_league_teams
+from src.services.reddit_service import find_team_in_title
+from src.utils.logger import app_logger
+from src.utils.score_utils import extract_goal_info, normalize_team_name
+from src.utils.url_utils import extract_base_domain, get_base_domain
+from simulation.fake_reddit import MIRROR_URLS, load_submissions
+
+DEFAULT_BASELINE = 'benchmarks/baselines/title_processing.json'
+
+PLAYERS = ['Saka', 'Salah', 'Haaland', 'Palmer', 'Isak', 'Watkins', 'Son', 'Mbeumo', 'Fernandes', 'Ødegaard',
+           'Gabriel Jesus', 'Mac Allister', 'Calvert-Lewin', 'Szoboszlai']
+ALIASES = ['Man Utd', 'Man City', 'Spurs', 'Wolves', "Nott'm Forest", 'Brighton & Hove Albion', 'West Ham United',
+           'Newcastle Utd', 'AFC Bournemouth', 'Leicester City']
+OTHER_TEAMS = ['Real Madrid', 'Barcelona', 'Bayern Munich', 'Inter', 'PSG', 'Celtic', 'Arsenal Women',
+               'Chelsea U21', 'Benfica', 'Ajax']
+NON_GOAL_TITLES = [
+    'Match Thread: {} vs {} | English Premier League',
+    'Post Match Thread: {} 2-1 {} | English Premier League',
+    '{} are interested in signing a {} defender [Fabrizio Romano]',
+    '[Ornstein] {} in talks with {} over loan deal',
+    '{} manager press conference ahead of the {} game',
+    'Daily Discussion - {} and {} fans welcome',
+    'Test post please ignore {} {}',
+    '{} red card against {} ⚠️',
+]
+OTHER_URLS = ('https://www.reddit.com/r/soccer/comments/{id}/', 'https://twitter.com/FabrizioRomano/status/{id}',
+              'https://www.bbc.co.uk/sport/football/{id}', 'https://v.redd.it/{id}', 'https://streamable.com/{id}')
+
+def synthetic_corpus(size: int, seed: int = 0, goal_ratio: float = 0.4) -> List[Dict[str, str]]:
+    """Generate titles, URLs and team names shaped like r/soccer posts.
+
+    Goal posts mix Premier League names, common aliases and other clubs, both
+    score layouts, unicode player names and stoppage-time minutes.
+    """
+    rng = random.Random(seed)
+    teams = [team['name'] for team in premier_league_teams.values()]
+    corpus = []
+    for i in range(size):
+        home, away = rng.sample(teams, 2)
+        roll = rng.random()
+        if roll < 0.15:
+            home = rng.choice(ALIASES)
+        elif roll < 0.25:
+            home, away = rng.sample(OTHER_TEAMS, 2)
+        if rng.random() < goal_ratio:
+            home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+            score = f"[{home_goals}] - {away_goals}" if rng.random() < 0.5 else f"{home_goals} - [{away_goals}]"
+            minute = f"{rng.randint(1, 90)}'" if rng.random() < 0.9 else f"90+{rng.randint(1, 6)}'"
+            title = f"{home} {score} {away} - {rng.choice(PLAYERS)} {minute}"
+            if rng.random() < 0.1:
+                title += rng.choice([' (penalty)', ' great goal', ' ‎', ' [+ 2nd angle]'])
+            url = rng.choice(MIRROR_URLS).format(id=f"{rng.getrandbits(32):08x}")
+        else:
+            title = rng.choice(NON_GOAL_TITLES).format(home, away)
+            url = rng.choice(OTHER_URLS).format(id=f"{rng.getrandbits(40):010x}")
+        corpus.append({'title': title, 'url': url, 'team': home})
+    return corpus
+
+def recorded_corpus(filename: str) -> List[Dict[str, str]]:
+    """Titles and URLs of a submission recording."""
+    corpus = []
+    for record in load_submissions(filename):
+        title = record.get('title') or ''
+        corpus.append({'title': title, 'url': record.get('url') or '', 'team': title.split(' [')[0].split(' - ')[0][:40]})
+    return corpus
+
+# Benchmarked functions and the corpus field each one takes
+FUNCTIONS: Dict[str, tuple] = {
+    'contains_goal_keyword': (contains_goal_keyword, 'title'),
+    'contains_excluded_term': (contains_excluded_term, 'title'),
+    'find_team_in_title': (find_team_in_title, 'title'),
+    'extract_goal_info': (extract_goal_info, 'title'),
+    'normalize_team_name': (normalize_team_name, 'team'),
+    'get_base_domain': (get_base_domain, 'url'),
+    'extract_base_domain': (extract_base_domain, 'url'),
+}
+
+def time_per_op(fn: Callable, inputs: List[str], repeat: int) -> float:
+    """Best mean nanoseconds per call over `repeat` passes."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for value in inputs:
+            fn(value)
+        elapsed = (time.perf_counter_ns() - start) / len(inputs)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def allocations_per_op(fn: Callable, inputs: List[str]) -> tuple:
+    """Mean bytes allocated per call and bytes retained after all calls."""
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        allocated = 0
+        for value in inputs:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(value)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+        retained = tracemalloc.get_traced_memory()[0] - start_current
+    finally:
+        tracemalloc.stop()
+    return allocated / len(inputs), retained
+
+def run(corpus: List[Dict[str, str]], repeat: int = 1, sample: int = 2000, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Benchmark every function over the corpus."""
+    rng = random.Random(1)
+    sampled = rng.sample(corpus, min(sample, len(corpus)))
+    results = {}
+    for name, (fn, field) in FUNCTIONS.items():
+        if only and name not in only:
+            continue
+        inputs = [item[field] for item in corpus]
+        for value in inputs[:100]:  # Warm up caches and compiled patterns
+            fn(value)
+        bytes_per_op, retained = allocations_per_op(fn, [item[field] for item in sampled])
+        results[name] = {
+            'ns_per_op': round(time_per_op(fn, inputs, repeat), 1),
+            'bytes_per_op': round(bytes_per_op, 1),
+            'retained_bytes': retained
+        }
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Regressions of `results` against `baseline` beyond `tolerance` (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['ns_per_op'] > base['ns_per_op'] * (1 + tolerance):
+            regressions.append(f"{name}: {result['ns_per_op']:,.0f} ns/op vs {base['ns_per_op']:,.0f} baseline")
+        # Small absolute slack: tracemalloc's own bookkeeping varies by a few blocks
+        if result['bytes_per_op'] > base['bytes_per_op'] * (1 + tolerance) + 64:
+            regressions.append(f"{name}: {result['bytes_per_op']:,.0f} B/op vs {base['bytes_per_op']:,.0f} baseline")
+    return regressions
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+    print(f"{'function':<24} {'ns/op':>10} {'B/op':>9} {'retained B':>11}" + (f" {'vs baseline':>12}" if baseline else ''))
+    for name, result in results.items():
+        line = f"{name:<24} {result['ns_per_op']:>10,.0f} {result['bytes_per_op']:>9,.0f} {result['retained_bytes']:>11,}"
+        if baseline and name in baseline:
+            change = result['ns_per_op'] / baseline[name]['ns_per_op'] - 1
+            line += f" {change:>+11.0%}"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Title-processing microbenchmarks')
+    parser.add_argument('--size', type=int, default=100_000, help='Synthetic titles in the corpus')
+    parser.add_argument('--recorded', help='Also include the titles of a submission recording (JSONL)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='Timing passes per function (best is kept)')
+    parser.add_argument('--sample', type=int, default=2000, help='Calls measured with tracemalloc per function')
+    parser.add_argument('--only', nargs='+', choices=list(FUNCTIONS), help='Benchmark only these functions')
+    parser.add_argument('--save', metavar='FILE', help='Store the results as a baseline')
+    parser.add_argument('--compare', metavar='FILE', nargs='?', const=DEFAULT_BASELINE, help='Fail on regressions against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed regression as a fraction (default 0.25)')
+    args = parser.parse_args()
+
+    app_logger.setLevel(logging.ERROR)
+    corpus = synthetic_corpus(args.size, args.seed)
+    if args.recorded:
+        corpus = recorded_corpus(args.recorded) + corpus
+    print(f"Corpus: {len(corpus):,} titles ({args.size:,} synthetic{', plus ' + args.recorded if args.recorded else ''})")
+
+    results = run(corpus, args.repeat, args.sample, args.only)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'corpus': {'size': args.size, 'seed': args.seed, 'recorded': args.recorded},
+                       'python': sys.version.split()[0], 'results': results}, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
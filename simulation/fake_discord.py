@@ -0,0 +1,189 @@
+"""Local Discord webhook stand-in with rate-limit emulation.
+
+Accepts webhook executions (POST /api/webhooks/<id>/<token>, `?wait=true`
+returns the created message) and message edits
+(PATCH /api/webhooks/<id>/<token>/messages/<message_id>). Every webhook has
+its own bucket of `limit` requests per `window` seconds. Over the limit it
+answers 429 with `Retry-After`, a JSON `retry_after`, and the
+`X-RateLimit-*` headers Discord sends, so the bot's handling can be tested
+and benchmarked. Messages are recorded in the order they were accepted.
+
+Point the bot at it with DISCORD_WEBHOOK_URL:
+
+    python -m simulation.fake_discord --port 8082 --limit 5 --window 2
+    DISCORD_WEBHOOK_URL=http://127.0.0.1:8082/api/webhooks/1/token python -m src.main
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import time
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+
+class Bucket:
+    """Fixed-window request bucket of one webhook."""
+
+    __slots__ = ('limit', 'window', 'reset_at', 'remaining')
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.reset_at = 0.0
+        self.remaining = limit
+
+    def take(self, now: float) -> bool:
+        """Use one request from the bucket, if any are left."""
+        if now >= self.reset_at:
+            self.reset_at = now + self.window
+            self.remaining = self.limit
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+class FakeDiscordWebhook:
+    """aiohttp application imitating Discord's webhook endpoints."""
+
+    def __init__(self, limit: int = 5, window: float = 2.0, latency: float = 0.0):
+        """Initialize the server.
+
+        Args:
+            limit (int): Requests per webhook per window
+            window (float): Bucket window in seconds
+            latency (float): Seconds added to every response
+        """
+        self.limit = limit
+        self.window = window
+        self.latency = latency
+        self.buckets: Dict[str, Bucket] = {}
+        self.messages: List[Dict[str, Any]] = []
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'requests': 0, 'created': 0, 'edited': 0, 'rate_limited': 0, 'invalid': 0}
+        self._ids = itertools.count(1_000_000_000_000_000_000)
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+    def webhook_url(self, webhook_id: str = '1', token: str = 'token') -> str:
+        return f"{self.base_url}/api/webhooks/{webhook_id}/{token}"
+
+    def _rate_headers(self, key: str, bucket: Bucket, now: float) -> Dict[str, str]:
+        return {
+            'X-RateLimit-Limit': str(bucket.limit),
+            'X-RateLimit-Remaining': str(bucket.remaining),
+            'X-RateLimit-Reset': f"{time.time() + bucket.reset_at - now:.3f}",
+            'X-RateLimit-Reset-After': f"{max(0.0, bucket.reset_at - now):.3f}",
+            'X-RateLimit-Bucket': key
+        }
+
+    async def _limited(self, request: web.Request):
+        """Apply the webhook's bucket; returns (429 response or None, rate-limit headers)."""
+        self.stats['requests'] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        key = request.match_info['webhook_id']
+        bucket = self.buckets.setdefault(key, Bucket(self.limit, self.window))
+        now = time.monotonic()
+        allowed = bucket.take(now)
+        headers = self._rate_headers(key, bucket, now)
+        if allowed:
+            return None, headers
+        self.stats['rate_limited'] += 1
+        retry_after = max(0.0, bucket.reset_at - now)
+        headers['Retry-After'] = str(math.ceil(retry_after))
+        headers['X-RateLimit-Scope'] = 'user'
+        body = {'message': 'You are being rate limited.', 'retry_after': round(retry_after, 3), 'global': False}
+        return web.json_response(body, status=429, headers=headers), headers
+
+    async def execute(self, request: web.Request) -> web.Response:
+        """POST a message to the webhook."""
+        limited, headers = await self._limited(request)
+        if limited is not None:
+            return limited
+        payload = await request.json()
+        if not payload.get('content') and not payload.get('embeds'):
+            self.stats['invalid'] += 1
+            return web.json_response({'message': 'Cannot send an empty message', 'code': 50006}, status=400, headers=headers)
+        message = {
+            'id': str(next(self._ids)),
+            'webhook_id': request.match_info['webhook_id'],
+            'content': payload.get('content', ''),
+            'embeds': payload.get('embeds', []),
+            'username': payload.get('username'),
+            'received_at': time.time()
+        }
+        self.messages.append(message)
+        self.by_id[message['id']] = message
+        self.stats['created'] += 1
+        if request.query.get('wait', '').lower() == 'true':
+            return web.json_response(message, headers=headers)
+        return web.Response(status=204, headers=headers)
+
+    async def edit(self, request: web.Request) -> web.Response:
+        """PATCH a message previously sent by the webhook."""
+        limited, headers = await self._limited(request)
+        if limited is not None:
+            return limited
+        message = self.by_id.get(request.match_info['message_id'])
+        if message is None or message['webhook_id'] != request.match_info['webhook_id']:
+            return web.json_response({'message': 'Unknown Message', 'code': 10008}, status=404, headers=headers)
+        payload = await request.json()
+        for field in ('content', 'embeds'):
+            if field in payload:
+                message[field] = payload[field]
+        message['edited_at'] = time.time()
+        self.stats['edited'] += 1
+        return web.json_response(message, headers=headers)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_post('/api/webhooks/{webhook_id}/{token}', self.execute)
+        app.router.add_patch('/api/webhooks/{webhook_id}/{token}/messages/{message_id}', self.edit)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+async def serve(server: FakeDiscordWebhook, host: str, port: int) -> None:
+    """Run the server until cancelled, printing each accepted message."""
+    await server.start(host, port)
+    print(f"Fake Discord listening, DISCORD_WEBHOOK_URL={server.webhook_url()}")
+    printed = 0
+    try:
+        while True:
+            await asyncio.sleep(1)
+            for message in server.messages[printed:]:
+                title = message['embeds'][0].get('title') if message['embeds'] else message['content']
+                print(f"[{message['id']}] {title}")
+            printed = len(server.messages)
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local Discord webhook stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8082)
+    parser.add_argument('--limit', type=int, default=5, help='Requests per webhook per window')
+    parser.add_argument('--window', type=float, default=2.0, help='Bucket window in seconds')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(FakeDiscordWebhook(args.limit, args.window, args.latency), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
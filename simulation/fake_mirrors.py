@@ -0,0 +1,224 @@
+"""Local stand-in for the mirror hosts and their CDNs.
+
+Imitates the page and CDN layouts the extractors expect:
+
+- streamff: page streamff.live/v/<id>, MP4 at ffedge.streamff.com/uploads/<id>.mp4
+- streamin: page streamin.one/v/<id> redirecting to streamin.me/v/<id> (og:video meta),
+  MP4 at streamin.me/uploads/<id>.mp4, with streamin.fun/uploads redirecting there
+- dubz: page dubz.link/v/<id>, MP4 at cdn.squeelab.com/guest/videos/<id>.mp4
+- streamable: page streamable.com/<id> with a <video><source> tag,
+  MP4 at cdn-cf-east.streamable.com/video/mp4/<id>.mp4?token=...
+
+Every clip gets a scripted `Behaviour` (404 until T seconds, slow headers,
+HEAD rejected, HTML placeholder until ready). All hostnames are served from
+one local HTTP server; `mirror_session()` returns a requests.Session whose
+transport adapter sends every request there, keeping the original host in
+the Host header, so `VideoExtractor(session=...)` runs unchanged against it.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# Page URL templates per host
+PAGE_URLS = {
+    'streamff': 'https://streamff.live/v/{id}',
+    'streamin': 'https://streamin.one/v/{id}',
+    'dubz': 'https://dubz.link/v/{id}',
+    'streamable': 'https://streamable.com/{id}'
+}
+
+MP4_BYTES = b'\x00\x00\x00\x18ftypmp42' + b'\x00' * 1000
+
+class Behaviour:
+    """Scripted behaviour of one clip on its mirror."""
+
+    __slots__ = ('available_after', 'header_delay', 'head_rejected', 'placeholder')
+
+    def __init__(self, available_after: float = 0.0, header_delay: float = 0.0, head_rejected: bool = False,
+                 placeholder: bool = False):
+        """Initialize the behaviour.
+
+        Args:
+            available_after (float): Seconds after the clip is added until its MP4 exists
+            header_delay (float): Seconds before response headers are sent
+            head_rejected (bool): Answer HEAD requests for the MP4 with 405
+            placeholder (bool): Serve an HTML placeholder (200) instead of 404 until available
+        """
+        self.available_after = available_after
+        self.header_delay = header_delay
+        self.head_rejected = head_rejected
+        self.placeholder = placeholder
+
+# Named behaviours used by the benchmark and tests
+BEHAVIOURS = {
+    'ready': Behaviour(),
+    'late': Behaviour(available_after=2.0),
+    'slow_headers': Behaviour(header_delay=1.0),
+    'head_rejected': Behaviour(head_rejected=True),
+    'placeholder': Behaviour(available_after=2.0, placeholder=True)
+}
+
+class FakeMirrors:
+    """Threaded HTTP server imitating the mirror hosts."""
+
+    def __init__(self):
+        self.clips: Dict[str, Tuple[Behaviour, float]] = {}
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.address: Optional[str] = None
+
+    def add_clip(self, host: str, video_id: str, behaviour: Behaviour = BEHAVIOURS['ready']) -> str:
+        """Register a clip and return its page URL.
+
+        Args:
+            host (str): Host key ('streamff', 'streamin', 'dubz' or 'streamable')
+            video_id (str): Clip id
+            behaviour (Behaviour): Scripted behaviour
+
+        Returns:
+            str: Clip page URL
+        """
+        self.clips[video_id] = (behaviour, time.monotonic())
+        return PAGE_URLS[host].format(id=video_id)
+
+    def available(self, video_id: str) -> bool:
+        behaviour, added = self.clips[video_id]
+        return time.monotonic() - added >= behaviour.available_after
+
+    def count(self, method: str, host: str) -> None:
+        with self._lock:
+            key = f"{method} {host}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def start(self) -> str:
+        """Start serving on a free local port and return its address."""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), MirrorRequestHandler)
+        self._server.daemon_threads = True
+        self._server.mirrors = self
+        self.address = f"127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeMirrors':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests by their Host header to the imitated page and CDN layouts."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.route('HEAD')
+
+    def do_GET(self) -> None:
+        self.route('GET')
+
+    def route(self, method: str) -> None:
+        mirrors: FakeMirrors = self.server.mirrors
+        host = (self.headers.get('Host') or '').split(':')[0].lower()
+        path = urlsplit(self.path).path
+        parts = [part for part in path.split('/') if part]
+        mirrors.count(method, host)
+        video_id = parts[-1].rsplit('.', 1)[0] if parts else ''
+        if video_id not in mirrors.clips:
+            return self.send(404, b'Not Found', 'text/plain')
+        behaviour, _ = mirrors.clips[video_id]
+        if behaviour.header_delay:
+            time.sleep(behaviour.header_delay)
+
+        if host in ('streamff.live', 'streamff.com'):
+            return self.page(mirrors, video_id, f"https://ffedge.streamff.com/uploads/{video_id}.mp4")
+        if host == 'dubz.link':
+            return self.page(mirrors, video_id, f"https://cdn.squeelab.com/guest/videos/{video_id}.mp4")
+        if host in ('ffedge.streamff.com', 'cdn.squeelab.com', 'cdn-cf-east.streamable.com', 'streamin.me') and path.endswith('.mp4'):
+            return self.media(mirrors, method, video_id, behaviour)
+        if host == 'streamin.fun' and path.endswith('.mp4'):
+            return self.redirect(f"https://streamin.me/uploads/{video_id}.mp4")
+        if host == 'streamin.one':
+            return self.redirect(f"https://streamin.me/v/{video_id}")
+        if host == 'streamin.me':
+            return self.page(mirrors, video_id, f"https://streamin.me/uploads/{video_id}.mp4", meta=True)
+        if host == 'streamable.com':
+            return self.page(mirrors, video_id, f"https://cdn-cf-east.streamable.com/video/mp4/{video_id}.mp4?token=t0k3n#t=0.1")
+        return self.send(404, b'Not Found', 'text/plain')
+
+    def send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def redirect(self, location: str) -> None:
+        self.send(301, b'', 'text/html', {'Location': location})
+
+    def page(self, mirrors: FakeMirrors, video_id: str, mp4_url: str, meta: bool = False) -> None:
+        """Clip page; the video tags only appear once the clip is processed."""
+        if not mirrors.available(video_id):
+            return self.send(200, b'<html><body><main><p>Processing video...</p></main></body></html>', 'text/html')
+        head = f'<meta property="og:video:secure_url" content="{mp4_url}">' if meta else ''
+        body = (f'<html><head>{head}</head><body><main><div><video>'
+                f'<source src="{mp4_url}" type="video/mp4"></video></div></main></body></html>')
+        self.send(200, body.encode(), 'text/html')
+
+    def media(self, mirrors: FakeMirrors, method: str, video_id: str, behaviour: Behaviour) -> None:
+        """MP4 on the CDN, subject to the clip's behaviour."""
+        if method == 'HEAD' and behaviour.head_rejected:
+            return self.send(405, b'', 'text/plain')
+        if not mirrors.available(video_id):
+            if behaviour.placeholder:
+                return self.send(200, b'<html><body>Video is processing</body></html>', 'text/html')
+            return self.send(404, b'Not Found', 'text/plain')
+        if self.headers.get('Range'):
+            return self.send(206, MP4_BYTES[:1], 'video/mp4', {'Content-Range': f"bytes 0-0/{len(MP4_BYTES)}"})
+        self.send(200, MP4_BYTES, 'video/mp4')
+
+class LocalMirrorAdapter(HTTPAdapter):
+    """Transport adapter sending every request to the local mirror server."""
+
+    def __init__(self, address: str, **kwargs):
+        super().__init__(**kwargs)
+        self.address = address
+
+    def send(self, request, **kwargs):
+        original = request.url
+        parts = urlsplit(original)
+        request.headers['Host'] = parts.netloc
+        request.url = urlunsplit(('http', self.address, parts.path or '/', parts.query, ''))
+        response = super().send(request, **kwargs)
+        # Redirects and logs see the host the extractor asked for
+        response.url = original
+        return response
+
+def mirror_session(mirrors: FakeMirrors) -> requests.Session:
+    """Get a requests.Session routed to a running FakeMirrors server."""
+    session = requests.Session()
+    adapter = LocalMirrorAdapter(mirrors.address)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
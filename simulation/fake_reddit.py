@@ -0,0 +1,244 @@
+"""Local Reddit API stand-in.
+
+Serves the endpoints the bot uses (OAuth token, /r/<sub>/new, /api/info and
+comments) from recorded or synthetic submissions, released at a configurable
+rate. Both asyncpraw and the raw JSON client can be pointed at it through
+REDDIT_OAUTH_URL and REDDIT_URL:
+
+    python -m simulation.fake_reddit --port 8081 --rate 0.5
+    REDDIT_OAUTH_URL=http://127.0.0.1:8081 REDDIT_URL=http://127.0.0.1:8081 python -m src.main
+
+Recorded submissions are read from a JSONL file with one submission `data`
+dictionary per line (as written by the replay recorder).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from aiohttp import web
+from src.config.teams import premier_league_teams
+
+# Reddit's rate-limit window
+RATE_WINDOW_SECONDS = 600
+
+MIRROR_URLS = ('https://streamff.live/v/{id}', 'https://streamin.one/v/{id}', 'https://dubz.link/v/{id}')
+
+def load_submissions(filename: str) -> List[Dict[str, Any]]:
+    """Load recorded submission data dictionaries from a JSONL file."""
+    with open(filename, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def synthetic_submissions(count: int, seed: int = 0, goal_ratio: float = 0.3, subreddit: str = 'soccer') -> List[Dict[str, Any]]:
+    """Generate submissions resembling r/soccer: goal clips mixed with other posts.
+
+    Args:
+        count (int): Number of submissions
+        seed (int): Random seed
+        goal_ratio (float): Share of goal clip posts
+        subreddit (str): Subreddit the posts belong to
+
+    Returns:
+        list: Submission data dictionaries, oldest first
+    """
+    rng = random.Random(seed)
+    teams = [team['name'] for team in premier_league_teams.values()]
+    players = ['Saka', 'Salah', 'Haaland', 'Palmer', 'Isak', 'Watkins', 'Son', 'Mbeumo', 'Fernandes', 'Havertz']
+    submissions = []
+    for i in range(count):
+        submission_id = f"s{seed:02x}{i:06x}"
+        if rng.random() < goal_ratio:
+            home, away = rng.sample(teams, 2)
+            home_goals, away_goals = rng.randint(0, 3), rng.randint(0, 3)
+            score = f"[{home_goals}] - {away_goals}" if rng.random() < 0.5 else f"{home_goals} - [{away_goals}]"
+            title = f"{home} {score} {away} - {rng.choice(players)} {rng.randint(1, 90)}'"
+            url = rng.choice(MIRROR_URLS).format(id=f"{rng.getrandbits(32):08x}")
+        else:
+            title = rng.choice(['Match Thread: {} vs {}', 'Post Match Thread: {} 1-1 {}', '{} are interested in signing a {} defender'])
+            title = title.format(*rng.sample(teams, 2))
+            url = f"https://www.reddit.com/r/{subreddit}/comments/{submission_id}/"
+        submissions.append({
+            'id': submission_id,
+            'name': f"t3_{submission_id}",
+            'title': title,
+            'url': url,
+            'permalink': f"/r/{subreddit}/comments/{submission_id}/x/",
+            'subreddit': subreddit,
+            'author': 'fake_user',
+            'created_utc': 0.0,
+            'media': None,
+            'secure_media': None,
+            'is_self': False
+        })
+    return submissions
+
+def _listing(children: List[Dict[str, Any]], kind: str = 't3', after: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'kind': 'Listing',
+        'data': {'after': after, 'before': None, 'dist': len(children),
+                 'children': [{'kind': kind, 'data': child} for child in children]}
+    }
+
+class FakeRedditServer:
+    """aiohttp application serving submissions like the Reddit API."""
+
+    def __init__(self, submissions: Iterable[Dict[str, Any]] = (), rate: Optional[float] = None, preload: int = 0,
+                 restamp: bool = True, window_requests: int = 600):
+        """Initialize the server.
+
+        Args:
+            submissions: Submission data dictionaries, oldest first
+            rate (float, optional): Submissions released per second (None releases all at once)
+            preload (int): Submissions visible immediately
+            restamp (bool): Set created_utc to the time each submission is released
+            window_requests (int): Requests allowed per rate-limit window (for the x-ratelimit headers)
+        """
+        self.queued = list(submissions)
+        self.rate = rate
+        self.preload = preload
+        self.restamp = restamp
+        self.window_requests = window_requests
+        self.posts: List[Dict[str, Any]] = []
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats = {'token': 0, 'new': 0, 'info': 0, 'comments': 0}
+        self.started: Optional[float] = None
+        self._window_start = 0.0
+        self._used = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+    def publish(self, data: Dict[str, Any], comments: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Make a submission visible in listings right away.
+
+        Args:
+            data (dict): Submission data dictionary
+            comments (list, optional): Top-level comment data dictionaries
+        """
+        data = dict(data)
+        data.setdefault('name', f"t3_{data['id']}")
+        if self.restamp or not data.get('created_utc'):
+            data['created_utc'] = time.time()
+        self.posts.append(data)
+        self.by_id[data['id']] = data
+        if comments is not None:
+            self.comments[data['id']] = comments
+
+    def _release(self) -> None:
+        """Publish queued submissions that are due at the configured rate."""
+        if self.started is None:
+            return
+        due = len(self.queued) if self.rate is None else self.preload + int((time.time() - self.started) * self.rate)
+        while self.queued and len(self.posts) < due:
+            self.publish(self.queued.pop(0))
+
+    def _rate_headers(self) -> Dict[str, str]:
+        now = time.time()
+        if now - self._window_start >= RATE_WINDOW_SECONDS:
+            self._window_start = now - (now % RATE_WINDOW_SECONDS)
+            self._used = 0
+        self._used += 1
+        return {
+            'x-ratelimit-remaining': f"{max(0, self.window_requests - self._used):.1f}",
+            'x-ratelimit-used': str(self._used),
+            'x-ratelimit-reset': str(int(self._window_start + RATE_WINDOW_SECONDS - now))
+        }
+
+    def _json(self, payload: Any) -> web.Response:
+        return web.json_response(payload, headers=self._rate_headers())
+
+    async def token(self, request: web.Request) -> web.Response:
+        self.stats['token'] += 1
+        return web.json_response({'access_token': 'fake-token', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'})
+
+    async def new(self, request: web.Request) -> web.Response:
+        self.stats['new'] += 1
+        self._release()
+        names = set(request.match_info['sub'].lower().split('+'))
+        limit = min(int(request.query.get('limit', 25)), 100)
+        posts = [post for post in reversed(self.posts) if str(post.get('subreddit', '')).lower() in names]
+
+        after = request.query.get('after')
+        if after:
+            fullnames = [post['name'] for post in posts]
+            posts = posts[fullnames.index(after) + 1:] if after in fullnames else []
+        page = posts[:limit]
+        next_after = page[-1]['name'] if len(posts) > limit else None
+        return self._json(_listing(page, after=next_after))
+
+    async def info(self, request: web.Request) -> web.Response:
+        self.stats['info'] += 1
+        fullnames = request.query.get('id', '').split(',')
+        posts = [self.by_id[name[3:]] for name in fullnames if name.startswith('t3_') and name[3:] in self.by_id]
+        return self._json(_listing(posts))
+
+    async def submission_comments(self, request: web.Request) -> web.Response:
+        self.stats['comments'] += 1
+        post = self.by_id.get(request.match_info['id'])
+        if post is None:
+            return web.json_response({'message': 'Not Found', 'error': 404}, status=404)
+        comments = []
+        for i, comment in enumerate(self.comments.get(post['id'], [])):
+            comments.append({'id': f"c{post['id']}{i}", 'author': 'fake_user', 'stickied': False,
+                             'link_id': post['name'], 'parent_id': post['name'], 'replies': '', **comment})
+        return self._json([_listing([post]), _listing(comments, kind='t1')])
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_post('/api/v1/access_token', self.token)
+        for path in ('/r/{sub}/new', '/r/{sub}/new/'):
+            app.router.add_get(path, self.new)
+        for path in ('/api/info', '/api/info/'):
+            app.router.add_get(path, self.info)
+        for path in ('/comments/{id}', '/comments/{id}/'):
+            app.router.add_get(path, self.submission_comments)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.started = time.time()
+        self.base_url = f"http://{host}:{port}"
+        self._release()
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+async def serve(server: FakeRedditServer, host: str, port: int) -> None:
+    """Run the server until cancelled."""
+    base_url = await server.start(host, port)
+    print(f"Fake Reddit listening on {base_url} ({len(server.queued)} submissions queued)")
+    print(f"  REDDIT_OAUTH_URL={base_url} REDDIT_URL={base_url}")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local Reddit API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--file', help='JSONL file of recorded submissions (default: synthetic)')
+    parser.add_argument('--count', type=int, default=500, help='Synthetic submissions to generate')
+    parser.add_argument('--rate', type=float, default=0.5, help='Submissions released per second')
+    parser.add_argument('--preload', type=int, default=0, help='Submissions visible at startup')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic submissions')
+    args = parser.parse_args()
+
+    submissions = load_submissions(args.file) if args.file else synthetic_submissions(args.count, seed=args.seed)
+    try:
+        asyncio.run(serve(FakeRedditServer(submissions, rate=args.rate, preload=args.preload), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,386 @@
+"""Whole-matchday simulation in virtual time.
+
+Generates a Saturday 3pm round of fixtures (goals, reposts of the same goal
+on other mirrors, comment mirror threads and unrelated posts), serves it
+from an in-memory Reddit and runs the bot's real polling loop, submission
+refresher and comment scanner against it on a virtual clock
+(`src.utils.clock.run_virtual`). Discord, persistence and the mirror hosts
+are stubbed; each clip's MP4 becomes available after a per-host delay.
+
+Two and a half hours of matchday run in seconds, and the same seed always
+gives the same result:
+
+    python -m simulation.matchday --matches 10 --seed 1
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from unittest import mock
+from src import main
+from src.config.teams import premier_league_teams
+from src.services import comment_scanner as comment_scanner_module
+from src.services import submission_refresher as submission_refresher_module
+from src.services.comment_scanner import CommentScanner
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.listing_poller import ListingPoller
+from src.services.poll_scheduler import PollScheduler
+from src.services.posted_state import PostedState
+from src.services.reddit_json import CommentSnapshot, SubmissionSnapshot
+from src.services.submission_refresher import SubmissionRefresher
+from src.utils import clock
+from src.utils.logger import app_logger
+from src.utils.rate_governor import RateGovernor
+from src.utils.retry_schedule import AvailabilityTracker
+from simulation.replay import StubDiscord, percentiles
+
+# Mirror hosts with the range of seconds after posting until their MP4 is available
+MIRROR_DELAYS = {
+    'https://streamff.live/v/{id}': (30, 180),
+    'https://streamin.one/v/{id}': (20, 120),
+    'https://dubz.link/v/{id}': (10, 60)
+}
+
+PLAYERS = ['Saka', 'Salah', 'Haaland', 'Palmer', 'Isak', 'Watkins', 'Son', 'Mbeumo', 'Fernandes', 'Havertz',
+           'Gordon', 'Foden', 'Jota', 'Solanke', 'Wissa', 'Eze', 'Bowen', 'Cunha', 'Delap', 'Wood']
+
+# Reddit requests allowed per rate-limit window
+REQUESTS_PER_WINDOW = 1000
+RATE_WINDOW_SECONDS = 600
+
+class Matchday:
+    """Generated posts and mirror availability for one round of fixtures."""
+
+    def __init__(self, kickoff: datetime, matches: int = 10, seed: int = 0, noise_per_minute: float = 1.0):
+        """Generate the matchday.
+
+        Args:
+            kickoff (datetime): Kickoff time of every match
+            matches (int): Number of fixtures (capped by the configured teams)
+            seed (int): Random seed
+            noise_per_minute (float): Average unrelated posts per minute
+        """
+        rng = random.Random(seed)
+        teams = [team['name'] for team in premier_league_teams.values()]
+        rng.shuffle(teams)
+        self.kickoff = kickoff
+        self.fixtures = [{'kickoff': kickoff.isoformat(), 'home': teams[2 * i], 'away': teams[2 * i + 1]}
+                         for i in range(min(matches, len(teams) // 2))]
+        self.posts: List[Dict[str, Any]] = []
+        self.goals: Dict[str, Dict[str, Any]] = {}
+        self.available_at: Dict[str, float] = {}
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        start = kickoff.timestamp()
+
+        for fixture in self.fixtures:
+            home, away = fixture['home'], fixture['away']
+            self._post(rng, start - 1800, f"Match Thread: {home} vs {away}", None)
+            self._post(rng, start + 115 * 60, f"Post Match Thread: {home} vs {away}", None)
+            score = [0, 0]
+            for minute in sorted(rng.sample(range(1, 91), rng.choice([0, 1, 1, 2, 2, 3, 3, 4, 5]))):
+                side = rng.randint(0, 1)
+                score[side] += 1
+                scored_at = start + (minute + (15 if minute > 45 else 0)) * 60
+                self._goal(rng, fixture, score, side, minute, scored_at)
+
+        end = start + 135 * 60
+        t = start - 1800
+        while t < end:
+            t += rng.expovariate(noise_per_minute / 60)
+            home, away = rng.sample(teams, 2)
+            title = rng.choice(['{} are interested in signing a {} defender', '{} fans at the {} game',
+                                '[Opta] {} have won more points than {} this season'])
+            self._post(rng, t, title.format(home, away), None)
+        self.posts.sort(key=lambda post: post['created_utc'])
+
+    def _post(self, rng: random.Random, created_utc: float, title: str, url: Optional[str], goal_id: Optional[str] = None) -> Dict[str, Any]:
+        post_id = f"m{len(self.posts):05d}"
+        post = {
+            'id': post_id,
+            'title': title,
+            'url': url or f"https://www.reddit.com/r/soccer/comments/{post_id}/",
+            'permalink': f"/r/soccer/comments/{post_id}/x/",
+            'created_utc': created_utc,
+            'subreddit': 'soccer',
+            'goal_id': goal_id
+        }
+        self.posts.append(post)
+        return post
+
+    def _clip(self, rng: random.Random, posted_at: float) -> str:
+        template = rng.choice(list(MIRROR_DELAYS))
+        url = template.format(id=f"{rng.getrandbits(32):08x}")
+        self.available_at[url] = posted_at + rng.uniform(*MIRROR_DELAYS[template])
+        return url
+
+    def _goal(self, rng: random.Random, fixture: Dict[str, str], score: List[int], side: int, minute: int, scored_at: float) -> None:
+        goal_id = f"{fixture['home']}-{fixture['away']}-{minute}"
+        scorer = rng.choice(PLAYERS)
+        home_score = f"[{score[0]}]" if side == 0 else str(score[0])
+        away_score = f"[{score[1]}]" if side == 1 else str(score[1])
+        title = f"{fixture['home']} {home_score} - {away_score} {fixture['away']} - {scorer} {minute}'"
+        self.goals[goal_id] = {'title': title, 'scored_at': scored_at, 'first_post': None}
+
+        posted_at = scored_at + rng.uniform(45, 180)
+        for repost in range(rng.choice([1, 1, 2, 2, 3, 4])):
+            url = self._clip(rng, posted_at)
+            repost_title = f"{title} (great strike)" if repost and rng.random() < 0.3 else title
+            post = self._post(rng, posted_at, repost_title, url, goal_id)
+            if repost == 0:
+                self.goals[goal_id]['first_post'] = posted_at
+                if rng.random() < 0.6:
+                    # AutoModerator mirror thread with a faster mirror appears a bit later
+                    mirror = self._clip(rng, posted_at + 30)
+                    self.comments[post['id']] = [{
+                        'created_utc': posted_at + 10, 'author': 'AutoModerator', 'stickied': True, 'body': 'Mirrors',
+                        'replies': [{'created_utc': posted_at + 30, 'author': 'fake_user', 'body': f"Mirror: {mirror}"}]
+                    }]
+            posted_at += rng.uniform(5, 150)
+
+class SimulatedSubreddit:
+    def __init__(self, reddit: 'SimulatedReddit'):
+        self.reddit = reddit
+
+    async def new(self, limit: int = 100):
+        self.reddit.request()
+        for post in self.reddit.visible()[::-1][:limit]:
+            yield post
+
+class SimulatedSubmission:
+    def __init__(self, reddit: 'SimulatedReddit', comments: List[Dict[str, Any]]):
+        self.reddit = reddit
+        self._comments = comments
+        self.comment_limit = 2048
+        self.comments: List[CommentSnapshot] = []
+
+    async def load(self) -> None:
+        self.reddit.request()
+        now = clock.time()
+        visible = [{**comment, 'replies': {'data': {'children': [
+            {'kind': 't1', 'data': reply} for reply in comment['replies'] if reply['created_utc'] <= now]}}}
+            for comment in self._comments if comment['created_utc'] <= now]
+        self.comments = [CommentSnapshot(comment) for comment in visible]
+
+class SimulatedReddit:
+    """In-memory Reddit client serving a matchday's posts as virtual time passes."""
+
+    def __init__(self, matchday: Matchday):
+        self.matchday = matchday
+        self.snapshots = [SubmissionSnapshot.from_data(post) for post in matchday.posts]
+        self.created = [post['created_utc'] for post in matchday.posts]
+        self.by_id = {snapshot.id: snapshot for snapshot in self.snapshots}
+        self.requests = 0
+        self._window = None
+        self._used = 0
+        # asyncpraw exposes rate limits as reddit.auth.limits
+        self.auth = self
+        self.limits: Dict[str, Optional[float]] = {'remaining': None, 'used': None}
+
+    def request(self) -> None:
+        window = int(clock.time() // RATE_WINDOW_SECONDS)
+        if window != self._window:
+            self._window, self._used = window, 0
+        self._used += 1
+        self.requests += 1
+        self.limits = {'remaining': float(max(0, REQUESTS_PER_WINDOW - self._used)), 'used': self._used}
+
+    def visible(self) -> List[SubmissionSnapshot]:
+        return self.snapshots[:bisect.bisect_right(self.created, clock.time())]
+
+    async def subreddit(self, name: str) -> SimulatedSubreddit:
+        return SimulatedSubreddit(self)
+
+    async def info(self, fullnames: Iterable[str]):
+        self.request()
+        now = clock.time()
+        for fullname in fullnames:
+            snapshot = self.by_id.get(fullname.split('_', 1)[-1])
+            if snapshot is not None and snapshot.created_utc <= now:
+                yield snapshot
+
+    async def submission(self, id: str, fetch: bool = True) -> SimulatedSubmission:
+        submission = SimulatedSubmission(self, self.matchday.comments.get(id, []))
+        if fetch:
+            await submission.load()
+        return submission
+
+    async def close(self) -> None:
+        pass
+
+def mirror_probe(matchday: Matchday, latency: float = 0.5):
+    """Get an extraction probe that finds an MP4 once the clip's mirror has it."""
+    async def probe(job: Any) -> Optional[str]:
+        await clock.sleep(latency)
+        if clock.time() >= matchday.available_at.get(job.url, float('inf')):
+            return f"https://mirror.invalid/{job.url.rsplit('/', 1)[-1]}.mp4"
+        return None
+    return probe
+
+async def simulate(matchday: Matchday, fixtures_file: str, until: float, quiet: bool = True) -> Dict[str, Any]:
+    """Run the bot's background loops against a matchday until `until` (Unix time)."""
+    reddit = SimulatedReddit(matchday)
+    discord = StubDiscord()
+    post_times: List[tuple] = []
+    mp4_times: List[tuple] = []
+
+    async def post_to_discord(content: str, team_data: Optional[Dict] = None) -> bool:
+        post_times.append((clock.time(), content))
+        return await discord.post_to_discord(content, team_data)
+
+    async def post_mp4_link(title: str, mp4_url: str, team_data: Optional[Dict] = None) -> bool:
+        mp4_times.append((clock.time(), title))
+        return await discord.post_mp4_link(title, mp4_url, team_data)
+
+    async def create_reddit_client():
+        return reddit
+
+    governor = RateGovernor()
+    scheduler = ExtractionScheduler(probe=mirror_probe(matchday),
+                                    tracker=AvailabilityTracker(filename=None, rng=random.Random(0)))
+    refresher = SubmissionRefresher(scheduler=scheduler, governor=governor)
+    scanner = CommentScanner(scheduler=scheduler, governor=governor)
+    poller = ListingPoller()
+    posted_state = PostedState(None, None)
+    polls = 0
+    original_check = main.check_new_posts
+
+    async def check_new_posts(background_tasks, reddit=None):
+        nonlocal polls
+        polls += 1
+        await original_check(background_tasks, reddit)
+
+    decisions: Counter = Counter()
+    handler_levels = [(handler, handler.level) for handler in app_logger.handlers]
+    if quiet:
+        for handler, _ in handler_levels:
+            handler.setLevel(logging.WARNING)
+    try:
+        with mock.patch.multiple(
+            main,
+            create_reddit_client=create_reddit_client,
+            check_new_posts=check_new_posts,
+            post_to_discord=post_to_discord,
+            post_mp4_link=post_mp4_link,
+            posted_state=posted_state,
+            extraction_scheduler=scheduler,
+            submission_decisions=decisions,
+            listing_poller=poller,
+            rate_governor=governor,
+            poll_scheduler=PollScheduler(fixtures_file)
+        ), mock.patch.object(submission_refresher_module, 'create_reddit_client', create_reddit_client), \
+                mock.patch.object(comment_scanner_module, 'create_reddit_client', create_reddit_client):
+            tasks = [asyncio.ensure_future(coro) for coro in (main.periodic_check(), refresher.run(), scanner.run())]
+            await clock.sleep(until - clock.time())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*main.mp4_followup_tasks, return_exceptions=True)
+            extraction = scheduler.snapshot()
+    finally:
+        await scheduler.stop()
+        await posted_state.stop()
+        for handler, level in handler_levels:
+            handler.setLevel(level)
+
+    return {
+        'reddit': reddit,
+        'polls': polls,
+        'post_times': post_times,
+        'mp4_times': mp4_times,
+        'decisions': dict(decisions.most_common()),
+        'extraction': extraction,
+        'comment_mirrors': scanner.stats.get('mirrors', 0)
+    }
+
+def run_matchday(matches: int = 10, seed: int = 0, noise_per_minute: float = 1.0, quiet: bool = True) -> Dict[str, Any]:
+    """Simulate a 3pm Saturday in virtual time and report what the bot did.
+
+    Args:
+        matches (int): Number of fixtures
+        seed (int): Random seed for the generated matchday
+        noise_per_minute (float): Average unrelated posts per minute
+        quiet (bool): Silence the pipeline's log output
+
+    Returns:
+        dict: Goals posted/missed/double-posted, MP4 follow-ups, latencies (virtual seconds),
+        Reddit requests and the wall-clock time the run took
+    """
+    kickoff = datetime(2024, 12, 28, 15, 0, tzinfo=timezone.utc)
+    matchday = Matchday(kickoff, matches=matches, seed=seed, noise_per_minute=noise_per_minute)
+    start = kickoff.timestamp() - 3600
+    until = kickoff.timestamp() + 150 * 60
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures_file = os.path.join(directory, 'fixtures.json')
+        with open(fixtures_file, 'w', encoding='utf-8') as f:
+            json.dump(matchday.fixtures, f)
+        wall_start = time.perf_counter()
+        result = clock.run_virtual(simulate(matchday, fixtures_file, until, quiet), start=start)
+        wall = time.perf_counter() - wall_start
+
+    url_goal = {post['url']: post['goal_id'] for post in matchday.posts if post['goal_id']}
+    title_goal = {goal['title']: goal_id for goal_id, goal in matchday.goals.items()}
+    posted: Dict[str, List[float]] = {}
+    for posted_at, content in result['post_times']:
+        lines = content.split('\n')
+        goal_id = url_goal.get(lines[1]) if len(lines) > 1 else None
+        if goal_id:
+            posted.setdefault(goal_id, []).append(posted_at)
+    post_latency = [min(times) - matchday.goals[goal_id]['first_post'] for goal_id, times in posted.items()]
+    mp4_latency = []
+    for posted_at, title in result['mp4_times']:
+        goal_id = title_goal.get(title)
+        if goal_id:
+            mp4_latency.append(posted_at - matchday.goals[goal_id]['first_post'])
+
+    return {
+        'matches': len(matchday.fixtures),
+        'submissions': len(matchday.posts),
+        'goals': len(matchday.goals),
+        'goal_posts': sum(1 for post in matchday.posts if post['goal_id']),
+        'goals_posted': len(posted),
+        'goals_missed': sorted(set(matchday.goals) - set(posted)),
+        'goals_double_posted': sorted(goal_id for goal_id, times in posted.items() if len(times) > 1),
+        'mp4_posts': len(result['mp4_times']),
+        'comment_mirrors': result['comment_mirrors'],
+        'decisions': result['decisions'],
+        'polls': result['polls'],
+        'reddit_requests': result['reddit'].requests,
+        'pending_extractions': result['extraction']['pending'],
+        'post_latency_s': {name: round(value / 1000, 1) for name, value in percentiles(post_latency).items()},
+        'mp4_latency_s': {name: round(value / 1000, 1) for name, value in percentiles(mp4_latency).items()},
+        'virtual_seconds': until - start,
+        'wall_seconds': round(wall, 3)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Simulate a matchday in virtual time')
+    parser.add_argument('--matches', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--noise', type=float, default=1.0, help='Unrelated posts per minute')
+    parser.add_argument('--verbose', action='store_true', help='Keep pipeline log output')
+    args = parser.parse_args()
+
+    report = run_matchday(args.matches, args.seed, args.noise, quiet=not args.verbose)
+    print(f"{report['matches']} matches, {report['submissions']} submissions, {report['goals']} goals "
+          f"({report['goal_posts']} goal posts) simulated in {report['wall_seconds']}s "
+          f"({report['virtual_seconds'] / 3600:.1f}h virtual)")
+    print(f"Goals posted: {report['goals_posted']}, missed: {len(report['goals_missed'])}, "
+          f"double-posted: {len(report['goals_double_posted'])}")
+    print(f"MP4 follow-ups: {report['mp4_posts']} ({report['comment_mirrors']} comment mirrors found), "
+          f"pending extractions: {report['pending_extractions']}")
+    print(f"Polls: {report['polls']}, Reddit requests: {report['reddit_requests']}")
+    print(f"Post latency (s): {report['post_latency_s']}")
+    print(f"MP4 latency (s):  {report['mp4_latency_s']}")
+    print("Decisions:")
+    for decision, count in report['decisions'].items():
+        print(f"  {decision:<40} {count:>7}")
@@ -0,0 +1,179 @@
+"""Replay recorded submissions through the processing pipeline.
+
+Feeds a JSONL recording (see src/services/submission_recorder.py) into
+`process_submission` at real time, N times faster or as fast as possible.
+Discord, persistence and the mirror hosts are replaced by local stubs, so a
+matchday's traffic can be pushed through filters and duplicate detection in
+seconds:
+
+    python -m simulation.replay data/recording.jsonl --speed 20
+    python -m simulation.replay data/recording.jsonl --speed max
+
+The report covers throughput, decision counts (posted and each skip reason)
+and the latency distribution of processing decisions and Discord posts.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from unittest import mock
+from src import main
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.posted_state import PostedState
+from src.services.reddit_json import SubmissionSnapshot
+from src.utils.logger import app_logger
+from src.utils.retry_schedule import AvailabilityTracker
+from simulation.fake_reddit import load_submissions
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize a latency sample in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+    return {'p50': at(0.50), 'p90': at(0.90), 'p99': at(0.99), 'max': round(ordered[-1] * 1000, 3)}
+
+class StubDiscord:
+    """Records Discord posts instead of sending them."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.posts: List[str] = []
+        self.mp4_posts: List[str] = []
+
+    async def post_to_discord(self, content: str, team_data: Optional[Dict] = None) -> bool:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.posts.append(content)
+        return True
+
+    async def post_mp4_link(self, title: str, mp4_url: str, team_data: Optional[Dict] = None) -> bool:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.mp4_posts.append(mp4_url)
+        return True
+
+def stub_mirror(delay: float = 0.0):
+    """Get an extraction probe that resolves every clip to a local MP4 URL after `delay` seconds."""
+    async def probe(job: Any) -> Optional[str]:
+        if delay:
+            await asyncio.sleep(delay)
+        return f"https://mirror.invalid/{job.key.rsplit('/', 1)[-1]}.mp4"
+    return probe
+
+async def replay(
+    records: Iterable[Dict[str, Any]],
+    speed: Optional[float] = 1.0,
+    discord_delay: float = 0.0,
+    mirror_delay: float = 0.0,
+    wait_for_mp4: bool = False,
+    quiet: bool = True
+) -> Dict[str, Any]:
+    """Replay recorded submissions through `process_submission`.
+
+    Submissions are fed in `created_utc` order with their original spacing
+    divided by `speed`, and are re-stamped with the time they are fed so the
+    age filter sees them as fresh.
+
+    Args:
+        records: Recorded submission dictionaries
+        speed (float, optional): Replay speed factor (None for as fast as possible)
+        discord_delay (float): Simulated Discord request latency in seconds
+        mirror_delay (float): Simulated mirror latency before an MP4 is found
+        wait_for_mp4 (bool): Wait for pending MP4 extractions and their follow-up posts
+        quiet (bool): Silence the pipeline's log output during the run
+
+    Returns:
+        dict: Throughput, decisions and latency report
+    """
+    records = sorted(records, key=lambda record: record.get('created_utc') or 0)
+    discord = StubDiscord(discord_delay)
+    scheduler = ExtractionScheduler(probe=stub_mirror(mirror_delay), tracker=AvailabilityTracker(filename=None))
+    posted_state = PostedState(None, None)
+    decisions: Counter = Counter()
+    handler_levels = [(handler, handler.level) for handler in app_logger.handlers]
+    if quiet:
+        for handler, _ in handler_levels:
+            handler.setLevel(logging.WARNING)
+
+    decision_latency: List[float] = []
+    lag: List[float] = []
+    try:
+        with mock.patch.multiple(
+            main,
+            post_to_discord=discord.post_to_discord,
+            post_mp4_link=discord.post_mp4_link,
+            posted_state=posted_state,
+            extraction_scheduler=scheduler,
+            submission_decisions=decisions
+        ):
+            base = records[0].get('created_utc') or 0 if records else 0
+            started = time.perf_counter()
+            for record in records:
+                if speed:
+                    due = started + ((record.get('created_utc') or 0) - base) / speed
+                    if due > time.perf_counter():
+                        await asyncio.sleep(due - time.perf_counter())
+                    lag.append(max(0.0, time.perf_counter() - due))
+                submission = SubmissionSnapshot.from_data({**record, 'created_utc': time.time()})
+                fed = time.perf_counter()
+                await main.process_submission(submission)
+                decision_latency.append(time.perf_counter() - fed)
+            elapsed = time.perf_counter() - started
+
+            if wait_for_mp4:
+                await scheduler.join()
+                await asyncio.gather(*main.mp4_followup_tasks, return_exceptions=True)
+            pending = scheduler.snapshot()['pending']
+    finally:
+        await scheduler.stop()
+        await posted_state.stop()
+        for handler, level in handler_levels:
+            handler.setLevel(level)
+
+    return {
+        'submissions': len(records),
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_per_second': round(len(records) / elapsed, 1) if elapsed else None,
+        'decisions': dict(decisions.most_common()),
+        'discord_posts': len(discord.posts),
+        'mp4_posts': len(discord.mp4_posts),
+        'pending_extractions': pending,
+        'decision_latency_ms': percentiles(decision_latency),
+        'feed_lag_ms': percentiles(lag)
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{report['submissions']} submissions in {report['elapsed_seconds']}s "
+          f"({report['throughput_per_second']}/s)")
+    print("Decisions:")
+    for decision, count in report['decisions'].items():
+        print(f"  {decision:<40} {count:>7}")
+    print(f"Discord posts: {report['discord_posts']}, MP4 follow-ups: {report['mp4_posts']}, "
+          f"pending extractions: {report['pending_extractions']}")
+    print(f"Decision latency (ms): {report['decision_latency_ms']}")
+    if report['feed_lag_ms']:
+        print(f"Feed lag (ms):         {report['feed_lag_ms']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Replay recorded submissions through the pipeline')
+    parser.add_argument('file', help='JSONL recording (RECORD_SUBMISSIONS_FILE)')
+    parser.add_argument('--speed', default='1', help="Speed factor, or 'max' for as fast as possible")
+    parser.add_argument('--discord-delay', type=float, default=0.0, help='Simulated Discord latency (s)')
+    parser.add_argument('--mirror-delay', type=float, default=0.0, help='Simulated mirror latency (s)')
+    parser.add_argument('--wait-for-mp4', action='store_true', help='Wait for MP4 follow-up posts')
+    parser.add_argument('--verbose', action='store_true', help='Keep pipeline log output')
+    args = parser.parse_args()
+
+    print_report(asyncio.run(replay(
+        load_submissions(args.file),
+        speed=None if args.speed == 'max' else float(args.speed),
+        discord_delay=args.discord_delay,
+        mirror_delay=args.mirror_delay,
+        wait_for_mp4=args.wait_for_mp4,
+        quiet=not args.verbose
+    )))
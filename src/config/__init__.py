@@ -10,9 +10,16 @@ load_dotenv()
 CLIENT_ID = os.getenv('CLIENT_ID')
 CLIENT_SECRET = os.getenv('CLIENT_SECRET')
 USER_AGENT = os.getenv('USER_AGENT')
+REDDIT_OAUTH_URL = os.getenv('REDDIT_OAUTH_URL', 'https://oauth.reddit.com')  # Authenticated API base URL
+REDDIT_URL = os.getenv('REDDIT_URL', 'https://www.reddit.com')  # Token endpoint base URL
+REDDIT_JSON_INGESTION = os.getenv('REDDIT_JSON_INGESTION', 'false').lower() in ('1', 'true', 'yes')  # Raw JSON instead of asyncpraw models
 DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL')
 DISCORD_USERNAME = os.getenv('DISCORD_USERNAME', 'Ally')  # Default to 'Ally' if not set
 DISCORD_AVATAR_URL = os.getenv('DISCORD_AVATAR_URL', 'https://cdn1.rangersnews.uk/uploads/24/2024/03/GettyImages-459578698-scaled-e1709282146939-1024x702.jpg')  # Default to current image if not set
+DISCORD_MAX_RETRIES = int(os.getenv('DISCORD_MAX_RETRIES', '3'))  # Retries of a message rate limited by Discord
+
+# Subreddits watched for goal posts, read as one combined listing
+SUBREDDITS = [name.strip() for name in os.getenv('SUBREDDITS', 'soccer').split(',') if name.strip()]
 
 # Feature toggle for finding direct MP4 links
 FIND_MP4_LINKS = True
@@ -39,3 +46,56 @@ os.makedirs(LOG_DIR, exist_ok=True)
 # File paths for persistence
 POSTED_URLS_FILE = os.path.join(DATA_DIR, 'posted_urls.pkl')
 POSTED_SCORES_FILE = os.path.join(DATA_DIR, 'posted_scores.pkl')
+URL_TEMPLATES_FILE = os.path.join(DATA_DIR, 'url_templates.pkl')
+URL_TEMPLATE_MAX_MISSES = int(os.getenv('URL_TEMPLATE_MAX_MISSES', '3'))  # Consecutive misses before a learned template is dropped
+AVAILABILITY_FILE = os.path.join(DATA_DIR, 'mp4_availability.pkl')
+FIXTURES_FILE = os.getenv('FIXTURES_FILE', os.path.join(DATA_DIR, 'fixtures.json'))
+RECORD_SUBMISSIONS_FILE = os.getenv('RECORD_SUBMISSIONS_FILE')  # Optional JSONL file capturing ingested submissions for replay
+
+# Mirror host health: circuit breaker and adaptive (AIMD) concurrency limits
+HOST_FAILURE_THRESHOLD = int(os.getenv('HOST_FAILURE_THRESHOLD', '3'))  # Consecutive failures before opening the circuit
+HOST_COOLDOWN_SECONDS = float(os.getenv('HOST_COOLDOWN_SECONDS', '60'))  # Time before an open circuit allows a trial request
+HOST_MAX_CONCURRENCY = int(os.getenv('HOST_MAX_CONCURRENCY', '8'))  # Upper bound for in-flight requests per host
+HOST_LATENCY_TARGET_SECONDS = float(os.getenv('HOST_LATENCY_TARGET_SECONDS', '3'))  # Slower responses shrink the limit
+HOST_SLOT_WAIT_SECONDS = float(os.getenv('HOST_SLOT_WAIT_SECONDS', '5'))  # Wait for a free slot on a saturated host
+
+# Number of concurrent MP4 extraction probes
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '8'))
+SUBMISSION_CONCURRENCY = int(os.getenv('SUBMISSION_CONCURRENCY', '8'))  # Submissions of one poll processed at once
+
+# Interval between batched /api/info refreshes of pending submissions
+SUBMISSION_REFRESH_SECONDS = float(os.getenv('SUBMISSION_REFRESH_SECONDS', '20'))
+
+# Scanning comments of pending goal posts for alternate clip mirrors
+COMMENT_SCAN_SECONDS = float(os.getenv('COMMENT_SCAN_SECONDS', '15'))  # Interval between scans
+COMMENT_SCAN_TIMEOUT_SECONDS = float(os.getenv('COMMENT_SCAN_TIMEOUT_SECONDS', '5'))  # Time budget per comment fetch
+COMMENT_SCAN_MAX_REQUESTS = int(os.getenv('COMMENT_SCAN_MAX_REQUESTS', '10'))  # Comment fetches per scan
+COMMENT_SCAN_MAX_PER_POST = int(os.getenv('COMMENT_SCAN_MAX_PER_POST', '4'))  # Comment fetches per goal post
+COMMENT_SCAN_COMMENT_LIMIT = int(os.getenv('COMMENT_SCAN_COMMENT_LIMIT', '50'))  # Comments requested per fetch
+
+# Reddit polling intervals, planned from the fixtures file
+LIVE_POLL_SECONDS = float(os.getenv('LIVE_POLL_SECONDS', '5'))  # While a match is live
+IDLE_POLL_SECONDS = float(os.getenv('IDLE_POLL_SECONDS', '300'))  # Heartbeat outside match windows
+DEFAULT_POLL_SECONDS = float(os.getenv('DEFAULT_POLL_SECONDS', '30'))  # When no fixtures file is available
+MATCH_LENGTH_MINUTES = float(os.getenv('MATCH_LENGTH_MINUTES', '110'))  # Kickoff to full time, including half time
+MATCH_BUFFER_MINUTES = float(os.getenv('MATCH_BUFFER_MINUTES', '20'))  # Stoppage time and late posts
+
+# Reddit rate-limit budget shared by polling, refreshes and comment scans
+REDDIT_RATE_WINDOW_SECONDS = float(os.getenv('REDDIT_RATE_WINDOW_SECONDS', '600'))  # Reddit's rate-limit window
+REDDIT_RATE_RESERVE = int(os.getenv('REDDIT_RATE_RESERVE', '5'))  # Requests always kept back
+
+# Two-tier listing polling: small head probe each poll, full page on periodic sweeps
+HEAD_PROBE_LIMIT = int(os.getenv('HEAD_PROBE_LIMIT', '8'))  # Listing items per head probe
+FULL_SWEEP_LIMIT = int(os.getenv('FULL_SWEEP_LIMIT', '100'))  # Listing items per full sweep (one page)
+FULL_SWEEP_SECONDS = float(os.getenv('FULL_SWEEP_SECONDS', '60'))  # Interval between full sweeps
+SEEN_IDS_LIMIT = int(os.getenv('SEEN_IDS_LIMIT', '5000'))  # Submission ids remembered as seen
+
+# /status reports polling as stalled once the next poll is this many seconds late
+POLL_STALL_SECONDS = float(os.getenv('POLL_STALL_SECONDS', '120'))
+
+# Per-submission tracing spans, appended as OTLP/JSON lines; off unless a file is given
+TRACE_FILE = os.getenv('TRACE_FILE')
+
+# On-demand profiling endpoints (/debug/profile, /debug/allocations); off unless enabled
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '60'))  # Longest profile or allocation trace allowed
@@ -2,18 +2,34 @@
 
 import asyncio
 import argparse
+from collections import Counter
 from datetime import datetime, timezone, timedelta
 from typing import Set, Dict, List, Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, BackgroundTasks
-from src.services.reddit_service import create_reddit_client, find_team_in_title, extract_mp4_link
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from src.services.reddit_service import create_reddit_client, find_team_in_title, extraction_stats, fetch_new_submissions
 from src.services.discord_service import post_to_discord, post_mp4_link
-from src.services.video_service import video_extractor
-from src.utils.persistence import save_data, load_data
-from src.utils.url_utils import is_valid_domain, get_base_domain
+from src.services.extraction_scheduler import extraction_scheduler
+from src.services.submission_refresher import submission_refresher, fetch_submissions
+from src.services.comment_scanner import comment_scanner
+from src.services.poll_scheduler import poll_scheduler
+from src.services.listing_poller import listing_poller
+from src.services.submission_recorder import submission_recorder
+from src.services.reddit_json import reddit_json_session
+from src.services.posted_state import posted_state, URL_POSTED, IN_PROGRESS
+from src.utils.url_utils import get_base_domain, canonical_source_url
 from src.utils.logger import app_logger
-from src.utils.score_utils import is_duplicate_score, cleanup_old_scores
-from src.config import POSTED_URLS_FILE, POSTED_SCORES_FILE, FIND_MP4_LINKS, POST_AGE_MINUTES
+from src.utils import clock
+from src.utils.host_health import host_health
+from src.utils.retry_schedule import availability_tracker
+from src.utils.rate_governor import rate_governor
+from src.utils.profiler import profiler
+from src.utils.tracing import tracer
+from src.utils.poll_monitor import poll_monitor
+from src.utils.webhook_limiter import webhook_limiter
+from src.utils.url_templates import url_templates
+from src.config import POST_AGE_MINUTES, SUBREDDITS, SUBMISSION_CONCURRENCY, PROFILING_ENABLED, PROFILE_MAX_SECONDS
 from src.config.domains import base_domains
 import re
 
@@ -22,24 +38,28 @@ async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager for startup and shutdown events."""
     # Startup
     app_logger.info("Goal bot starting up...")
-    # Start periodic check task
+    # Start periodic check, submission refresh and comment scan tasks
     task = asyncio.create_task(periodic_check())
+    refresh_task = asyncio.create_task(submission_refresher.run())
+    scan_task = asyncio.create_task(comment_scanner.run())
     yield
     # Shutdown
     app_logger.info("Shutting down...")
-    # Cancel periodic check task
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    # Cancel background tasks
+    for background_task in (task, refresh_task, scan_task):
+        background_task.cancel()
+        try:
+            await background_task
+        except asyncio.CancelledError:
+            pass
+    await extraction_scheduler.stop()
+    await posted_state.stop()
+    await reddit_json_session.close()
+    tracer.flush()
 
 app = FastAPI(lifespan=lifespan)
 
-# Load previously posted URLs and scores
-posted_urls: Set[str] = load_data(POSTED_URLS_FILE, set())
-posted_scores: Dict[str, Dict[str, str]] = load_data(POSTED_SCORES_FILE, dict())
-
+@tracer.traced(result='matched')
 def contains_goal_keyword(title: str) -> bool:
     """Check if the post title contains any goal-related keywords or patterns.
     
@@ -72,6 +92,7 @@ def contains_goal_keyword(title: str) -> bool:
     
     return any(indicator in title_lower for indicator in goal_indicators)
 
+@tracer.traced(result='matched')
 def contains_excluded_term(title: str) -> bool:
     """Check if the post title contains any excluded terms.
     
@@ -90,33 +111,118 @@ def contains_excluded_term(title: str) -> bool:
 async def extract_mp4_with_retries(submission, max_retries: int = 30, delay: int = 10) -> Optional[str]:
     """Try to extract MP4 link with retries.
     
+    The attempts are run by the shared extraction scheduler, which probes on a
+    schedule learned per host (see src/utils/retry_schedule.py) and coalesces
+    concurrent requests for the same clip into one job.
+    
     Args:
         submission: Reddit submission
-        max_retries: Maximum number of retries (default 30 = 5 minutes with 10s delay)
-        delay: Delay between retries in seconds
+        max_retries: Together with delay sets the overall deadline (default 30 x 10s = 5 minutes)
+        delay: Delay between retries in seconds for hosts without history
         
     Returns:
         str: MP4 link if found, None otherwise
     """
-    for attempt in range(max_retries):
-        try:
-            mp4_link = await extract_mp4_link(submission)
-            if mp4_link:
-                app_logger.info(f"Successfully extracted MP4 link on attempt {attempt + 1}: {mp4_link}")
-                return mp4_link
+    # The job may be shared with other callers, so don't let our cancellation cancel it
+    return await asyncio.shield(extraction_scheduler.submit(submission, max_retries, delay))
+
+# Follow-up posts that are in progress (kept referenced until they finish)
+mp4_followup_tasks: Set[asyncio.Task] = set()
+
+def schedule_mp4_followup(title: str, original_url: str, team_data: Dict, future: asyncio.Future) -> None:
+    """Post the MP4 link once its extraction job resolves.
+    
+    Uses a done-callback rather than a waiting coroutine, so a pending job
+    costs nothing beyond its scheduler record.
+    
+    Args:
+        title (str): Post title
+        original_url (str): Clip URL that was posted initially
+        team_data (dict): Team data for the Discord post
+        future (asyncio.Future): Extraction job result
+    """
+    def on_done(done: asyncio.Future) -> None:
+        mp4_url = None if done.cancelled() else done.result()
+        app_logger.info(f"Extracted MP4 URL: {mp4_url}")
+        
+        if mp4_url and mp4_url != original_url:  # Only post MP4 if it's different from original URL
+            app_logger.info("Posting MP4 URL (different from original)")
+            # Send just the raw MP4 URL
+            task = asyncio.ensure_future(post_mp4_link(title, mp4_url, team_data))
+            mp4_followup_tasks.add(task)
+            task.add_done_callback(mp4_followup_tasks.discard)
+        else:
+            app_logger.info(f"Skipping MP4 post - {'No MP4 URL found' if not mp4_url else 'Same as original URL'}")
             
-            if attempt < max_retries - 1:  # Don't sleep on last attempt
-                app_logger.info(f"MP4 link not found, retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries})")
-                await asyncio.sleep(delay)
-                
-        except Exception as e:
-            app_logger.error(f"Error extracting MP4 link on attempt {attempt + 1}: {str(e)}")
-            if attempt < max_retries - 1:
-                await asyncio.sleep(delay)
-                
-    app_logger.warning("Failed to extract MP4 link after all retries")
-    return None
+    future.add_done_callback(on_done)
+
+async def wait_for_mp4_followups() -> None:
+    """Wait for all pending extractions and their follow-up posts to finish.
+    
+    Pending submissions keep being refreshed and scanned for comment mirrors in
+    the meantime, so Reddit-hosted videos that finish processing and mirrors
+    posted later are still picked up.
+    """
+    background_tasks = [
+        asyncio.create_task(submission_refresher.run()),
+        asyncio.create_task(comment_scanner.run())
+    ]
+    try:
+        await extraction_scheduler.join()
+    finally:
+        for background_task in background_tasks:
+            background_task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+    if mp4_followup_tasks:
+        await asyncio.gather(*mp4_followup_tasks, return_exceptions=True)
+
+def attach_duplicate_source(original_title: str, url: str, created_utc: Optional[float] = None) -> None:
+    """Add a duplicate post's clip URL to the original's pending MP4 extraction.
+    
+    The duplicate is often on a faster mirror, so probing it alongside the
+    original makes the MP4 arrive as soon as any posted mirror has it.
+    
+    Args:
+        original_title (str): Title of the already posted goal
+        url (str): Clip URL of the duplicate post
+        created_utc (float, optional): When the duplicate was posted
+    """
+    original = posted_state.get_score(original_title) or {}
+    if not original.get('url'):
+        return
+    if extraction_scheduler.add_sources(canonical_source_url(original['url']), [url], created_utc):
+        app_logger.info(f"Added duplicate clip {url} to pending extraction for: {original_title}")
 
+# Outcome of each processed submission: 'posted', 'error' or the reason it was skipped
+submission_decisions: Counter = Counter()
+
+def skip(reason: str, detail: Optional[str] = None) -> bool:
+    """Log and count a skipped submission.
+    
+    Args:
+        reason (str): Why the submission was skipped
+        detail (str, optional): What the reason applies to, appended to the log line
+        
+    Returns:
+        bool: False, for process_submission to return
+    """
+    submission_decisions[reason] += 1
+    app_logger.info(f"[SKIP] {reason}: {detail}" if detail else f"[SKIP] {reason}")
+    return False
+
+def submission_span_attributes(submission, ignore_duplicates: bool = False) -> Dict:
+    """Attributes of a submission's root span."""
+    created_utc = getattr(submission, 'created_utc', None)
+    return {
+        'submission.id': getattr(submission, 'id', None),
+        'submission.title': getattr(submission, 'title', None),
+        'submission.url': getattr(submission, 'url', None),
+        'submission.subreddit': str(getattr(submission, 'subreddit', '') or '') or None,
+        # Time from posting on Reddit until processing started
+        'ingest.delay_seconds': round(clock.time() - created_utc, 3) if created_utc else None
+    }
+
+@tracer.traced(root=True, attributes=submission_span_attributes, result='processed')
 async def process_submission(submission, ignore_duplicates: bool = False) -> bool:
     """Process a Reddit submission for goal clips.
     
@@ -130,7 +236,7 @@ async def process_submission(submission, ignore_duplicates: bool = False) -> boo
     try:
         title = submission.title
         url = submission.url
-        current_time = datetime.now(timezone.utc)
+        current_time = clock.now()
         post_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
         reddit_url = f"https://reddit.com{submission.permalink}"
         
@@ -143,29 +249,20 @@ async def process_submission(submission, ignore_duplicates: bool = False) -> boo
         # Skip old posts based on configured age limit
         if (current_time - post_time) > timedelta(minutes=POST_AGE_MINUTES):
             age_minutes = (current_time - post_time).total_seconds() / 60
-            app_logger.info(f"[SKIP] Post too old: {age_minutes:.1f} min > {POST_AGE_MINUTES} min limit")
-            return False
+            return skip("Post too old", f"{age_minutes:.1f} min > {POST_AGE_MINUTES} min limit")
             
         # Check if title contains a Premier League team
         team_data = find_team_in_title(title, include_metadata=True)
         if not team_data:
-            app_logger.info(f"[SKIP] No Premier League team found: {title}")
-            return False
-            
-        # Skip if we've already processed this URL
-        if url in posted_urls and not ignore_duplicates:
-            app_logger.info(f"[SKIP] URL already processed: {url}")
-            return False
+            return skip("No Premier League team found", title)
             
         # Skip if title contains excluded terms
         if contains_excluded_term(title):
-            app_logger.info(f"[SKIP] Contains excluded terms: {title}")
-            return False
+            return skip("Contains excluded terms", title)
             
         # Check if this is a goal post
         if not contains_goal_keyword(title):
-            app_logger.info(f"[SKIP] Not a goal post: {title}")
-            return False
+            return skip("Not a goal post", title)
             
         # Check if URL domain is allowed
         base_domain = get_base_domain(url)
@@ -179,14 +276,26 @@ async def process_submission(submission, ignore_duplicates: bool = False) -> boo
                 break
                 
         if not domain_allowed:
-            app_logger.info(f"[SKIP] Domain not allowed: {base_domain}")
-            return False
+            return skip("Domain not allowed", base_domain)
             
-        # Check if this is a duplicate score
-        if not ignore_duplicates and is_duplicate_score(title, posted_scores, current_time, url):
-            app_logger.info(f"[SKIP] Duplicate score detected")
+        # Skip already posted URLs and duplicate scores, and reserve both in one step so a
+        # concurrent post of the same goal sees this one as posted
+        record = {
+            'timestamp': current_time.isoformat(),
+            'url': url,
+            'reddit_url': reddit_url
+        }
+        reservation = await posted_state.reserve(title, url, record, current_time, ignore_duplicates,
+                                                 submission.created_utc)
+        if reservation.reason == URL_POSTED:
+            return skip("URL already processed", url)
+        if reservation.reason == IN_PROGRESS:
+            return skip("URL being posted", url)
+        if not reservation.reserved:
+            skip("Duplicate score detected")
             app_logger.info(f"Title:      {title}")
             app_logger.info(f"Reddit URL: {reddit_url}")
+            attach_duplicate_source(reservation.original_title, url, submission.created_utc)
             return False
             
         app_logger.info("-" * 40)
@@ -196,121 +305,157 @@ async def process_submission(submission, ignore_duplicates: bool = False) -> boo
         app_logger.info(f"Teams:     {team_data.get('home', 'Unknown')} vs {team_data.get('away', 'Unknown')}")
         app_logger.info("-" * 40)
         
-        # Add to posted_scores before posting to Discord
-        posted_scores[title] = {
-            'timestamp': current_time.isoformat(),
-            'url': url,
-            'reddit_url': reddit_url
-        }
-        save_data(posted_scores, POSTED_SCORES_FILE)
-        
         # Post initial content to Discord with both URLs in embed
         original_url = submission.url  # Get the original URL directly from submission
         content = f"{title}\n{original_url}\n{reddit_url}"  # Include both URLs
         app_logger.info(f"Posting initial content:\n{content}")
-        await post_to_discord(content, team_data)
+        try:
+            posted = await post_to_discord(content, team_data)
+        except Exception as e:
+            app_logger.error(f"Error posting to Discord: {str(e)}")
+            posted = False
+        if not posted:
+            # Let a later post of this goal go out instead
+            app_logger.warning(f"Discord post failed, releasing: {title}")
+            await posted_state.release(title, url)
+            listing_poller.forget(getattr(submission, 'id', None))
+            return skip("Discord post failed", title)
         
-        # Store score with Reddit post URL and video URL
-        posted_scores[title] = {
+        # Store score with Reddit post URL and video URL, and mark URL as processed
+        alternates = await posted_state.commit(title, url, {
             'timestamp': current_time.isoformat(),
             'url': original_url,  # Store original URL
             'reddit_url': reddit_url
-        }
+        })
         app_logger.info(f"Stored URLs - Original: {original_url}, Reddit: {reddit_url}")
         
-        # Try to extract MP4 link with retries
-        mp4_url = await extract_mp4_with_retries(submission)
-        app_logger.info(f"Extracted MP4 URL: {mp4_url}")
-        
-        if mp4_url and mp4_url != original_url:  # Only post MP4 if it's different from original URL
-            app_logger.info(f"Posting MP4 URL (different from original)")
-            # Send just the raw MP4 URL
-            await post_mp4_link(title, mp4_url, team_data)
-        else:
-            app_logger.info(f"Skipping MP4 post - {'No MP4 URL found' if not mp4_url else 'Same as original URL'}")
-            
-        # Mark URL as processed
-        posted_urls.add(url)
-        save_data(posted_urls, POSTED_URLS_FILE)
-        save_data(posted_scores, POSTED_SCORES_FILE)
+        # Hand MP4 extraction to the scheduler; the MP4 is posted when the job resolves
+        future = extraction_scheduler.submit(submission)
+        for alternate_url, alternate_created_utc in alternates:
+            attach_duplicate_source(title, alternate_url, alternate_created_utc)
+        schedule_mp4_followup(title, original_url, team_data, future)
         
+        submission_decisions['posted'] += 1
         return True
         
     except Exception as e:
         app_logger.error(f"Error processing submission: {e}")
+        submission_decisions['error'] += 1
+        listing_poller.forget(getattr(submission, 'id', None))
         return False
 
-async def check_new_posts(background_tasks: BackgroundTasks) -> None:
-    """Check for new goal posts on Reddit."""
+async def process_submissions(submissions: List) -> List[bool]:
+    """Process submissions concurrently, at most SUBMISSION_CONCURRENCY at a time.
+    
+    Safe because posted_state checks and reserves each URL and goal in one
+    step, so two posts of the same goal can't both go out.
+    
+    Args:
+        submissions (list): Reddit submissions, newest first
+        
+    Returns:
+        list: process_submission's result for each submission
+    """
+    semaphore = asyncio.Semaphore(SUBMISSION_CONCURRENCY)
+    
+    async def process(submission) -> bool:
+        async with semaphore:
+            return await process_submission(submission)
+            
+    return await asyncio.gather(*(process(submission) for submission in submissions))
+
+@tracer.traced(root=True)
+async def check_new_posts(background_tasks: BackgroundTasks, reddit=None) -> None:
+    """Check for new goal posts on Reddit.
+    
+    Args:
+        background_tasks: FastAPI background tasks, or None to process inline
+        reddit: asyncpraw Reddit client to use; a temporary one is created if not given
+    """
+    owns_client = reddit is None
+    post_count = 0
+    error = None
+    poll_monitor.start()
     try:
-        app_logger.info("Checking new posts in r/soccer...")
+        app_logger.info(f"Checking new posts in r/{'+'.join(SUBREDDITS)}...")
         
         # Create Reddit client
-        try:
-            reddit = await create_reddit_client()
-            app_logger.info("Successfully created Reddit client")
-        except Exception as e:
-            app_logger.error(f"Failed to create Reddit client: {str(e)}")
-            return
-            
-        # Get subreddit
-        try:
-            subreddit = await reddit.subreddit('soccer')
-            app_logger.info("Successfully got r/soccer subreddit")
-        except Exception as e:
-            app_logger.error(f"Failed to get subreddit: {str(e)}")
-            return
+        if owns_client:
+            try:
+                reddit = await create_reddit_client()
+                app_logger.info("Successfully created Reddit client")
+            except Exception as e:
+                app_logger.error(f"Failed to create Reddit client: {str(e)}")
+                error = f"Failed to create Reddit client: {str(e)}"
+                return
         
         # Only get posts from configured time window
-        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=POST_AGE_MINUTES)
+        cutoff_time = clock.now() - timedelta(minutes=POST_AGE_MINUTES)
         app_logger.info(f"Looking for posts newer than {cutoff_time}")
         
-        post_count = 0
         try:
-            async for submission in subreddit.new(limit=200):
+            # Cheap head probe most of the time, full page on periodic sweeps; only unseen posts come back
+            submissions = await listing_poller.poll(reddit)
+            submission_recorder.record(submissions)
+            recent = []
+            for submission in submissions:
                 # Skip posts older than configured age limit
                 created_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
                 if created_time < cutoff_time:
                     app_logger.debug(f"Skipping old post from {created_time}: {submission.title}")
                     break  # Posts are in chronological order, so we can break
+                recent.append(submission)
                 
-                post_count += 1
-                if background_tasks:
+            post_count = len(recent)
+            if background_tasks:
+                for submission in recent:
                     background_tasks.add_task(process_submission, submission)
-                else:
-                    await process_submission(submission)
+            else:
+                await process_submissions(recent)
                     
             app_logger.info(f"Found {post_count} posts within the last {POST_AGE_MINUTES} minutes")
             
         except Exception as e:
             app_logger.error(f"Error iterating through posts: {str(e)}")
+            error = f"Error iterating through posts: {str(e)}"
             return
             
     except Exception as e:
         app_logger.error(f"Top-level error in check_new_posts: {str(e)}")
+        error = f"Top-level error in check_new_posts: {str(e)}"
         return
+    finally:
+        poll_monitor.finish(post_count, error)
+        if owns_client and reddit is not None:
+            await reddit.close()
 
 async def periodic_check():
     """Periodically check for new posts."""
     app_logger.info("Starting periodic check...")
+    # The first poll is due now, so a loop stuck on it shows up as stalled
+    poll_monitor.expect_next(0)
     
     while True:
         try:
             # Create a new Reddit client for each iteration
             reddit = await create_reddit_client()
             try:
-                await check_new_posts(None)
+                await check_new_posts(None, reddit)
+                rate_governor.observe(reddit)
             finally:
                 # Always close the Reddit client properly
                 await reddit.close()
                 
-            # Sleep for 30 seconds between checks to avoid rate limits
-            await asyncio.sleep(30)
+            # Poll fast while a match is live, slowly otherwise, within the rate budget
+            interval = rate_governor.poll_interval(poll_scheduler.plan(), listing_poller.requests_per_poll())
+            poll_monitor.expect_next(interval)
+            await clock.sleep(interval)
             
         except Exception as e:
             app_logger.error(f"Error in periodic check: {str(e)}")
             # Sleep for 60 seconds on error before retrying
-            await asyncio.sleep(60)
+            poll_monitor.expect_next(60)
+            await clock.sleep(60)
 
 async def test_past_hours(hours: int = 2) -> None:
     """Test the bot by processing posts from the past X hours.
@@ -322,13 +467,12 @@ async def test_past_hours(hours: int = 2) -> None:
         app_logger.info(f"Testing posts from the past {hours} hours...")
         
         reddit = await create_reddit_client()
-        subreddit = await reddit.subreddit('soccer')
         
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        cutoff_time = clock.now() - timedelta(hours=hours)
         processed = 0
         found = 0
         
-        async for submission in subreddit.new(limit=500):  # Increase limit to find older posts
+        async for submission in fetch_new_submissions(reddit, limit=500):  # Increase limit to find older posts
             created_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
             if created_time < cutoff_time:
                 break
@@ -340,6 +484,7 @@ async def test_past_hours(hours: int = 2) -> None:
                 app_logger.info(f"Found goal post: {title}")
                 await process_submission(submission)
                 
+        await wait_for_mp4_followups()
         app_logger.info(f"Test complete. Processed {processed} posts, found {found} goal posts.")
         
     except Exception as e:
@@ -358,28 +503,35 @@ async def test_specific_threads(thread_ids: List[str], ignore_posted: bool = Fal
     app_logger.info(f"Testing {len(thread_ids)} specific threads...")
     reddit = await create_reddit_client()
     
-    for thread_id in thread_ids:
+    # Fetch all threads in /api/info batches instead of one request per thread
+    try:
+        submissions = await fetch_submissions(reddit, thread_ids)
+    except Exception as e:
+        app_logger.error(f"Error fetching threads {thread_ids}: {str(e)}")
+        submissions = []
+    if len(submissions) < len(thread_ids):
+        app_logger.warning(f"Only {len(submissions)} of {len(thread_ids)} threads were found")
+    
+    for submission in submissions:
         try:
-            submission = await reddit.submission(thread_id)
             title = submission.title
             app_logger.info(f"\nProcessing thread: {title}")
             app_logger.info(f"URL: {submission.url}")
             
             if ignore_posted:
-                # Temporarily remove URL from posted_urls if it exists
-                was_posted = submission.url in posted_urls
-                if was_posted:
-                    posted_urls.remove(submission.url)
+                # Temporarily forget the URL if it was posted
+                was_posted = await posted_state.discard_url(submission.url)
                     
             await process_submission(submission, ignore_duplicates)
             
             if ignore_posted and was_posted:
-                # Restore URL to posted_urls if it was there before
-                posted_urls.add(submission.url)
+                # Restore URL if it was posted before
+                await posted_state.add_url(submission.url)
                 
         except Exception as e:
-            app_logger.error(f"Error processing thread {thread_id}: {str(e)}")
+            app_logger.error(f"Error processing thread {submission.id}: {str(e)}")
             
+    await wait_for_mp4_followups()
     await reddit.close()  # Close the Reddit client session
     app_logger.info("Test complete. Processed {} threads.".format(len(thread_ids)))
 
@@ -409,6 +561,143 @@ async def health_check():
     """
     return {"status": "healthy"}
 
+def hit_rate(hits: int, misses: int) -> Optional[float]:
+    return round(hits / (hits + misses), 3) if hits + misses else None
+
+@app.get("/status")
+async def pipeline_status():
+    """Pipeline status endpoint.
+    
+    Built from counters the components already keep, so it is cheap enough
+    to scrape every few seconds.
+    
+    Returns:
+        dict: "ok" or "degraded", the last poll, queue depths, pending
+            extraction jobs and their ages, cache sizes and hit rates, the
+            state store size, submission decision counts and the Discord backlog
+    """
+    poll = poll_monitor.snapshot()
+    scheduler = extraction_scheduler.snapshot()
+    listing = listing_poller.snapshot()
+    discord = webhook_limiter.snapshot()
+    return {
+        "status": "degraded" if poll["stalled"] else "ok",
+        "time": clock.time(),
+        "poll": poll,
+        "queues": {
+            "extraction_queued": scheduler["queued"],
+            "extraction_probing": scheduler["probing"],
+            "mp4_followups": len(mp4_followup_tasks),
+            "discord_waiting": discord["waiting"]
+        },
+        "extractions": {
+            "pending": scheduler["pending"],
+            "oldest_age": scheduler["oldest_pending_age"],
+            "median_age": scheduler["median_pending_age"],
+            "succeeded": scheduler["succeeded"],
+            "failed": scheduler["failed"]
+        },
+        "caches": {
+            "seen_ids": {"size": len(listing_poller.seen), "limit": listing_poller.seen.limit,
+                         "hit_rate": listing["seen_hit_rate"]},
+            "url_templates": {"size": sum(len(patterns) for patterns in url_templates.templates.values()),
+                              "hit_rate": hit_rate(url_templates.stats["hits"], url_templates.stats["misses"])}
+        },
+        "state": posted_state.snapshot(),
+        "decisions": dict(submission_decisions),
+        "discord": discord
+    }
+
+@app.get("/hosts")
+async def hosts_status():
+    """Mirror host health endpoint.
+    
+    Returns:
+        dict: Circuit breaker and concurrency limit state per host
+    """
+    return host_health.snapshot()
+
+@app.get("/polling")
+async def polling_status():
+    """Polling schedule endpoint.
+    
+    Returns:
+        dict: Polling mode (live, idle or fixed), current interval, next planned
+            poll, the live and next fixtures, head probe/sweep counters and
+            the Reddit rate budget
+    """
+    return {
+        **poll_scheduler.snapshot(),
+        "listing": listing_poller.snapshot(),
+        "rate_limit": rate_governor.snapshot()
+    }
+
+@app.get("/extractions")
+async def extractions_status():
+    """MP4 extraction scheduler endpoint.
+    
+    Returns:
+        dict: Pending job counts, scheduler counters, how MP4s were found
+            (metadata vs mirror), comment mirror scans and learned availability
+            windows
+    """
+    return {
+        "scheduler": extraction_scheduler.snapshot(),
+        "found_via": extraction_stats,
+        "refresher": submission_refresher.stats,
+        "comment_scanner": comment_scanner.stats,
+        "availability": availability_tracker.snapshot()
+    }
+
+def require_profiling() -> None:
+    """Hide the profiling endpoints unless PROFILING_ENABLED is set."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/debug/profile")
+async def profile(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval: float = Query(0.01, ge=0.001, le=1)
+):
+    """Sampling profile of the running bot.
+    
+    Samples the stacks of every thread (the event loop running the polling
+    loop and request handlers, and the executor threads running mirror
+    requests) for `seconds`.
+    
+    Returns:
+        PlainTextResponse: Collapsed stacks ("frame;frame;... count"), ready for
+            flamegraph.pl or speedscope
+    """
+    require_profiling()
+    try:
+        collapsed = await profiler.profile(seconds, interval)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    filename = f"goal-bot-{clock.now().strftime('%Y%m%d-%H%M%S')}.collapsed"
+    return PlainTextResponse(collapsed, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Profile-Samples": str(profiler.last['rounds'])
+    })
+
+@app.get("/debug/allocations")
+async def allocations(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query('lineno', pattern='^(lineno|filename|traceback)$'),
+    frames: int = Query(1, ge=1, le=50)
+):
+    """Top allocations made while tracing with tracemalloc for `seconds`.
+    
+    Returns:
+        dict: Traced memory totals and the top allocation sites by size still held
+    """
+    require_profiling()
+    try:
+        return await profiler.allocations(seconds, limit, group_by, frames)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
 if __name__ == "__main__":
     # Configure console encoding for Windows
     import sys
@@ -0,0 +1,203 @@
+"""Scanning goal post comments for alternate clip mirrors.
+
+A goal post only links one clip host. On r/soccer, AutoModerator leaves a
+mirror comment on each goal post and users reply to it with the same clip on
+other hosts. While a post's MP4 extraction is pending, its top-level comments
+(and the replies to AutoModerator's comment) are fetched within a strict time
+and request budget. Links on supported domains are attached to the pending
+job, so the first valid MP4 from any mirror wins.
+"""
+
+import asyncio
+import re
+from typing import Any, Dict, List
+from src.config import (
+    COMMENT_SCAN_SECONDS,
+    COMMENT_SCAN_TIMEOUT_SECONDS,
+    COMMENT_SCAN_MAX_REQUESTS,
+    COMMENT_SCAN_MAX_PER_POST,
+    COMMENT_SCAN_COMMENT_LIMIT
+)
+from src.services.extraction_scheduler import ExtractionScheduler, extraction_scheduler
+from src.services.reddit_service import create_reddit_client
+from src.utils.logger import app_logger
+from src.utils.rate_governor import RateGovernor, rate_governor
+from src.utils.url_utils import is_valid_domain, canonical_source_url
+from src.utils import clock
+
+# Links in comment bodies, stopping at markdown/HTML delimiters
+URL_PATTERN = re.compile(r'https?://[^\s()\[\]<>"\']+')
+
+# Authors whose replies are mirror threads worth scanning
+MIRROR_THREAD_AUTHORS = {'AutoModerator'}
+
+def extract_mirror_urls(text: str) -> List[str]:
+    """Extract supported clip links from a comment body.
+
+    Args:
+        text (str): Comment body (markdown)
+
+    Returns:
+        list: Links on supported domains, in order of appearance
+    """
+    urls = []
+    for match in URL_PATTERN.findall(text or ''):
+        url = match.rstrip('.,;:!?*_')
+        if is_valid_domain(url):
+            urls.append(url)
+    return urls
+
+def _is_mirror_thread(comment: Any) -> bool:
+    author = getattr(comment, 'author', None)
+    return getattr(comment, 'stickied', False) or str(author) in MIRROR_THREAD_AUTHORS
+
+def collect_mirror_urls(comments: Any) -> List[str]:
+    """Collect supported clip links from top-level comments and mirror threads.
+
+    Args:
+        comments: Top-level comments of a submission (MoreComments are skipped)
+
+    Returns:
+        list: Links deduplicated by canonical source URL
+    """
+    seen = set()
+    urls = []
+    for comment in comments:
+        bodies = [getattr(comment, 'body', None)]
+        if _is_mirror_thread(comment):
+            bodies += [getattr(reply, 'body', None) for reply in getattr(comment, 'replies', None) or ()]
+        for body in bodies:
+            for url in extract_mirror_urls(body):
+                key = canonical_source_url(url)
+                if key not in seen:
+                    seen.add(key)
+                    urls.append(url)
+    return urls
+
+class CommentScanner:
+    """Periodically scans comments of pending goal posts for clip mirrors."""
+
+    def __init__(
+        self,
+        scheduler: ExtractionScheduler = extraction_scheduler,
+        interval: float = COMMENT_SCAN_SECONDS,
+        timeout: float = COMMENT_SCAN_TIMEOUT_SECONDS,
+        max_requests: int = COMMENT_SCAN_MAX_REQUESTS,
+        max_per_post: int = COMMENT_SCAN_MAX_PER_POST,
+        comment_limit: int = COMMENT_SCAN_COMMENT_LIMIT,
+        governor: RateGovernor = rate_governor
+    ):
+        """Initialize the scanner.
+
+        Args:
+            scheduler (ExtractionScheduler): Scheduler whose pending jobs get the mirrors
+            interval (float): Seconds between scans
+            timeout (float): Time budget for each comment fetch
+            max_requests (int): Comment fetches allowed per scan
+            max_per_post (int): Comment fetches allowed per submission overall
+            comment_limit (int): Comments requested per fetch
+            governor (RateGovernor): Reddit request budget (comment scans have the lowest priority)
+        """
+        self.scheduler = scheduler
+        self.interval = interval
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self.max_per_post = max_per_post
+        self.comment_limit = comment_limit
+        self.governor = governor
+        self.scans: Dict[str, int] = {}
+        self.stats = {'scans': 0, 'requests': 0, 'timeouts': 0, 'errors': 0, 'mirrors': 0}
+
+    async def fetch_comments(self, reddit, submission_id: str) -> List[Any]:
+        """Fetch the top-level comments of a submission in a single request.
+
+        Args:
+            reddit: asyncpraw Reddit client
+            submission_id (str): Submission id
+
+        Returns:
+            list: Top-level comments
+        """
+        submission = await reddit.submission(id=submission_id, fetch=False)
+        submission.comment_limit = self.comment_limit
+        await submission.load()
+        return list(submission.comments)
+
+    async def scan_submission(self, reddit, submission_id: str, key: str) -> int:
+        """Scan one submission's comments and attach its mirrors to the pending job.
+
+        Args:
+            reddit: asyncpraw Reddit client
+            submission_id (str): Submission id
+            key (str): Canonical source URL of the pending job
+
+        Returns:
+            int: Number of new sources attached
+        """
+        self.scans[submission_id] = self.scans.get(submission_id, 0) + 1
+        self.stats['requests'] += 1
+        try:
+            comments = await asyncio.wait_for(self.fetch_comments(reddit, submission_id), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            app_logger.warning(f"Comment scan for {submission_id} timed out after {self.timeout}s")
+            return 0
+        except Exception as e:
+            self.stats['errors'] += 1
+            app_logger.error(f"Error scanning comments of {submission_id}: {str(e)}")
+            return 0
+
+        added = self.scheduler.add_sources(key, collect_mirror_urls(comments))
+        self.stats['mirrors'] += added
+        return added
+
+    async def scan_once(self, reddit) -> int:
+        """Scan the comments of pending submissions within the request budget.
+
+        Submissions scanned the fewest times go first; each is fetched at most
+        `max_per_post` times over the life of its job, and only as many as the
+        Reddit rate budget grants.
+
+        Args:
+            reddit: asyncpraw Reddit client
+
+        Returns:
+            int: Number of new sources attached
+        """
+        pending = self.scheduler.pending_jobs()
+        # Forget submissions whose jobs have finished
+        self.scans = {submission_id: count for submission_id, count in self.scans.items() if submission_id in pending}
+
+        due = [submission_id for submission_id in pending if self.scans.get(submission_id, 0) < self.max_per_post]
+        due.sort(key=lambda submission_id: self.scans.get(submission_id, 0))
+        wanted = min(len(due), self.max_requests)
+        due = due[:self.governor.grant('comments', wanted)] if wanted else []
+        if not due:
+            return 0
+
+        results = await asyncio.gather(*[
+            self.scan_submission(reddit, submission_id, pending[submission_id]) for submission_id in due
+        ])
+        self.governor.observe(reddit)
+        self.stats['scans'] += 1
+        added = sum(results)
+        app_logger.info(f"Scanned comments of {len(due)} submissions, {added} new mirrors found")
+        return added
+
+    async def run(self) -> None:
+        """Scan on a fixed interval until cancelled."""
+        while True:
+            await clock.sleep(self.interval)
+            if not self.scheduler.pending_jobs():
+                continue
+            try:
+                reddit = await create_reddit_client()
+                try:
+                    await self.scan_once(reddit)
+                finally:
+                    await reddit.close()
+            except Exception as e:
+                app_logger.error(f"Error scanning comments: {str(e)}")
+
+# Create a global instance
+comment_scanner = CommentScanner()
@@ -2,11 +2,13 @@
 
 import aiohttp
 import re
-from datetime import datetime, timezone
 from typing import Dict, Optional
 from src.config import DISCORD_WEBHOOK_URL, DISCORD_USERNAME, DISCORD_AVATAR_URL
 from src.config.teams import premier_league_teams
 from src.utils.logger import webhook_logger
+from src.utils.webhook_limiter import webhook_limiter
+from src.utils.tracing import tracer, CLIENT
+from src.utils import clock
 
 def clean_text(text: str) -> str:
     """Clean text by removing unwanted unicode characters."""
@@ -14,6 +16,70 @@ def clean_text(text: str) -> str:
     text = re.sub(r'[\u200e\u200f\u202a-\u202e]', '', text)
     return text.strip()
 
+async def send_webhook(webhook_data: Dict, description: str) -> bool:
+    """Send a message to the Discord webhook, respecting its rate limit.
+
+    Messages are sent one at a time in the order they were queued. When the
+    bucket is empty the send waits for it to reset, and a 429 is retried after
+    Discord's retry_after up to DISCORD_MAX_RETRIES times.
+
+    Args:
+        webhook_data (dict): Webhook payload
+        description (str): What is being posted, for log messages
+
+    Returns:
+        bool: True if Discord accepted the message, False otherwise
+    """
+    webhook_limiter.waiting += 1
+    queued = True
+    try:
+        async with webhook_limiter.lock():
+            webhook_limiter.waiting -= 1
+            queued = False
+            webhook_limiter.in_flight += 1
+            try:
+                return await _send_with_retries(webhook_data, description)
+            finally:
+                webhook_limiter.in_flight -= 1
+    finally:
+        if queued:
+            webhook_limiter.waiting -= 1
+
+async def _send_with_retries(webhook_data: Dict, description: str) -> bool:
+    """Post the payload, waiting out an empty bucket and retrying 429 responses."""
+    async with aiohttp.ClientSession() as session:  # Use context manager to ensure session is closed
+        for attempt in range(webhook_limiter.max_retries + 1):
+            await webhook_limiter.wait()
+            try:
+                with tracer.span('POST discord webhook', kind=CLIENT, attempt=attempt) as span:
+                    async with session.post(DISCORD_WEBHOOK_URL, json=webhook_data) as response:
+                        span.set_attribute('http.status_code', response.status)
+                        webhook_limiter.update(response.headers)
+                        if response.status == 429:
+                            try:
+                                body = await response.json(content_type=None)
+                            except Exception:
+                                body = None
+                            retry_after = webhook_limiter.retry_after(response.headers, body)
+                        elif response.status not in (200, 204):  # 200 with the created message when ?wait=true
+                            response_text = await response.text()
+                            webhook_logger.error(
+                                f"Failed to post {description}. Status code: {response.status}, Response: {response_text}"
+                            )
+                            return False
+                        else:
+                            webhook_limiter.stats['sent'] += 1
+                            return True
+            except Exception as e:
+                webhook_logger.error(f"Error posting {description}: {str(e)}")
+                return False
+
+            webhook_limiter.log_rate_limited(retry_after, attempt)
+            if attempt < webhook_limiter.max_retries:
+                await webhook_limiter.wait(retry_after)
+    return False
+
+@tracer.traced(result='posted')
 async def post_to_discord(
     content: str,
     team_data: Optional[Dict] = None,
@@ -50,7 +116,7 @@ async def post_to_discord(
         "title": title,
         "description": f"{video_url}\n\n{reddit_url}" if video_url and reddit_url else '',  # Double newline between URLs
         "color": color,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": clock.now().isoformat()
     }
 
     # Add team logo if available
@@ -69,31 +135,12 @@ async def post_to_discord(
 
     webhook_logger.info(f"Final webhook data: {webhook_data}")
 
-    success = False
-    async with aiohttp.ClientSession() as session:  # Use context manager to ensure session is closed
-        try:
-            async with session.post(DISCORD_WEBHOOK_URL, json=webhook_data) as response:
-                if response.status == 429:
-                    webhook_logger.warning(
-                        f"Rate limited by Discord. Retry after: {response.headers.get('Retry-After', 'unknown')} seconds"
-                    )
-                    return False
-                    
-                if response.status != 204:
-                    response_text = await response.text()
-                    webhook_logger.error(
-                        f"Failed to post to Discord. Status code: {response.status}, Response: {response_text}"
-                    )
-                    return False
-                    
-                webhook_logger.info("Successfully posted to Discord")
-                success = True
-                
-        except Exception as e:
-            webhook_logger.error(f"Error posting to Discord: {str(e)}")
-            
+    success = await send_webhook(webhook_data, "to Discord")
+    if success:
+        webhook_logger.info("Successfully posted to Discord")
     return success
 
+@tracer.traced(result='posted')
 async def post_mp4_link(title: str, mp4_url: str, team_data: Optional[Dict] = None) -> bool:
     """Post MP4 link to Discord webhook.
     
@@ -116,25 +163,7 @@ async def post_mp4_link(title: str, mp4_url: str, team_data: Optional[Dict] = No
     
     webhook_logger.info(f"Final webhook data: {webhook_data}")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(DISCORD_WEBHOOK_URL, json=webhook_data) as response:
-                if response.status == 429:
-                    webhook_logger.warning(
-                        f"Rate limited by Discord. Retry after: {response.headers.get('Retry-After', 'unknown')} seconds"
-                    )
-                    return False
-                    
-                if response.status != 204:
-                    response_text = await response.text()
-                    webhook_logger.error(
-                        f"Failed to post MP4 link. Status code: {response.status}, Response: {response_text}"
-                    )
-                    return False
-                    
-                webhook_logger.info("Successfully posted MP4 link")
-                return True
-                
-        except Exception as e:
-            webhook_logger.error(f"Error posting MP4 link: {str(e)}")
-            return False
+    success = await send_webhook(webhook_data, "MP4 link")
+    if success:
+        webhook_logger.info("Successfully posted MP4 link")
+    return success
@@ -0,0 +1,398 @@
+"""Central scheduler for pending MP4 extraction jobs.
+
+Instead of one sleeping coroutine per submission, pending extractions are
+stored as small job records in a heap ordered by their next probe time. A
+single dispatcher task moves due jobs onto a queue served by a fixed pool of
+extraction workers.
+
+Jobs are also registered by canonical source URL, so concurrent requests for
+the same clip (periodic checks, /check, thread tests) share one job and one
+set of mirror requests. Extra sources (e.g. mirrors found in the comments)
+can be attached to a pending job; each attempt then probes every source
+concurrently and the first valid MP4 wins.
+"""
+
+import asyncio
+import heapq
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from src.config import EXTRACTION_WORKERS
+from src.services.reddit_service import extract_mp4_link, resolve_mp4_from_metadata
+from src.utils.logger import app_logger
+from src.utils.retry_schedule import AvailabilityTracker, availability_tracker
+from src.utils.tracing import SpanContext, tracer
+from src.utils.url_templates import get_host_key
+from src.utils.url_utils import canonical_source_url
+from src.utils import clock
+
+class ExtractionJob:
+    """Lightweight record of a pending extraction.
+
+    Exposes `url` and `media` like a submission so it can be passed straight to
+    `extract_mp4_link` without keeping the full submission alive.
+    """
+
+    __slots__ = ('job_id', 'submission_id', 'key', 'url', 'media', 'host', 'created_utc', 'deadline',
+                 'default_delay', 'attempt', 'future', 'alternates', 'trace')
+
+    def __init__(self, job_id: int, submission_id: Optional[str], url: str, media: Optional[Dict],
+                 created_utc: float, deadline: float, default_delay: float, future: asyncio.Future,
+                 trace: Optional[SpanContext] = None):
+        self.job_id = job_id
+        self.submission_id = submission_id
+        self.key = canonical_source_url(url)
+        self.url = url
+        self.media = media
+        self.host = get_host_key(url)
+        self.created_utc = created_utc
+        self.deadline = deadline
+        self.default_delay = default_delay
+        self.attempt = 0
+        self.future = future
+        self.alternates: Optional[List[AlternateSource]] = None
+        # Trace of the submission that created the job; attempts are recorded in it
+        self.trace = trace
+
+    def sources(self) -> List[Any]:
+        """Get everything to probe on an attempt: the job itself, then its alternates."""
+        return [self] + list(self.alternates or ())
+
+class AlternateSource:
+    """Extra clip URL for a job, probed without the submission's media."""
+
+    __slots__ = ('url', 'media', 'created_utc')
+
+    def __init__(self, url: str, created_utc: Optional[float] = None):
+        """Initialize the source.
+
+        Args:
+            url (str): Clip URL
+            created_utc (float, optional): When the clip was posted, if known
+        """
+        self.url = url
+        self.media = None
+        self.created_utc = created_utc
+
+class ExtractionScheduler:
+    """Heap-based scheduler dispatching extraction probes to a worker pool."""
+
+    def __init__(
+        self,
+        probe: Callable[[ExtractionJob], Awaitable[Optional[str]]] = extract_mp4_link,
+        workers: int = EXTRACTION_WORKERS,
+        tracker: AvailabilityTracker = availability_tracker
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            probe: Coroutine function making one extraction attempt for a job
+            workers (int): Number of concurrent probes
+            tracker (AvailabilityTracker): Availability history used to plan probes
+        """
+        self.probe = probe
+        self.workers = workers
+        self.tracker = tracker
+        self.stats = {'submitted': 0, 'coalesced': 0, 'succeeded': 0, 'failed': 0, 'probes': 0, 'sources': 0}
+        self._ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heap: List[Tuple[float, int, ExtractionJob]] = []
+        self._pending: Dict[int, ExtractionJob] = {}
+        self._in_flight: Dict[str, ExtractionJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        # Jobs whose probe is running right now
+        self.probing = 0
+
+    def _ensure_started(self) -> None:
+        """Start the dispatcher and workers on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # A new event loop (e.g. a fresh asyncio.run) can't use the old loop's jobs
+        self._loop = loop
+        self._stopping = False
+        self._heap = []
+        self._pending = {}
+        self._in_flight = {}
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks = [loop.create_task(self._dispatch_loop())]
+        self._tasks += [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, submission: Any, max_retries: int = 30, delay: float = 10) -> asyncio.Future:
+        """Schedule MP4 extraction for a submission.
+
+        If a job for the same clip is already in flight, its future is returned
+        instead of starting another one. Awaiting callers that may be cancelled
+        should wrap the future in asyncio.shield, since it is shared.
+
+        Args:
+            submission: Reddit submission (only url, media and created_utc are kept)
+            max_retries (int): Together with delay sets the overall deadline
+            delay (float): Fallback delay between probes for hosts without history
+
+        Returns:
+            asyncio.Future: Resolves to the MP4 URL, or None once the deadline passes
+        """
+        self._ensure_started()
+        # Zero-network fast path: the listing metadata may already carry the MP4
+        mp4_url = resolve_mp4_from_metadata(submission)
+        if mp4_url:
+            future = self._loop.create_future()
+            future.set_result(mp4_url)
+            return future
+            
+        existing = self._in_flight.get(canonical_source_url(submission.url))
+        if existing is not None and not existing.future.done():
+            self.stats['coalesced'] += 1
+            app_logger.info(f"Joining in-flight extraction for {existing.key} (attempt {existing.attempt})")
+            return existing.future
+            
+        job = ExtractionJob(
+            job_id=next(self._ids),
+            submission_id=getattr(submission, 'id', None),
+            url=submission.url,
+            media=getattr(submission, 'media', None),
+            created_utc=getattr(submission, 'created_utc', None) or clock.time(),
+            deadline=clock.monotonic() + max_retries * delay,
+            default_delay=delay,
+            future=self._loop.create_future(),
+            trace=tracer.context()
+        )
+        self._pending[job.job_id] = job
+        self._in_flight[job.key] = job
+        self.stats['submitted'] += 1
+        self._schedule(job, clock.monotonic())
+        return job.future
+
+    def _schedule(self, job: ExtractionJob, due: float) -> None:
+        heapq.heappush(self._heap, (due, job.job_id, job))
+        # Only wake the dispatcher if this job is now the next one due
+        if self._heap[0][2] is job:
+            self._wakeup.set()
+
+    def _release_keys(self, job: ExtractionJob) -> None:
+        for key in [job.key] + [canonical_source_url(source.url) for source in job.alternates or ()]:
+            if self._in_flight.get(key) is job:
+                del self._in_flight[key]
+
+    def _finish(self, job: ExtractionJob, mp4_url: Optional[str]) -> None:
+        self._pending.pop(job.job_id, None)
+        self._release_keys(job)
+        self.stats['succeeded' if mp4_url else 'failed'] += 1
+        if not job.future.done():
+            job.future.set_result(mp4_url)
+
+    async def _dispatch_loop(self) -> None:
+        """Move due jobs onto the worker queue, sleeping until the next one is due."""
+        while not self._stopping:
+            self._wakeup.clear()
+            now = clock.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, job = heapq.heappop(self._heap)
+                self._queue.put_nowait(job)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        """Run probes for due jobs."""
+        while True:
+            job = await self._queue.get()
+            self.probing += 1
+            try:
+                await self._run_probe(job)
+            except Exception as e:
+                app_logger.error(f"Error in extraction worker for {job.url}: {str(e)}")
+                self._finish(job, None)
+            finally:
+                self.probing -= 1
+                self._queue.task_done()
+
+    async def _run_probe(self, job: ExtractionJob) -> None:
+        """Make one extraction attempt and reschedule the job if it missed."""
+        if job.future.done():
+            # Resolved elsewhere (e.g. cancelled); just drop it
+            self._pending.pop(job.job_id, None)
+            self._release_keys(job)
+            return
+
+        job.attempt += 1
+        with tracer.span('extraction attempt', parent=job.trace, attempt=job.attempt, host=job.host,
+                         sources=len(job.alternates or ()) + 1) as span:
+            mp4_url, source = await self._probe_sources(job)
+            span.set_attribute('found', bool(mp4_url))
+
+        if job.future.done():
+            # Resolved while probing (e.g. by a metadata refresh); don't count or reschedule it twice
+            return
+
+        if mp4_url:
+            app_logger.info(f"Successfully extracted MP4 link on attempt {job.attempt}: {mp4_url}")
+            # Availability is learned from the found clip's own post time; mirrors found in
+            # comments have none, and the original post's time would include their posting delay
+            if source.created_utc is not None:
+                self.tracker.record(get_host_key(source.url), clock.time() - source.created_utc)
+            self._finish(job, mp4_url)
+            return
+
+        now = clock.monotonic()
+        wait = self.tracker.next_delay(
+            job.host,
+            elapsed=clock.time() - job.created_utc,
+            remaining=job.deadline - now,
+            default_delay=job.default_delay
+        )
+        if wait is None:
+            app_logger.warning(f"Failed to extract MP4 link after {job.attempt} attempts: {job.url}")
+            self._finish(job, None)
+            return
+
+        app_logger.info(f"MP4 link not found, retrying in {wait:.1f} seconds... (attempt {job.attempt}, host {job.host})")
+        self._schedule(job, now + wait)
+
+    async def _probe_one(self, job: ExtractionJob, source: Any) -> Optional[str]:
+        self.stats['probes'] += 1
+        try:
+            return await self.probe(source)
+        except Exception as e:
+            app_logger.error(f"Error extracting MP4 link from {source.url} on attempt {job.attempt}: {str(e)}")
+            return None
+
+    async def _probe_sources(self, job: ExtractionJob) -> Tuple[Optional[str], Any]:
+        """Probe all of a job's sources concurrently, returning the first MP4 found."""
+        sources = job.sources()
+        if len(sources) == 1:
+            return await self._probe_one(job, job), job
+
+        tasks = {asyncio.ensure_future(self._probe_one(job, source)): source for source in sources}
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = tasks.pop(task)
+                    if task.result():
+                        return task.result(), source
+            return None, None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def add_sources(self, key: str, urls: Iterable[str], created_utc: Optional[float] = None) -> int:
+        """Attach alternate clip URLs to a pending job.
+
+        The alternates are probed alongside the job's own URL on every later
+        attempt, and new requests for them join the job.
+
+        Args:
+            key (str): Canonical source URL of the job
+            urls: Alternate clip URLs (e.g. mirrors posted in the comments)
+            created_utc (float, optional): When the alternates were posted, if known
+
+        Returns:
+            int: Number of new sources attached
+        """
+        job = self._in_flight.get(key)
+        if job is None or job.future.done():
+            return 0
+
+        added = 0
+        for url in urls:
+            source_key = canonical_source_url(url)
+            if source_key in self._in_flight:
+                continue
+            if job.alternates is None:
+                job.alternates = []
+            job.alternates.append(AlternateSource(url, created_utc))
+            self._in_flight[source_key] = job
+            added += 1
+        if added:
+            self.stats['sources'] += added
+            app_logger.info(f"Added {added} alternate source(s) to extraction for {job.key}")
+        return added
+
+    def pending_jobs(self) -> Dict[str, str]:
+        """Get the canonical job key for each submission id with a pending extraction."""
+        return {job.submission_id: job.key for job in self._pending.values() if job.submission_id}
+
+    def pending_submission_ids(self) -> Set[str]:
+        """Get the Reddit ids of submissions with a pending extraction."""
+        return {job.submission_id for job in self._pending.values() if job.submission_id}
+
+    def refresh(self, submissions: Iterable[Any]) -> int:
+        """Feed freshly fetched submissions back to their pending jobs.
+        
+        A Reddit-hosted video that finished processing after the post was first
+        seen resolves its job immediately; otherwise the job's media is updated
+        for the next probe.
+
+        Args:
+            submissions: Re-fetched Reddit submissions
+
+        Returns:
+            int: Number of jobs resolved from the fresh metadata
+        """
+        jobs_by_id: Dict[str, List[ExtractionJob]] = {}
+        for job in self._pending.values():
+            if job.submission_id:
+                jobs_by_id.setdefault(job.submission_id, []).append(job)
+
+        resolved = 0
+        for submission in submissions:
+            jobs = jobs_by_id.get(getattr(submission, 'id', None))
+            if not jobs:
+                continue
+            mp4_url = resolve_mp4_from_metadata(submission)
+            for job in jobs:
+                job.media = getattr(submission, 'media', None)
+                if mp4_url:
+                    # Not a sample of the mirror host's availability, so the tracker isn't told
+                    app_logger.info(f"Refreshed submission {job.submission_id} now has an MP4: {mp4_url}")
+                    self._finish(job, mp4_url)
+                    resolved += 1
+        return resolved
+
+    async def join(self) -> None:
+        """Wait until every pending job has resolved."""
+        futures = [job.future for job in self._pending.values()]
+        if futures:
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Stop the dispatcher and workers, resolving pending jobs with None."""
+        for job in list(self._pending.values()):
+            self._finish(job, None)
+        self._heap = []
+        self._in_flight = {}
+        # The dispatcher exits on the flag; cancelling it alone isn't enough, since
+        # wait_for can swallow a cancellation that races with the wakeup (Python <= 3.11)
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return scheduler state for monitoring."""
+        now = clock.time()
+        ages = sorted(now - job.created_utc for job in self._pending.values())
+        return {
+            'pending': len(self._pending),
+            'in_flight_keys': len(self._in_flight),
+            'probing': self.probing,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'oldest_pending_age': round(ages[-1], 1) if ages else None,
+            'median_pending_age': round(ages[len(ages) // 2], 1) if ages else None,
+            **self.stats
+        }
+
+# Create a global instance
+extraction_scheduler = ExtractionScheduler()
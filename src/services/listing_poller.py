@@ -0,0 +1,129 @@
+"""Two-tier polling of the new-posts listing.
+
+Usually only a handful of posts are new between polls, so each poll reads a
+tiny head of the listing. If every item in the head is unseen, more may have
+arrived than it covers, so the poll escalates to a full page. A periodic full
+sweep also catches posts that show up in the listing late (e.g. approved from
+the spam filter). Only submissions not seen before are returned; one whose
+processing failed is forgotten so a later poll returns it again.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from src.config import HEAD_PROBE_LIMIT, FULL_SWEEP_LIMIT, FULL_SWEEP_SECONDS, SEEN_IDS_LIMIT
+from src.services.reddit_service import fetch_new_submissions
+from src.utils.logger import app_logger
+from src.utils.tracing import tracer, CLIENT
+from src.utils import clock
+
+class SeenIds:
+    """Insertion-ordered set of ids that forgets the oldest beyond a size limit."""
+
+    def __init__(self, limit: int = SEEN_IDS_LIMIT):
+        self.limit = limit
+        self._ids: 'OrderedDict[str, None]' = OrderedDict()
+
+    def __contains__(self, submission_id: str) -> bool:
+        return submission_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, submission_id: str) -> None:
+        self._ids[submission_id] = None
+        self._ids.move_to_end(submission_id)
+        while len(self._ids) > self.limit:
+            self._ids.popitem(last=False)
+
+    def discard(self, submission_id: str) -> None:
+        self._ids.pop(submission_id, None)
+
+class ListingPoller:
+    """Reads new submissions with a cheap head probe and periodic full sweeps."""
+
+    def __init__(
+        self,
+        head_limit: int = HEAD_PROBE_LIMIT,
+        full_limit: int = FULL_SWEEP_LIMIT,
+        sweep_interval: float = FULL_SWEEP_SECONDS,
+        seen_limit: int = SEEN_IDS_LIMIT
+    ):
+        """Initialize the poller.
+
+        Args:
+            head_limit (int): Listing items read by a head probe
+            full_limit (int): Listing items read by a full sweep
+            sweep_interval (float): Seconds between full sweeps
+            seen_limit (int): Submission ids remembered as seen
+        """
+        self.head_limit = head_limit
+        self.full_limit = full_limit
+        self.sweep_interval = sweep_interval
+        self.seen = SeenIds(seen_limit)
+        self.last_sweep: Optional[float] = None
+        self.stats = {'head': 0, 'escalations': 0, 'sweeps': 0, 'new': 0}
+        self.items_read = 0
+
+    async def _read(self, reddit, limit: int) -> List[Any]:
+        with tracer.span('GET reddit listing', kind=CLIENT, limit=limit) as span:
+            submissions = [submission async for submission in fetch_new_submissions(reddit, limit=limit)]
+            span.set_attribute('items', len(submissions))
+        return submissions
+
+    async def poll(self, reddit, now: Optional[float] = None) -> List[Any]:
+        """Read the listing and return the submissions not seen before.
+
+        Args:
+            reddit: asyncpraw Reddit client
+            now (float, optional): Current monotonic time
+
+        Returns:
+            list: Unseen submissions, newest first
+        """
+        now = clock.monotonic() if now is None else now
+        if self.last_sweep is None or now - self.last_sweep >= self.sweep_interval:
+            submissions = await self._read(reddit, self.full_limit)
+            self.stats['sweeps'] += 1
+            self.last_sweep = now
+        else:
+            submissions = await self._read(reddit, self.head_limit)
+            self.stats['head'] += 1
+            if submissions and all(submission.id not in self.seen for submission in submissions):
+                # The head may not reach back to the last post we saw
+                app_logger.info(f"All {len(submissions)} head items are new, escalating to a full page")
+                submissions = await self._read(reddit, self.full_limit)
+                self.stats['escalations'] += 1
+                self.last_sweep = now
+
+        unseen = [submission for submission in submissions if submission.id not in self.seen]
+        self.items_read += len(submissions)
+        # Mark oldest first so the newest ids are the last to be forgotten
+        for submission in reversed(submissions):
+            self.seen.add(submission.id)
+        self.stats['new'] += len(unseen)
+        return unseen
+
+    def requests_per_poll(self) -> float:
+        """Average listing requests a poll makes; an escalated head probe makes two."""
+        polls = self.stats['head'] + self.stats['sweeps']
+        return 1 + self.stats['escalations'] / polls if polls else 1.0
+
+    def forget(self, submission_id: Optional[str]) -> None:
+        """Return a submission again from the next poll that reads it.
+
+        Used when processing a submission failed without a final decision
+        (e.g. its Discord post failed), so it is retried like before ids were
+        remembered.
+        """
+        if submission_id:
+            self.seen.discard(submission_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return poller state for monitoring."""
+        # Share of listing items answered from the seen-id cache
+        hit_rate = 1 - self.stats['new'] / self.items_read if self.items_read else None
+        return {'seen': len(self.seen), 'seen_hit_rate': round(hit_rate, 3) if hit_rate is not None else None,
+                **self.stats}
+
+# Create a global instance
+listing_poller = ListingPoller()
@@ -0,0 +1,171 @@
+"""Match-calendar aware polling intervals.
+
+Fixtures (kickoff times and teams) are read from a local JSON file:
+
+    [
+        {"kickoff": "2024-12-26T15:00:00+00:00", "home": "Arsenal", "away": "Chelsea"},
+        ...
+    ]
+
+While a match is live (kickoff until full time plus a stoppage buffer) Reddit
+is polled every few seconds; otherwise the bot drops to a slow heartbeat that
+never sleeps past the start of the next match window. Without a fixtures file
+the old fixed interval is used.
+"""
+
+import json
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional
+from src.config import (
+    FIXTURES_FILE,
+    LIVE_POLL_SECONDS,
+    IDLE_POLL_SECONDS,
+    DEFAULT_POLL_SECONDS,
+    MATCH_LENGTH_MINUTES,
+    MATCH_BUFFER_MINUTES
+)
+from src.utils.logger import app_logger
+from src.utils import clock
+
+def parse_kickoff(value: str) -> datetime:
+    """Parse an ISO 8601 kickoff time, treating times without an offset as UTC."""
+    kickoff = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=timezone.utc)
+    return kickoff
+
+class Fixture:
+    """A scheduled match and the window in which its goals get posted."""
+
+    __slots__ = ('kickoff', 'home', 'away', 'end')
+
+    def __init__(self, kickoff: datetime, home: str, away: str, length: timedelta, buffer: timedelta):
+        self.kickoff = kickoff
+        self.home = home
+        self.away = away
+        self.end = kickoff + length + buffer
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'home': self.home, 'away': self.away, 'kickoff': self.kickoff.isoformat()}
+
+class PollScheduler:
+    """Plans the next Reddit poll from the fixture calendar."""
+
+    def __init__(
+        self,
+        filename: Optional[str] = FIXTURES_FILE,
+        live_interval: float = LIVE_POLL_SECONDS,
+        idle_interval: float = IDLE_POLL_SECONDS,
+        default_interval: float = DEFAULT_POLL_SECONDS,
+        match_length_minutes: float = MATCH_LENGTH_MINUTES,
+        buffer_minutes: float = MATCH_BUFFER_MINUTES
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            filename (str): Fixtures JSON file, or None for a fixed interval
+            live_interval (float): Seconds between polls while a match is live
+            idle_interval (float): Heartbeat seconds between polls outside match windows
+            default_interval (float): Seconds between polls when no fixtures are available
+            match_length_minutes (float): Kickoff to full time, including half time
+            buffer_minutes (float): Stoppage time and late posts after full time
+        """
+        self.filename = filename
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.default_interval = default_interval
+        self.length = timedelta(minutes=match_length_minutes)
+        self.buffer = timedelta(minutes=buffer_minutes)
+        self.fixtures: List[Fixture] = []
+        self._mtime: Optional[float] = None
+        self.mode = 'fixed'
+        self.interval = default_interval
+        self.next_poll: Optional[datetime] = None
+        self._last_mode: Optional[str] = None
+
+    def load(self) -> None:
+        """(Re)load the fixtures file if it changed since the last load."""
+        if not self.filename or not os.path.exists(self.filename):
+            if self._mtime is not None:
+                app_logger.warning(f"Fixtures file {self.filename} is gone, polling every {self.default_interval}s")
+            self.fixtures = []
+            self._mtime = None
+            return
+
+        mtime = os.path.getmtime(self.filename)
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.filename, encoding='utf-8') as f:
+                entries = json.load(f)
+            fixtures = [
+                Fixture(parse_kickoff(entry['kickoff']), entry.get('home', ''), entry.get('away', ''), self.length, self.buffer)
+                for entry in entries
+            ]
+        except Exception as e:
+            app_logger.error(f"Error loading fixtures from {self.filename}: {str(e)}")
+            return
+        self.fixtures = sorted(fixtures, key=lambda fixture: fixture.kickoff)
+        self._mtime = mtime
+        app_logger.info(f"Loaded {len(self.fixtures)} fixtures from {self.filename}")
+
+    def live_fixtures(self, now: datetime) -> List[Fixture]:
+        """Get the fixtures whose match window contains `now`."""
+        return [fixture for fixture in self.fixtures if fixture.kickoff <= now < fixture.end]
+
+    def next_fixture(self, now: datetime) -> Optional[Fixture]:
+        """Get the next fixture whose window hasn't opened yet."""
+        for fixture in self.fixtures:
+            if fixture.kickoff > now:
+                return fixture
+        return None
+
+    def plan(self, now: Optional[datetime] = None) -> float:
+        """Decide how long to wait before the next poll.
+
+        Args:
+            now (datetime, optional): Current time (defaults to UTC now)
+
+        Returns:
+            float: Seconds until the next poll
+        """
+        now = now or clock.now()
+        self.load()
+
+        if not self.fixtures:
+            self.mode = 'fixed'
+            interval = self.default_interval
+        elif self.live_fixtures(now):
+            self.mode = 'live'
+            interval = self.live_interval
+        else:
+            self.mode = 'idle'
+            interval = self.idle_interval
+            upcoming = self.next_fixture(now)
+            if upcoming:
+                # Wake up in time for kickoff
+                interval = max(self.live_interval, min(interval, (upcoming.kickoff - now).total_seconds()))
+
+        if self.mode != self._last_mode:
+            app_logger.info(f"Polling mode: {self.mode} (every {interval:.0f}s)")
+            self._last_mode = self.mode
+        self.interval = interval
+        self.next_poll = now + timedelta(seconds=interval)
+        return interval
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Return the current polling plan for monitoring."""
+        now = now or clock.now()
+        upcoming = self.next_fixture(now)
+        return {
+            'mode': self.mode,
+            'interval': self.interval,
+            'next_poll': self.next_poll.isoformat() if self.next_poll else None,
+            'live': [fixture.to_dict() for fixture in self.live_fixtures(now)],
+            'next_fixture': upcoming.to_dict() if upcoming else None,
+            'fixtures': len(self.fixtures)
+        }
+
+# Create a global instance
+poll_scheduler = PollScheduler()
@@ -0,0 +1,236 @@
+"""Posted URLs and goal scores, owned by a single writer.
+
+Every change to the posted state goes through one writer task that takes
+commands off a queue and runs them one at a time, so checking a submission
+against what has been posted and reserving its URL and goal is atomic even
+when many submissions are processed concurrently. A submission holds its
+reservation while it is posted to Discord: a second post of the same goal
+(or the same clip) arriving meanwhile sees the reservation and is skipped as
+a duplicate instead of being posted twice. Its clip is kept on the
+reservation as an extra extraction source, since the original's extraction job
+is only submitted once its post has gone out. The reservation becomes a posted
+record on commit or is dropped on release if posting failed.
+
+Each command runs in the caller's context, so spans started by the duplicate
+check belong to the submission's trace.
+"""
+
+import asyncio
+import contextvars
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from src.config import POSTED_URLS_FILE, POSTED_SCORES_FILE
+from src.utils.persistence import save_data, load_data
+from src.utils.score_utils import find_duplicate_score
+from src.utils.logger import app_logger
+
+# Why a reservation was refused
+URL_POSTED = 'url'
+DUPLICATE = 'duplicate'
+IN_PROGRESS = 'in_progress'
+
+class Reservation(NamedTuple):
+    """Outcome of a check-and-reserve."""
+
+    reserved: bool
+    reason: Optional[str] = None
+    original_title: Optional[str] = None
+
+# Clip URL of a duplicate held for the original's extraction, and when it was posted
+Held = Tuple[str, Optional[float]]
+
+def file_size(filename: Optional[str]) -> Optional[int]:
+    """Size of a file in bytes, or None if it doesn't exist yet."""
+    try:
+        return os.path.getsize(filename) if filename else None
+    except OSError:
+        return None
+
+class PostedState:
+    """Single-writer store of posted URLs and goal scores."""
+
+    def __init__(self, urls_file: Optional[str] = POSTED_URLS_FILE, scores_file: Optional[str] = POSTED_SCORES_FILE):
+        """Initialize the store, loading previously posted URLs and scores.
+
+        Args:
+            urls_file (str, optional): Pickle file of posted URLs, or None to keep them in memory
+            scores_file (str, optional): Pickle file of posted scores, or None to keep them in memory
+        """
+        self.urls_file = urls_file
+        self.scores_file = scores_file
+        self.urls: Set[str] = load_data(urls_file, set()) if urls_file else set()
+        self.scores: Dict[str, Dict[str, str]] = load_data(scores_file, dict()) if scores_file else {}
+        # URL of each submission being posted right now -> (title, reserved record, record it replaced,
+        # (clip URL, post time) of duplicates seen meanwhile); the reserved record is already in scores
+        self.reservations: Dict[str, Tuple[str, Dict[str, str], Optional[Dict[str, str]], List[Held]]] = {}
+        self.stats = {'reserved': 0, 'committed': 0, 'released': 0, 'url_posted': 0, 'duplicates': 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        """Start the writer on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._writer())
+
+    async def _writer(self) -> None:
+        while True:
+            context, operation, args, future = await self._queue.get()
+            try:
+                result = context.run(operation, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _call(self, operation: Callable, *args: Any) -> Any:
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((contextvars.copy_context(), operation, args, future))
+        return await future
+
+    def _save(self, urls: bool = True, scores: bool = True) -> None:
+        if urls and self.urls_file:
+            save_data(self.urls, self.urls_file)
+        if scores and self.scores_file:
+            save_data(self.scores, self.scores_file)
+
+    def _reserve(self, title: str, url: str, record: Dict[str, str], timestamp: datetime,
+                 ignore_duplicates: bool, posted_utc: Optional[float]) -> Reservation:
+        if url in self.reservations:
+            # Even a forced repost waits for the post in progress, whose commit or release owns the entry
+            self.stats['url_posted'] += 1
+            return Reservation(False, IN_PROGRESS)
+        if not ignore_duplicates:
+            if url in self.urls:
+                self.stats['url_posted'] += 1
+                return Reservation(False, URL_POSTED)
+            original_title = find_duplicate_score(title, self.scores, timestamp, url)
+            if original_title:
+                self.stats['duplicates'] += 1
+                self._hold_alternate(original_title, url, posted_utc)
+                return Reservation(False, DUPLICATE, original_title)
+        self.reservations[url] = (title, record, self.scores.get(title), [])
+        self.scores[title] = record
+        self.stats['reserved'] += 1
+        self._save(urls=False)
+        return Reservation(True)
+
+    def _hold_alternate(self, original_title: str, url: str, posted_utc: Optional[float]) -> None:
+        # A duplicate of a goal that is still being posted has no extraction job to join yet
+        original_url = (self.scores.get(original_title) or {}).get('url')
+        reservation = self.reservations.get(original_url)
+        if reservation is not None and reservation[0] == original_title and \
+                all(held_url != url for held_url, _ in reservation[3]):
+            reservation[3].append((url, posted_utc))
+            app_logger.info(f"Holding duplicate clip {url} until {original_title} is posted")
+
+    def _commit(self, title: str, url: str, record: Dict[str, str]) -> List[Held]:
+        reservation = self.reservations.pop(url, None)
+        self.urls.add(url)
+        self.scores[title] = record
+        self.stats['committed'] += 1
+        self._save()
+        return reservation[3] if reservation is not None and reservation[0] == title else []
+
+    def _release(self, title: str, url: str) -> None:
+        reservation = self.reservations.get(url)
+        if reservation is None or reservation[0] != title:
+            return
+        del self.reservations[url]
+        _, record, replaced, _ = reservation
+        # Only undo this reservation's own entry; an earlier record under the title is put back
+        if self.scores.get(title) is record:
+            if replaced is None:
+                del self.scores[title]
+            else:
+                self.scores[title] = replaced
+        self.stats['released'] += 1
+        app_logger.info(f"Released reservation for: {title}")
+        self._save(urls=False)
+
+    def _discard_url(self, url: str) -> bool:
+        if url not in self.urls:
+            return False
+        self.urls.discard(url)
+        return True
+
+    async def reserve(self, title: str, url: str, record: Dict[str, str], timestamp: datetime,
+                      ignore_duplicates: bool = False, posted_utc: Optional[float] = None) -> Reservation:
+        """Atomically check a submission against posted and reserved goals and reserve it.
+
+        Args:
+            title (str): Post title
+            url (str): Clip URL
+            record (dict): Score record stored under the title ('timestamp', 'url', 'reddit_url')
+            timestamp (datetime): When the submission is processed
+            ignore_duplicates (bool): Reserve even if the URL or goal was posted before
+            posted_utc (float, optional): When the submission was posted, kept with its clip if it
+                is held for a goal that is still being posted
+
+        Returns:
+            Reservation: reserved, or why not (URL_POSTED, IN_PROGRESS if the URL is being posted right
+                now, or DUPLICATE with the original title)
+        """
+        return await self._call(self._reserve, title, url, record, timestamp, ignore_duplicates, posted_utc)
+
+    async def commit(self, title: str, url: str, record: Dict[str, str]) -> List[Held]:
+        """Turn a reservation into a posted URL and score and persist both.
+
+        Returns:
+            list: (clip URL, post time) of duplicates that arrived while the goal was being posted
+        """
+        return await self._call(self._commit, title, url, record)
+
+    async def release(self, title: str, url: str) -> None:
+        """Drop a reservation whose post failed, so a later post of the goal can go out."""
+        await self._call(self._release, title, url)
+
+    async def discard_url(self, url: str) -> bool:
+        """Forget a posted URL (in memory only); returns whether it was posted."""
+        return await self._call(self._discard_url, url)
+
+    async def add_url(self, url: str) -> None:
+        """Mark a URL as posted again after `discard_url` (in memory only)."""
+        await self._call(self.urls.add, url)
+
+    def get_score(self, title: str) -> Optional[Dict[str, str]]:
+        """Posted score record for a title.
+
+        Reads run on the event loop thread and every write runs to completion
+        without awaiting, so a read never sees a half-applied change.
+        """
+        return self.scores.get(title)
+
+    async def stop(self) -> None:
+        """Finish queued writes and stop the writer."""
+        if self._task is None:
+            return
+        if self._loop is asyncio.get_running_loop():
+            await self._call(lambda: None)
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Store size and counters for monitoring."""
+        return {
+            'posted_urls': len(self.urls),
+            'posted_scores': len(self.scores),
+            'in_progress': len(self.reservations),
+            'queued_writes': self._queue.qsize() if self._queue else 0,
+            'posted_urls_bytes': file_size(self.urls_file),
+            'posted_scores_bytes': file_size(self.scores_file),
+            **self.stats
+        }
+
+# Create a global instance
+posted_state = PostedState()
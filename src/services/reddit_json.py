@@ -0,0 +1,301 @@
+"""Lightweight Reddit ingestion over the raw JSON API.
+
+asyncpraw builds a full model object for every listing item. This optional
+path (REDDIT_JSON_INGESTION=true) fetches the JSON directly through one
+pooled aiohttp session holding an app-only OAuth token, parses it with orjson
+when installed, and keeps only the fields the bot uses in a
+`SubmissionSnapshot`.
+
+`RedditJSONClient` mirrors the small part of the asyncpraw client the bot
+uses (`subreddit(...).new()`, `info()`, `submission()` comments, `auth.limits`
+and `close()`), so the rest of the pipeline works with either client.
+"""
+
+import asyncio
+import base64
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+import aiohttp
+from src.config import CLIENT_ID, CLIENT_SECRET, USER_AGENT, REDDIT_OAUTH_URL, REDDIT_URL
+from src.utils.logger import app_logger
+from src.utils import clock
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+    _loads = json.loads
+
+# Maximum listing items Reddit returns per request
+LISTING_PAGE_SIZE = 100
+
+# Submission fields kept by the bot
+SNAPSHOT_FIELDS = (
+    'id', 'title', 'url', 'permalink', 'created_utc', 'subreddit',
+    'media', 'secure_media', 'preview', 'crosspost_parent_list'
+)
+
+# Crosspost parent fields read when looking for a Reddit-hosted MP4
+CROSSPOST_FIELDS = ('url', 'url_overridden_by_dest', 'media', 'secure_media', 'preview')
+
+def slim_preview(preview: Any) -> Optional[Dict[str, Any]]:
+    """Keep only the MP4-bearing parts of a `preview` dictionary.
+
+    The image resolutions Reddit sends for every post are the bulk of a
+    listing item and are never used.
+    """
+    if not isinstance(preview, dict):
+        return None
+    slim: Dict[str, Any] = {}
+    if preview.get('reddit_video_preview'):
+        slim['reddit_video_preview'] = preview['reddit_video_preview']
+    images = [
+        {'variants': {'mp4': {'source': image['variants']['mp4'].get('source')}}}
+        for image in preview.get('images') or []
+        if (image.get('variants') or {}).get('mp4')
+    ]
+    if images:
+        slim['images'] = images
+    return slim or None
+
+def slim_crosspost_parents(parents: Any) -> Optional[List[Dict[str, Any]]]:
+    """Keep only the fields of crosspost parents that an MP4 can be found in.
+
+    Each parent is a whole submission, preview and media trees included.
+    """
+    if not parents:
+        return None
+    return [
+        {**{name: parent.get(name) for name in CROSSPOST_FIELDS}, 'preview': slim_preview(parent.get('preview'))}
+        for parent in parents if isinstance(parent, dict)
+    ]
+
+class SubmissionSnapshot:
+    """Compact, read-only view of a Reddit submission.
+
+    Has the same attribute names as an asyncpraw Submission for every field
+    the bot reads, so it can be used anywhere a submission is expected.
+    """
+
+    __slots__ = SNAPSHOT_FIELDS
+
+    def __init__(self, **fields: Any):
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, fields.get(name))
+        self.preview = slim_preview(self.preview)
+        self.crosspost_parent_list = slim_crosspost_parents(self.crosspost_parent_list)
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'SubmissionSnapshot':
+        """Create a snapshot from a listing item's `data` dictionary."""
+        return cls(**{name: data.get(name) for name in SNAPSHOT_FIELDS})
+
+    @classmethod
+    def from_submission(cls, submission: Any) -> 'SubmissionSnapshot':
+        """Create a snapshot from an asyncpraw Submission (or any similar object)."""
+        if isinstance(submission, cls):
+            return submission
+        fields = {name: getattr(submission, name, None) for name in SNAPSHOT_FIELDS}
+        if fields['subreddit'] is not None:
+            fields['subreddit'] = str(fields['subreddit'])
+        return cls(**fields)
+
+    def __repr__(self) -> str:
+        return f"SubmissionSnapshot(id={self.id!r}, title={self.title!r})"
+
+class CommentSnapshot:
+    """Compact view of a comment and its loaded replies."""
+
+    __slots__ = ('id', 'body', 'author', 'stickied', 'replies')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.id = data.get('id')
+        self.body = data.get('body')
+        self.author = data.get('author')
+        self.stickied = bool(data.get('stickied'))
+        replies = data.get('replies')
+        self.replies = parse_comments(replies) if isinstance(replies, dict) else []
+
+def parse_comments(listing: Dict[str, Any]) -> List[CommentSnapshot]:
+    """Parse a comment listing, skipping 'load more' stubs."""
+    return [CommentSnapshot(child['data']) for child in listing['data']['children'] if child.get('kind') == 't1']
+
+class RedditJSONSession:
+    """Pooled aiohttp session authenticated with an app-only OAuth token."""
+
+    def __init__(
+        self,
+        client_id: Optional[str] = CLIENT_ID,
+        client_secret: Optional[str] = CLIENT_SECRET,
+        user_agent: Optional[str] = USER_AGENT,
+        oauth_url: str = REDDIT_OAUTH_URL,
+        reddit_url: str = REDDIT_URL,
+        pool_size: int = 10
+    ):
+        """Initialize the session.
+
+        Args:
+            client_id (str): Reddit app client id
+            client_secret (str): Reddit app client secret
+            user_agent (str): User agent sent with every request
+            oauth_url (str): Base URL of the authenticated API
+            reddit_url (str): Base URL of the token endpoint
+            pool_size (int): Maximum pooled connections
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.user_agent = user_agent
+        self.oauth_url = oauth_url.rstrip('/')
+        self.reddit_url = reddit_url.rstrip('/')
+        self.pool_size = pool_size
+        self.limits: Dict[str, Optional[float]] = {'remaining': None, 'used': None}
+        self.stats = {'requests': 0, 'tokens': 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Sessions are bound to their event loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                headers={'User-Agent': self.user_agent or 'goal-bot'},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self._loop = loop
+            self._token = None
+        return self._session
+
+    async def _authorize(self) -> str:
+        if self._token and clock.monotonic() < self._token_expires - 60:
+            return self._token
+        session = self._get_session()
+        credentials = base64.b64encode(f"{self.client_id or ''}:{self.client_secret or ''}".encode()).decode()
+        async with session.post(
+            f"{self.reddit_url}/api/v1/access_token",
+            data={'grant_type': 'client_credentials'},
+            headers={'Authorization': f"Basic {credentials}"}
+        ) as response:
+            response.raise_for_status()
+            data = _loads(await response.read())
+        self._token = data['access_token']
+        self._token_expires = clock.monotonic() + float(data.get('expires_in', 3600))
+        self.stats['tokens'] += 1
+        app_logger.debug(f"Obtained Reddit OAuth token from {self.reddit_url}")
+        return self._token
+
+    def _update_limits(self, headers) -> None:
+        if 'x-ratelimit-remaining' in headers:
+            self.limits = {
+                'remaining': float(headers['x-ratelimit-remaining']),
+                'used': int(float(headers.get('x-ratelimit-used', 0)))
+            }
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET an API path and return the parsed JSON.
+
+        Args:
+            path (str): API path (e.g. '/r/soccer/new')
+            params (dict, optional): Query parameters
+
+        Returns:
+            Parsed JSON response
+        """
+        params = {**(params or {}), 'raw_json': 1}
+        for attempt in range(2):
+            token = await self._authorize()
+            async with self._get_session().get(
+                f"{self.oauth_url}{path}",
+                params=params,
+                headers={'Authorization': f"bearer {token}"}
+            ) as response:
+                self.stats['requests'] += 1
+                self._update_limits(response.headers)
+                if response.status == 401 and attempt == 0:
+                    # Token revoked or expired early; get a new one and retry once
+                    self._token = None
+                    continue
+                response.raise_for_status()
+                return _loads(await response.read())
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+class JSONSubreddit:
+    """Listing access for one subreddit (or a 'a+b' multireddit)."""
+
+    def __init__(self, session: RedditJSONSession, name: str):
+        self.session = session
+        self.display_name = name
+
+    async def new(self, limit: int = 100) -> AsyncIterator[SubmissionSnapshot]:
+        """Yield the newest submissions, one request per 100 items."""
+        after = None
+        remaining = limit
+        while remaining > 0:
+            params = {'limit': min(remaining, LISTING_PAGE_SIZE)}
+            if after:
+                params['after'] = after
+            listing = await self.session.get_json(f"/r/{self.display_name}/new", params)
+            children = listing['data']['children']
+            for child in children:
+                yield SubmissionSnapshot.from_data(child['data'])
+            remaining -= len(children)
+            after = listing['data'].get('after')
+            if not after or not children:
+                break
+
+class JSONSubmissionComments:
+    """Lazily loaded comments of a submission, shaped like an asyncpraw Submission."""
+
+    def __init__(self, session: RedditJSONSession, submission_id: str):
+        self.session = session
+        self.id = submission_id
+        self.comment_limit = 2048
+        self.comments: List[CommentSnapshot] = []
+
+    async def load(self) -> None:
+        """Fetch the submission's comments in one request."""
+        _, comments = await self.session.get_json(f"/comments/{self.id}", {'limit': self.comment_limit})
+        self.comments = parse_comments(comments)
+
+class RedditJSONClient:
+    """Minimal asyncpraw-compatible client backed by a pooled JSON session."""
+
+    def __init__(self, session: Optional[RedditJSONSession] = None):
+        """Initialize the client.
+
+        Args:
+            session (RedditJSONSession): Pooled session (defaults to the shared one)
+        """
+        self.session = session or reddit_json_session
+        # asyncpraw exposes rate limits as reddit.auth.limits
+        self.auth = self.session
+
+    async def subreddit(self, name: str) -> JSONSubreddit:
+        return JSONSubreddit(self.session, name)
+
+    async def info(self, fullnames: Iterable[str]) -> AsyncIterator[SubmissionSnapshot]:
+        """Yield submissions by fullname via /api/info (at most 100 per call)."""
+        listing = await self.session.get_json('/api/info', {'id': ','.join(fullnames)})
+        for child in listing['data']['children']:
+            if child.get('kind') == 't3':
+                yield SubmissionSnapshot.from_data(child['data'])
+
+    async def submission(self, id: str, fetch: bool = True) -> JSONSubmissionComments:
+        submission = JSONSubmissionComments(self.session, id)
+        if fetch:
+            await submission.load()
+        return submission
+
+    async def close(self) -> None:
+        """Release the client; the pooled session stays open for the next one."""
+
+# Create a global instance
+reddit_json_session = RedditJSONSession()
@@ -1,27 +1,37 @@
 """Reddit service for fetching goal clips."""
 
+import asyncio
 import asyncpraw
 import re
 import aiohttp
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, AsyncIterator, List, Set
 from bs4 import BeautifulSoup
-from src.config import CLIENT_ID, CLIENT_SECRET, USER_AGENT
+from src.config import CLIENT_ID, CLIENT_SECRET, USER_AGENT, SUBREDDITS, REDDIT_JSON_INGESTION, REDDIT_OAUTH_URL, REDDIT_URL
 from src.utils.logger import app_logger
+from src.utils.tracing import tracer
 from src.config.teams import premier_league_teams
-from src.utils.url_utils import get_base_domain
+from src.utils.url_utils import get_base_domain, canonical_source_url
 from src.services.video_service import video_extractor
+from src.services.reddit_json import RedditJSONClient, SubmissionSnapshot
 from src.config.domains import base_domains
 
-async def create_reddit_client() -> asyncpraw.Reddit:
+async def create_reddit_client() -> Union[asyncpraw.Reddit, RedditJSONClient]:
     """Create and return a Reddit client instance.
     
+    With REDDIT_JSON_INGESTION enabled, a lightweight client over the pooled
+    raw JSON session is returned instead of an asyncpraw client.
+    
     Returns:
-        asyncpraw.Reddit: Authenticated Reddit client
+        asyncpraw.Reddit or RedditJSONClient: Authenticated Reddit client
     """
+    if REDDIT_JSON_INGESTION:
+        return RedditJSONClient()
     return asyncpraw.Reddit(
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         user_agent=USER_AGENT,
+        oauth_url=REDDIT_OAUTH_URL,  # Overridable to point at a local stand-in (simulation/fake_reddit.py)
+        reddit_url=REDDIT_URL,
         requestor_kwargs={
             'timeout': 30  # Increase timeout to 30 seconds
         },
@@ -29,10 +39,40 @@ async def create_reddit_client() -> asyncpraw.Reddit:
         read_only=True  # Enable read-only mode since we only need to read
     )
 
+async def fetch_new_submissions(reddit, limit: int = 200, subreddits: Optional[List[str]] = None) -> AsyncIterator[Any]:
+    """Yield new submissions from all watched subreddits as one stream.
+    
+    The subreddits are combined into a single multireddit listing
+    (e.g. r/soccer+PremierLeague), so one listing request covers all of them
+    and submissions arrive newest first across sources. Crossposts and
+    reposts of a clip already yielded (same canonical URL) are skipped.
+    
+    Args:
+        reddit: asyncpraw Reddit client
+        limit (int): Maximum submissions to read from the listing
+        subreddits (list, optional): Subreddit names (defaults to SUBREDDITS)
+        
+    Yields:
+        SubmissionSnapshot: Unique submissions, newest first
+    """
+    subreddit = await reddit.subreddit('+'.join(subreddits or SUBREDDITS))
+    seen_ids: Set[str] = set()
+    seen_sources: Set[str] = set()
+    async for submission in subreddit.new(limit=limit):
+        source_key = canonical_source_url(submission.url)
+        if submission.id in seen_ids or source_key in seen_sources:
+            app_logger.debug(f"Skipping repeated clip from r/{getattr(submission, 'subreddit', '?')}: {submission.url}")
+            continue
+        seen_ids.add(submission.id)
+        seen_sources.add(source_key)
+        # Later stages only need a few fields; don't keep the full model alive
+        yield SubmissionSnapshot.from_submission(submission)
+
 def clean_text(text: str) -> str:
     """Clean text to handle unicode characters."""
     return text.encode('ascii', 'ignore').decode('utf-8')
 
+@tracer.traced(result='found')
 def find_team_in_title(title: str, include_metadata: bool = False) -> Optional[Union[str, Dict[str, Any]]]:
     """Find Premier League team in post title.
     
@@ -154,6 +194,86 @@ def find_team_in_title(title: str, include_metadata: bool = False) -> Optional[U
             
     return None
 
+# How extracted MP4 links were found: from submission metadata (no outbound
+# HTTP) or by querying a mirror
+extraction_stats = {'metadata': 0, 'mirror': 0}
+
+def _mp4_from_media(media: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Get the MP4 URL from a `media`/`secure_media` dictionary."""
+    if isinstance(media, dict) and isinstance(media.get('reddit_video'), dict):
+        return media['reddit_video'].get('fallback_url')
+    return None
+
+def _mp4_from_preview(preview: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Get the MP4 URL from a `preview` dictionary (video preview or MP4 variant of a GIF)."""
+    if not isinstance(preview, dict):
+        return None
+    video_preview = preview.get('reddit_video_preview')
+    if isinstance(video_preview, dict) and video_preview.get('fallback_url'):
+        return video_preview['fallback_url']
+    for image in preview.get('images') or []:
+        mp4_variant = (image.get('variants') or {}).get('mp4') or {}
+        url = (mp4_variant.get('source') or {}).get('url')
+        if url:
+            return url
+    return None
+
+def _mp4_from_fields(url: Optional[str], media, secure_media, preview) -> Optional[str]:
+    """Check every MP4-bearing field of a submission (or crosspost parent)."""
+    if url and url.split('?')[0].endswith('.mp4'):
+        return url
+    return _mp4_from_media(media) or _mp4_from_media(secure_media) or _mp4_from_preview(preview)
+
+def find_mp4_in_metadata(submission) -> Optional[str]:
+    """Find an MP4 link in metadata already present on the submission.
+    
+    Checks the submission URL, `media`, `secure_media`, `preview` and the same
+    fields on every crosspost parent, without making any HTTP requests.
+    
+    Args:
+        submission: Reddit submission object (or anything with the same attributes)
+        
+    Returns:
+        str: MP4 link if found, None otherwise
+    """
+    mp4_url = _mp4_from_fields(
+        getattr(submission, 'url', None),
+        getattr(submission, 'media', None),
+        getattr(submission, 'secure_media', None),
+        getattr(submission, 'preview', None)
+    )
+    if mp4_url:
+        return mp4_url
+        
+    for parent in getattr(submission, 'crosspost_parent_list', None) or []:
+        if not isinstance(parent, dict):
+            continue
+        mp4_url = _mp4_from_fields(
+            parent.get('url_overridden_by_dest') or parent.get('url'),
+            parent.get('media'),
+            parent.get('secure_media'),
+            parent.get('preview')
+        )
+        if mp4_url:
+            return mp4_url
+    return None
+
+def resolve_mp4_from_metadata(submission) -> Optional[str]:
+    """Find an MP4 link in submission metadata, counting metadata hits.
+    
+    Args:
+        submission: Reddit submission object
+        
+    Returns:
+        str: MP4 link if found, None otherwise
+    """
+    mp4_url = find_mp4_in_metadata(submission)
+    if mp4_url:
+        extraction_stats['metadata'] += 1
+        app_logger.info(f"✓ MP4 found in submission metadata: {mp4_url}")
+    return mp4_url
+
+@tracer.traced(attributes=lambda submission: {'source.url': submission.url}, result='found')
 async def extract_mp4_link(submission) -> Optional[str]:
     """Extract MP4 link from submission.
     
@@ -172,33 +292,29 @@ async def extract_mp4_link(submission) -> Optional[str]:
         base_domain = get_base_domain(submission.url)
         app_logger.info(f"Base domain: {base_domain}")
         
-        # First check if submission URL is already an MP4
-        if submission.url.endswith('.mp4'):
-            app_logger.info("✓ Direct MP4 URL found")
-            return submission.url
-            
-        # Check if it's a Reddit video
-        if hasattr(submission, 'media') and submission.media:
-            if 'reddit_video' in submission.media:
-                app_logger.info("✓ Reddit video found")
-                url = submission.media['reddit_video']['fallback_url']
-                app_logger.info(f"Reddit video URL: {url}")
-                return url
+        # First check the metadata we already have (direct MP4 URL, Reddit video,
+        # previews, crossposts) before going out to a mirror
+        mp4_url = resolve_mp4_from_metadata(submission)
+        if mp4_url:
+            return mp4_url
                 
         # Handle streamff.live URLs
         if 'streamff.live' in submission.url:
             app_logger.info("✓ Streamff.live URL found")
-            mp4_url = video_extractor.extract_from_streamff(submission.url)
+            mp4_url = await asyncio.to_thread(video_extractor.extract_from_streamff, submission.url)
             if mp4_url:
                 app_logger.info(f"✓ Found MP4 URL: {mp4_url}")
+                extraction_stats['mirror'] += 1
                 return mp4_url
                 
         # Use video extractor for supported base domains
         if any(domain in base_domain for domain in base_domains):
             app_logger.info(f"Using video extractor for {base_domain}")
-            mp4_url = video_extractor.extract_mp4_url(submission.url)
+            # Run the blocking extractor off the event loop so hosts can serve requests concurrently
+            mp4_url = await asyncio.to_thread(video_extractor.extract_mp4_url, submission.url)
             if mp4_url:
                 app_logger.info(f"✓ Found MP4 URL: {mp4_url}")
+                extraction_stats['mirror'] += 1
                 return mp4_url
             else:
                 app_logger.warning(f"Video extractor failed to find MP4 URL for: {submission.url}")
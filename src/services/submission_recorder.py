@@ -0,0 +1,70 @@
+"""Recording of ingested submissions for offline replay.
+
+With RECORD_SUBMISSIONS_FILE set, every submission the listing poller returns
+is appended to a JSONL file, one compact `data` dictionary per line. The file
+can be replayed through the pipeline with `simulation/replay.py` or served by
+the local Reddit stand-in (`simulation/fake_reddit.py --file`).
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+from src.config import RECORD_SUBMISSIONS_FILE
+from src.services.reddit_json import slim_crosspost_parents, slim_preview
+from src.utils.logger import app_logger
+
+# Submission fields written to the recording
+RECORD_FIELDS = (
+    'id', 'title', 'url', 'permalink', 'created_utc', 'subreddit',
+    'media', 'secure_media', 'preview', 'crosspost_parent_list'
+)
+
+def submission_record(submission: Any) -> Dict[str, Any]:
+    """Get the recorded fields of a submission as a JSON-serializable dictionary."""
+    record = {name: getattr(submission, name, None) for name in RECORD_FIELDS}
+    if record['subreddit'] is not None:
+        record['subreddit'] = str(record['subreddit'])
+    record['preview'] = slim_preview(record['preview'])
+    record['crosspost_parent_list'] = slim_crosspost_parents(record['crosspost_parent_list'])
+    return record
+
+class SubmissionRecorder:
+    """Appends ingested submissions to a JSONL file."""
+
+    def __init__(self, filename: Optional[str] = RECORD_SUBMISSIONS_FILE):
+        """Initialize the recorder.
+
+        Args:
+            filename (str, optional): JSONL file to append to (None disables recording)
+        """
+        self.filename = filename
+        self.recorded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.filename)
+
+    def record(self, submissions: Iterable[Any]) -> int:
+        """Append submissions to the recording.
+
+        Args:
+            submissions: Submissions to record
+
+        Returns:
+            int: Number of submissions written
+        """
+        if not self.enabled:
+            return 0
+        try:
+            lines = [json.dumps(submission_record(submission), separators=(',', ':')) for submission in submissions]
+            if not lines:
+                return 0
+            with open(self.filename, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except (OSError, TypeError) as e:
+            app_logger.error(f"Failed to record submissions to {self.filename}: {e}")
+            return 0
+        self.recorded += len(lines)
+        return len(lines)
+
+# Create a global instance
+submission_recorder = SubmissionRecorder()
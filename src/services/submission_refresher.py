@@ -0,0 +1,119 @@
+"""Batched re-fetching of submissions through Reddit's /api/info endpoint.
+
+Submissions with a pending MP4 extraction (and any explicitly requested ids)
+are re-fetched in batches of up to 100 fullnames per request. The fresh
+media is fed back to the extraction jobs, so a v.redd.it video that finishes
+processing after the post was first seen is picked up.
+"""
+
+from typing import Any, Iterable, List, Set
+from src.config import SUBMISSION_REFRESH_SECONDS
+from src.services.extraction_scheduler import ExtractionScheduler, extraction_scheduler
+from src.services.reddit_service import create_reddit_client
+from src.utils.logger import app_logger
+from src.utils.rate_governor import RateGovernor, rate_governor
+from src.utils import clock
+
+# Maximum number of fullnames Reddit accepts per /api/info request
+INFO_BATCH_SIZE = 100
+
+def to_fullname(submission_id: str) -> str:
+    """Convert a submission id to its fullname (e.g. 'abc123' -> 't3_abc123')."""
+    return submission_id if submission_id.startswith('t3_') else f"t3_{submission_id}"
+
+async def fetch_submissions(reddit, submission_ids: Iterable[str], batch_size: int = INFO_BATCH_SIZE) -> List[Any]:
+    """Fetch submissions by id using /api/info, one request per batch.
+
+    Args:
+        reddit: asyncpraw Reddit client
+        submission_ids: Submission ids or fullnames
+        batch_size (int): Fullnames per request (Reddit allows up to 100)
+
+    Returns:
+        list: Fetched submissions (ids Reddit doesn't return are skipped)
+    """
+    fullnames = list(dict.fromkeys(to_fullname(submission_id) for submission_id in submission_ids))
+    submissions = []
+    for start in range(0, len(fullnames), batch_size):
+        batch = fullnames[start:start + batch_size]
+        async for submission in reddit.info(fullnames=batch):
+            submissions.append(submission)
+    return submissions
+
+class SubmissionRefresher:
+    """Periodically refreshes pending and requested submissions in batches."""
+
+    def __init__(self, scheduler: ExtractionScheduler = extraction_scheduler, interval: float = SUBMISSION_REFRESH_SECONDS,
+                 governor: RateGovernor = rate_governor):
+        """Initialize the refresher.
+
+        Args:
+            scheduler (ExtractionScheduler): Scheduler whose pending jobs are refreshed
+            interval (float): Seconds between refreshes
+            governor (RateGovernor): Reddit request budget
+        """
+        self.scheduler = scheduler
+        self.interval = interval
+        self.governor = governor
+        self.requested: Set[str] = set()
+        self.stats = {'refreshes': 0, 'requests': 0, 'submissions': 0, 'resolved': 0}
+
+    def request(self, submission_ids: Iterable[str]) -> None:
+        """Include extra submission ids in the next refresh.
+
+        Args:
+            submission_ids: Submission ids to refresh
+        """
+        self.requested.update(submission_ids)
+
+    async def refresh_once(self, reddit) -> int:
+        """Refresh all pending and requested submissions once.
+
+        Args:
+            reddit: asyncpraw Reddit client
+
+        Returns:
+            int: Number of extraction jobs resolved by the fresh metadata
+        """
+        ids = list(self.scheduler.pending_submission_ids() | self.requested)
+        if not ids:
+            return 0
+
+        # Only spend what the rate budget allows; leftover requested ids wait for the next cycle
+        batches = self.governor.grant('refresh', -(-len(ids) // INFO_BATCH_SIZE))
+        if not batches:
+            return 0
+        ids = ids[:batches * INFO_BATCH_SIZE]
+        self.requested.difference_update(ids)
+
+        submissions = await fetch_submissions(reddit, ids)
+        self.governor.observe(reddit)
+        resolved = self.scheduler.refresh(submissions)
+
+        self.stats['refreshes'] += 1
+        self.stats['requests'] += -(-len(ids) // INFO_BATCH_SIZE)
+        self.stats['submissions'] += len(submissions)
+        self.stats['resolved'] += resolved
+        app_logger.info(f"Refreshed {len(submissions)}/{len(ids)} submissions, {resolved} MP4s found")
+        return resolved
+
+    async def run(self) -> None:
+        """Refresh on a fixed interval until cancelled."""
+        while True:
+            await clock.sleep(self.interval)
+            active = bool(self.scheduler.pending_submission_ids() or self.requested)
+            # Let higher-priority consumers' reservations account for the refreshes
+            self.governor.expect('refresh', self.interval if active else 0)
+            if not active:
+                continue
+            try:
+                reddit = await create_reddit_client()
+                try:
+                    await self.refresh_once(reddit)
+                finally:
+                    await reddit.close()
+            except Exception as e:
+                app_logger.error(f"Error refreshing submissions: {str(e)}")
+
+# Create a global instance
+submission_refresher = SubmissionRefresher()
@@ -4,6 +4,11 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from src.utils.logger import app_logger
+from src.utils.host_health import host_health
+from src.utils.tracing import tracer, CLIENT
+from src.utils import clock
+from src.utils.url_templates import url_templates
+from src.config import HOST_SLOT_WAIT_SECONDS
 from src.config.filters import base_domains
 from typing import Optional
 from urllib.parse import urlparse
@@ -12,8 +17,14 @@ import traceback
 class VideoExtractor:
     """Video extractor class for handling various video hosting sites."""
     
-    def __init__(self):
-        """Initialize the video extractor."""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize the video extractor.
+        
+        Args:
+            session (requests.Session, optional): HTTP session to use (a pooled one is created if not given)
+        """
+        # Reuses connections to the mirror hosts and CDNs across probes
+        self.session = session or requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -30,11 +41,47 @@ class VideoExtractor:
             'DNT': '1'
         }
 
+    def _request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """Send a request, subject to the target host's circuit breaker and concurrency limit.
+        
+        A saturated host is waited on for up to HOST_SLOT_WAIT_SECONDS rather
+        than skipped, so a busy host isn't mistaken for a missing MP4.
+        
+        Args:
+            method (str): HTTP method
+            url (str): URL to request
+            **kwargs: Extra arguments for requests.request
+            
+        Returns:
+            requests.Response: The response, or None if the host's circuit is open or no slot freed up in time
+            
+        Raises:
+            requests.RequestException: If the request itself fails
+        """
+        host = urlparse(url).netloc.lower()
+        if not host_health.acquire(host, timeout=HOST_SLOT_WAIT_SECONDS):
+            app_logger.info(f"[SKIP] Host {host} unavailable (circuit open or still at concurrency limit): {url}")
+            return None
+            
+        start = clock.monotonic()
+        ok = False
+        try:
+            with tracer.span(f"{method} {host}", kind=CLIENT, **{'http.method': method, 'http.url': url}) as span:
+                response = self.session.request(method, url, **kwargs)
+                span.set_attribute('http.status_code', response.status_code)
+            # 4xx means the host is up but the clip isn't there (yet)
+            ok = response.status_code < 500
+            return response
+        finally:
+            host_health.release(host, clock.monotonic() - start, ok)
+
     def validate_mp4_url(self, url: str) -> bool:
         """Validate that an MP4 URL is complete and accessible."""
         try:
             app_logger.info(f"Validating MP4 URL: {url}")
-            response = requests.head(url, headers=self.headers, allow_redirects=True, timeout=10)
+            response = self._request('HEAD', url, headers=self.headers, allow_redirects=True, timeout=10)
+            if response is None:
+                return False
             
             # Log redirect chain if any
             if len(response.history) > 0:
@@ -42,6 +89,11 @@ class VideoExtractor:
             
             app_logger.info(f"Got response: {response.status_code} {response.headers.get('Content-Type', '')}")
             
+            # Some CDNs reject HEAD; check with a one-byte GET instead
+            if response.status_code in (403, 405):
+                app_logger.info(f"HEAD rejected with {response.status_code}, trying a range request")
+                return self.probe_mp4_url(url)
+            
             # Accept any 2xx status code and check content type
             if 200 <= response.status_code < 300:
                 content_type = response.headers.get('Content-Type', '').lower()
@@ -56,6 +108,77 @@ class VideoExtractor:
             app_logger.error(f"Error validating URL {url}: {str(e)}")
             return False
 
+    def probe_mp4_url(self, url: str) -> bool:
+        """Check an MP4 URL with a single one-byte range request.
+        
+        Cheaper than a page fetch, and works on CDNs that reject HEAD.
+        """
+        try:
+            headers = {**self.headers, 'Range': 'bytes=0-0'}
+            response = self._request('GET', url, headers=headers, allow_redirects=True, stream=True, timeout=10)
+            if response is None:
+                return False
+            try:
+                content_type = response.headers.get('Content-Type', '').lower()
+                valid = response.status_code in (200, 206) and any(t in content_type for t in ['video', 'mp4', 'octet-stream'])
+            finally:
+                response.close()
+            app_logger.info(f"Range probe {url}: {response.status_code} {content_type} -> {'valid' if valid else 'miss'}")
+            return valid
+        except Exception as e:
+            app_logger.error(f"Error probing URL {url}: {str(e)}")
+            return False
+
+    def try_learned_template(self, url: str) -> Optional[str]:
+        """Try the MP4 URL predicted by a template learned from earlier page parses.
+        
+        A failed probe isn't counted against the template: the clip may not be
+        published yet or the host may be unavailable. The template only misses
+        when the page parse then finds a different MP4 URL (see learn_from_page).
+        
+        Args:
+            url (str): Clip page URL
+            
+        Returns:
+            str: MP4 URL if the template hit, None otherwise
+        """
+        mp4_url = url_templates.candidate(url)
+        if not mp4_url:
+            return None
+            
+        app_logger.info(f"Trying learned template URL: {mp4_url}")
+        if not self.probe_mp4_url(mp4_url):
+            return None
+        url_templates.record(url, hit=True)
+        return mp4_url
+
+    def learn_from_page(self, url: str, mp4_url: str) -> None:
+        """Learn a template from a validated page-parsed MP4 URL.
+        
+        A learned template that predicted a different URL for this clip was
+        wrong, and counts a miss.
+        
+        Args:
+            url (str): Clip page URL that was parsed
+            mp4_url (str): Validated MP4 URL found on the page
+        """
+        predicted = url_templates.candidate(url)
+        if predicted and predicted != mp4_url:
+            url_templates.record(url, hit=False)
+        url_templates.learn(url, mp4_url)
+
+    def learn_if_valid(self, url: str, mp4_url: str) -> None:
+        """Learn a template from a page-parsed MP4 URL once it validates.
+        
+        Args:
+            url (str): Clip page URL that was parsed
+            mp4_url (str): MP4 URL found on the page
+        """
+        if self.validate_mp4_url(mp4_url):
+            self.learn_from_page(url, mp4_url)
+        else:
+            app_logger.info(f"Not learning a template from unvalidated MP4 URL: {mp4_url}")
+
     def extract_from_streamff(self, url: str) -> str:
         """Extract MP4 URL from streamff.live."""
         try:
@@ -87,6 +210,10 @@ class VideoExtractor:
     def extract_from_streamin(self, url: str) -> str:
         """Extract MP4 URL from streamin.one/streamin.me."""
         try:
+            mp4_url = self.try_learned_template(url)
+            if mp4_url:
+                return mp4_url
+                
             # Extract video ID from URL
             video_id = url.split('/')[-1]
             
@@ -112,7 +239,9 @@ class VideoExtractor:
             for k, v in headers.items():
                 app_logger.info(f"{k}: {v}")
             
-            response = requests.get(url, headers=headers, allow_redirects=True)
+            response = self._request('GET', url, headers=headers, allow_redirects=True, timeout=10)
+            if response is None:
+                return None
             response.raise_for_status()
             
             app_logger.info(f"Got response from {response.url}")
@@ -134,6 +263,7 @@ class VideoExtractor:
             if meta and meta.get('content'):
                 mp4_url = meta['content']
                 app_logger.info(f"Found MP4 URL in og:video:secure_url: {mp4_url}")
+                self.learn_if_valid(url, mp4_url)
                 return mp4_url
                 
             # Then try og:video meta tag
@@ -141,6 +271,7 @@ class VideoExtractor:
             if meta and meta.get('content'):
                 mp4_url = meta['content']
                 app_logger.info(f"Found MP4 URL in og:video: {mp4_url}")
+                self.learn_if_valid(url, mp4_url)
                 return mp4_url
                 
             # If meta tags not found, try video source
@@ -151,6 +282,7 @@ class VideoExtractor:
                 src = source.get('src')
                 if src:
                     app_logger.info(f"Found MP4 URL in video source: {src}")
+                    self.learn_if_valid(url, src)
                     return src
             
             app_logger.warning("No video source found")
@@ -179,8 +311,14 @@ class VideoExtractor:
     def extract_from_streamable(self, url: str) -> str:
         """Extract MP4 URL from streamable.com."""
         try:
+            mp4_url = self.try_learned_template(url)
+            if mp4_url:
+                return mp4_url
+                
             app_logger.info(f"Fetching streamable URL: {url}")
-            response = requests.get(url, headers=self.headers)
+            response = self._request('GET', url, headers=self.headers, timeout=10)
+            if response is None:
+                return None
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -206,6 +344,7 @@ class VideoExtractor:
                         
                     if self.validate_mp4_url(mp4_url):
                         app_logger.info(f"Successfully validated MP4 URL: {mp4_url}")
+                        self.learn_from_page(url, mp4_url)
                         return mp4_url
                     else:
                         app_logger.warning(f"MP4 URL validation failed: {mp4_url}")
@@ -0,0 +1,160 @@
+"""Injectable clock for everything in the bot that reads time or sleeps.
+
+Code under `src/` uses `clock.now()`, `clock.time()`, `clock.monotonic()` and
+`clock.sleep()` from this module instead of `datetime.now`, `time.time`,
+`time.monotonic` and `asyncio.sleep`. Normally these are the system clock.
+
+For simulations, `run_virtual()` runs a coroutine on an event loop driven by a
+`VirtualClock`: whenever every task is waiting on a timer, virtual time jumps
+straight to the next one instead of sleeping. Timeouts, retry schedules, the
+5-minute dedup window and poll intervals then play out deterministically and
+as fast as the CPU allows (a whole matchday in seconds).
+"""
+
+import asyncio
+import selectors
+import time as _time
+from datetime import datetime, timezone
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar('T')
+
+class Clock:
+    """System wall-clock and monotonic time."""
+
+    def now(self) -> datetime:
+        """Get the current time as a timezone-aware UTC datetime."""
+        return datetime.now(timezone.utc)
+
+    def time(self) -> float:
+        """Get the current Unix time in seconds."""
+        return _time.time()
+
+    def monotonic(self) -> float:
+        """Get a monotonic time in seconds for measuring intervals."""
+        return _time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep on the running event loop."""
+        await asyncio.sleep(seconds)
+
+class VirtualClock(Clock):
+    """Clock that only moves when advanced (by hand or by the virtual event loop)."""
+
+    def __init__(self, start: Optional[float] = None):
+        """Initialize the clock.
+
+        Args:
+            start (float, optional): Unix time to start at (defaults to the current time)
+        """
+        self.start = _time.time() if start is None else float(start)
+        # Kept apart from the start time: at Unix-time magnitudes, small timer
+        # increments would be lost to float rounding
+        self.elapsed = 0.0
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz=timezone.utc)
+
+    def time(self) -> float:
+        return self.start + self.elapsed
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        if seconds > 0:
+            self.elapsed += seconds
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances virtual time instead of blocking until the next timer."""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is not None and timeout > 0:
+            self.clock.advance(timeout)
+            timeout = 0
+        return super().select(timeout)
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose timers run on a VirtualClock.
+
+    Ready callbacks and I/O run normally; when the loop would wait for its
+    next timer, the clock jumps to that timer instead. Work done in executor
+    threads takes no virtual time.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(_VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+# Clock used by the bot
+_current: Clock = Clock()
+
+def get_clock() -> Clock:
+    """Get the clock currently in use."""
+    return _current
+
+def set_clock(clock: Clock) -> Clock:
+    """Replace the clock in use.
+
+    Args:
+        clock (Clock): New clock
+
+    Returns:
+        Clock: The previous clock
+    """
+    global _current
+    previous, _current = _current, clock
+    return previous
+
+def now() -> datetime:
+    return _current.now()
+
+def time() -> float:
+    return _current.time()
+
+def monotonic() -> float:
+    return _current.monotonic()
+
+async def sleep(seconds: float) -> None:
+    await _current.sleep(seconds)
+
+def run_virtual(main: Awaitable[T], start: Optional[float] = None, clock: Optional[VirtualClock] = None) -> T:
+    """Run a coroutine to completion in virtual time, like `asyncio.run`.
+
+    Args:
+        main: Coroutine to run
+        start (float, optional): Unix time the virtual clock starts at
+        clock (VirtualClock, optional): Clock to use (created from `start` if not given)
+
+    Returns:
+        The coroutine's result
+    """
+    clock = clock or VirtualClock(start)
+    loop = VirtualTimeEventLoop(clock)
+    previous = set_clock(clock)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            _cancel_all_tasks(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+            set_clock(previous)
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
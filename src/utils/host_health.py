@@ -0,0 +1,243 @@
+"""Per-host health tracking for video mirror sites.
+
+Each mirror host gets a circuit breaker, which stops requests after repeated
+failures, and an AIMD limiter, which widens or narrows the number of in-flight
+requests based on observed latency and errors.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+from src.config import (
+    HOST_FAILURE_THRESHOLD,
+    HOST_COOLDOWN_SECONDS,
+    HOST_MAX_CONCURRENCY,
+    HOST_LATENCY_TARGET_SECONDS
+)
+from src.utils.logger import app_logger
+from src.utils import clock
+
+class CircuitBreaker:
+    """Circuit breaker for a single host.
+
+    closed -> open after `failure_threshold` consecutive failures,
+    open -> half_open once `cooldown` seconds have passed,
+    half_open -> closed on a successful trial request, or back to open on failure.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = HOST_FAILURE_THRESHOLD, cooldown: float = HOST_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allow(self, now: float) -> bool:
+        """Check whether a request may be sent.
+
+        Args:
+            now (float): Current monotonic time
+
+        Returns:
+            bool: True if the request is allowed, False otherwise
+        """
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            # Only a single trial request is allowed while half open
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self, now: float) -> None:
+        """Record a failed request, opening the circuit if needed.
+
+        Args:
+            now (float): Current monotonic time
+        """
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = now
+
+class AIMDLimiter:
+    """Additive-increase/multiplicative-decrease limit on in-flight requests."""
+
+    def __init__(
+        self,
+        initial: float = 2.0,
+        minimum: float = 1.0,
+        maximum: float = HOST_MAX_CONCURRENCY,
+        latency_target: float = HOST_LATENCY_TARGET_SECONDS,
+        backoff: float = 0.5
+    ):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        """Reserve an in-flight slot if the current limit allows it.
+
+        Returns:
+            bool: True if a slot was reserved, False if the host is saturated
+        """
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, ok: bool) -> None:
+        """Release a slot and adjust the limit.
+
+        Args:
+            latency (float): Request duration in seconds
+            ok (bool): Whether the request succeeded
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+        if ok and latency <= self.latency_target:
+            # Grow by roughly one slot per full window of good responses
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        else:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+
+class HostHealth:
+    """Health state for a single host."""
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.limiter = AIMDLimiter()
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.waited = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly view of the host state."""
+        return {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.consecutive_failures,
+            'concurrency_limit': round(self.limiter.limit, 2),
+            'in_flight': self.limiter.in_flight,
+            'successes': self.successes,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'waited': self.waited,
+            'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            'error_rate': round(self.error_rate, 3)
+        }
+
+class HostHealthRegistry:
+    """Thread-safe registry of per-host health state."""
+
+    def __init__(self, ewma_alpha: float = 0.2):
+        self.ewma_alpha = ewma_alpha
+        self._hosts: Dict[str, HostHealth] = {}
+        self._lock = threading.Lock()
+        # Signalled whenever a request finishes and frees a slot
+        self._slot_freed = threading.Condition(self._lock)
+
+    def _get(self, host: str) -> HostHealth:
+        health = self._hosts.get(host)
+        if health is None:
+            health = self._hosts[host] = HostHealth()
+        return health
+
+    def acquire(self, host: str, now: Optional[float] = None, timeout: float = 0.0) -> bool:
+        """Try to start a request against a host.
+
+        A host at its concurrency limit is waited on for up to `timeout`
+        seconds, since a slot frees up as soon as one of its requests
+        finishes; an open circuit is rejected straight away.
+
+        Args:
+            host (str): Host name
+            now (float, optional): Current monotonic time
+            timeout (float): Seconds to wait for a free slot on a saturated host
+
+        Returns:
+            bool: True if the request may proceed, False if the circuit is open
+                or the host stayed at its concurrency limit
+        """
+        # Condition.wait blocks the calling thread for real seconds, so the wait is timed
+        # on the real clock even when the bot runs on a virtual one
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            health = self._get(host)
+            waited = False
+            while not health.limiter.try_acquire():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or health.breaker.state == CircuitBreaker.OPEN:
+                    health.rejected += 1
+                    return False
+                if not waited:
+                    health.waited += 1
+                    waited = True
+                self._slot_freed.wait(remaining)
+            now = clock.monotonic() if now is None else now
+            if not health.breaker.allow(now):
+                health.limiter.in_flight -= 1
+                health.rejected += 1
+                return False
+            return True
+
+    def release(self, host: str, latency: float, ok: bool, now: Optional[float] = None) -> None:
+        """Finish a request started with `acquire`.
+
+        Args:
+            host (str): Host name
+            latency (float): Request duration in seconds
+            ok (bool): False for timeouts, connection errors and 5xx responses
+            now (float, optional): Current monotonic time
+        """
+        now = clock.monotonic() if now is None else now
+        with self._lock:
+            health = self._get(host)
+            previous_state = health.breaker.state
+            health.limiter.release(latency, ok)
+            alpha = self.ewma_alpha
+            health.latency_ewma = latency if health.latency_ewma is None else (
+                alpha * latency + (1 - alpha) * health.latency_ewma
+            )
+            health.error_rate = alpha * (0.0 if ok else 1.0) + (1 - alpha) * health.error_rate
+            if ok:
+                health.successes += 1
+                health.breaker.record_success()
+            else:
+                health.failures += 1
+                health.breaker.record_failure(now)
+            state = health.breaker.state
+            self._slot_freed.notify_all()
+
+        if state != previous_state:
+            app_logger.warning(f"Host {host} circuit {previous_state} -> {state}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every known host."""
+        with self._lock:
+            return {host: health.snapshot() for host, health in self._hosts.items()}
+
+# Create a global instance
+host_health = HostHealthRegistry()
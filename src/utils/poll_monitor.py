@@ -0,0 +1,91 @@
+"""Liveness of the polling loop, for the /status endpoint.
+
+`check_new_posts` records when each poll starts and how it ended, and
+`periodic_check` records when the next one is due, starting with the first
+poll as soon as it starts. A poll that is overdue by
+more than POLL_STALL_SECONDS means the loop has died or is stuck, which
+/health cannot tell.
+"""
+
+from typing import Any, Dict, Optional
+from src.config import POLL_STALL_SECONDS
+from src.utils import clock
+
+class PollMonitor:
+    """Records the outcome and timing of each poll."""
+
+    def __init__(self, stall_seconds: float = POLL_STALL_SECONDS):
+        """Initialize the monitor.
+
+        Args:
+            stall_seconds (float): Seconds past the due time before polling counts as stalled
+        """
+        self.stall_seconds = stall_seconds
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.next_due: Optional[float] = None
+        self.running = False
+        self.last_error: Optional[str] = None
+        self.consecutive_errors = 0
+        self.stats = {'polls': 0, 'errors': 0, 'posts': 0}
+        self._started_monotonic = 0.0
+
+    def start(self) -> None:
+        self.running = True
+        self.started_at = clock.time()
+        self._started_monotonic = clock.monotonic()
+
+    def finish(self, posts: int = 0, error: Optional[str] = None) -> None:
+        """Record the end of a poll.
+
+        Args:
+            posts (int): Posts within the age limit that were processed
+            error (str, optional): Why the poll failed, if it did
+        """
+        self.running = False
+        self.finished_at = clock.time()
+        self.duration = clock.monotonic() - self._started_monotonic
+        self.stats['polls'] += 1
+        self.stats['posts'] += posts
+        if error:
+            self.stats['errors'] += 1
+            self.consecutive_errors += 1
+            self.last_error = error
+        else:
+            self.consecutive_errors = 0
+
+    def expect_next(self, seconds: float) -> None:
+        """Record that the next poll should start within `seconds`."""
+        self.next_due = clock.time() + seconds
+
+    def overdue(self, now: Optional[float] = None) -> float:
+        """Seconds the next poll is late by (0 if it isn't)."""
+        if self.next_due is None:
+            return 0.0
+        now = clock.time() if now is None else now
+        return max(0.0, now - self.next_due)
+
+    @property
+    def stalled(self) -> bool:
+        return self.overdue() > self.stall_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Timing of the last poll and whether the loop keeps up."""
+        now = clock.time()
+        return {
+            'last_started': self.started_at,
+            'last_finished': self.finished_at,
+            'last_duration': round(self.duration, 3) if self.duration is not None else None,
+            'seconds_since_last': round(now - self.finished_at, 1) if self.finished_at is not None else None,
+            'running': self.running,
+            'next_due_in': round(self.next_due - now, 1) if self.next_due is not None else None,
+            'overdue': round(self.overdue(now), 1),
+            'stalled': self.stalled,
+            'consecutive_errors': self.consecutive_errors,
+            'last_error': self.last_error,
+            **self.stats
+        }
+
+# Create a global instance
+poll_monitor = PollMonitor()
@@ -0,0 +1,156 @@
+"""On-demand sampling profiler and allocation snapshots for the running bot.
+
+The sampler is a background thread that reads the stack of every other
+thread (`sys._current_frames()`) at a fixed interval, so nothing has to be
+instrumented and the bot runs at full speed between samples. The event loop
+thread runs the polling loop, refreshes, comment scans and the request
+handlers, and mirror requests run in executor threads, so one profile covers
+all of them. Stacks are returned in the collapsed format ("frame;frame;frame
+count" per line) read by flamegraph.pl, speedscope and inferno. The sampler
+needs the GIL to take a sample, so CPU work done in bursts shorter than the
+interpreter's switch interval (5 ms) between awaits is under-counted; the
+slow paths worth finding run much longer than that.
+
+Allocation snapshots use tracemalloc, which is only switched on for the
+duration of the snapshot because tracing slows every allocation down.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict
+from src.config import BASE_DIR
+from src.utils import clock
+
+# Frames of the profiler's own machinery, left out of allocation statistics
+ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+def frame_label(code) -> str:
+    """Label of a stack frame: function name and where it is defined."""
+    filename = code.co_filename
+    if filename.startswith(BASE_DIR + os.sep):
+        filename = os.path.relpath(filename, BASE_DIR)
+    else:
+        filename = '/'.join(filename.replace('\\', '/').split('/')[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Samples the stacks of all threads for a while and collapses them."""
+
+    def __init__(self):
+        self.running = False
+        self.last: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _begin(self) -> None:
+        with self._lock:
+            if self.running:
+                raise RuntimeError("A profile is already running")
+            self.running = True
+
+    def _sample(self, stop: threading.Event, interval: float, counts: Counter) -> None:
+        own_id = threading.get_ident()
+        while not stop.wait(interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                counts[';'.join(reversed(stack))] += 1
+            counts[None] += 1  # Number of sampling rounds
+
+    async def profile(self, seconds: float, interval: float = 0.01) -> str:
+        """Sample every thread for `seconds` and return the collapsed stacks.
+
+        Args:
+            seconds (float): How long to sample
+            interval (float): Seconds between samples
+
+        Returns:
+            str: One "frame;frame;... count" line per distinct stack, root first
+
+        Raises:
+            RuntimeError: If a profile or allocation snapshot is already running
+        """
+        self._begin()
+        counts: Counter = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stop, interval, counts), name='profiler', daemon=True)
+        try:
+            sampler.start()
+            await clock.sleep(seconds)
+        finally:
+            stop.set()
+            sampler.join(timeout=1)
+            self.running = False
+        rounds = counts.pop(None, 0)
+        self.last = {'seconds': seconds, 'interval': interval, 'rounds': rounds, 'stacks': len(counts)}
+        return ''.join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+    async def allocations(self, seconds: float, limit: int = 25, key_type: str = 'lineno', frames: int = 1) -> Dict[str, Any]:
+        """Top allocations still held after `seconds` of normal running.
+
+        If tracemalloc is already tracing (started with PYTHONTRACEMALLOC),
+        the whole traced heap is ranked and the growth over the window is
+        reported alongside; otherwise only allocations made during the window
+        can be seen.
+
+        Args:
+            seconds (float): How long to trace
+            limit (int): Number of entries to return
+            key_type (str): Grouping: 'lineno', 'filename' or 'traceback'
+            frames (int): Frames stored per allocation (more is slower)
+
+        Returns:
+            dict: Traced memory totals and the top entries by size
+
+        Raises:
+            RuntimeError: If a profile or allocation snapshot is already running
+        """
+        self._begin()
+        started = not tracemalloc.is_tracing()
+        try:
+            if started:
+                tracemalloc.start(frames)
+            before = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+            await clock.sleep(seconds)
+            after = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+            self.running = False
+        top = []
+        for stat in after.compare_to(before, key_type)[:limit]:
+            top.append({
+                'location': [str(frame) for frame in stat.traceback],
+                'size_kib': round(stat.size / 1024, 1),
+                'count': stat.count,
+                'size_diff_kib': round(stat.size_diff / 1024, 1),
+                'count_diff': stat.count_diff
+            })
+        return {
+            'seconds': seconds,
+            'traced_before': not started,
+            'traced_kib': round(current / 1024, 1),
+            'peak_kib': round(peak / 1024, 1),
+            'top': top
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Whether a profile is running and the size of the last one."""
+        return {'running': self.running, 'last': self.last}
+
+# Create a global instance
+profiler = SamplingProfiler()
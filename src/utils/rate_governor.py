@@ -0,0 +1,170 @@
+"""Reddit rate-limit budget shared by polling, refreshes and comment scans.
+
+Reddit reports the requests left in the current window through the
+x-ratelimit-* headers, which asyncpraw exposes as `reddit.auth.limits`. The
+budget is shared by every client using the same credentials, so any response
+gives the current picture.
+
+Consumers are served by priority: new-post polling first, then /api/info
+refreshes, then comment scans. A consumer may only spend what is left after
+reserving the expected usage of every consumer above it until the window
+resets. The poll interval is stretched when polling at the desired rate
+would exhaust the window.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Optional
+from src.config import REDDIT_RATE_WINDOW_SECONDS, REDDIT_RATE_RESERVE
+from src.utils.logger import app_logger
+from src.utils import clock
+
+# Consumers in priority order (highest first)
+PRIORITIES = ('poll', 'refresh', 'comments')
+
+class RateGovernor:
+    """Tracks the Reddit request budget and shares it out by priority."""
+
+    def __init__(self, window: float = REDDIT_RATE_WINDOW_SECONDS, reserve: int = REDDIT_RATE_RESERVE):
+        """Initialize the governor.
+
+        Args:
+            window (float): Length of Reddit's rate-limit window in seconds
+            reserve (int): Requests always kept back as a safety margin
+        """
+        self.window = window
+        self.reserve = reserve
+        self.remaining: Optional[float] = None
+        self.used: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.rates: Dict[str, float] = {kind: 0.0 for kind in PRIORITIES}
+        self.stats = {kind: {'granted': 0, 'denied': 0} for kind in PRIORITIES}
+        self.poll_interval_planned: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, remaining: Optional[float], used: Optional[int], reset_seconds: Optional[float] = None,
+               now: Optional[float] = None) -> None:
+        """Record the budget reported by Reddit.
+
+        Args:
+            remaining: Requests left in the current window
+            used: Requests made in the current window
+            reset_seconds: Seconds until the window resets; if unknown, Reddit's
+                windows are aligned to the wall clock so it is derived from `now`
+            now (float, optional): Current wall-clock time
+        """
+        if remaining is None:
+            return
+        now = clock.time() if now is None else now
+        if reset_seconds is None:
+            reset_seconds = self.window - (now % self.window)
+        with self._lock:
+            self.remaining = float(remaining)
+            self.used = used
+            self.reset_at = now + reset_seconds
+
+    def observe(self, reddit) -> None:
+        """Read the current budget from an asyncpraw client after a request."""
+        try:
+            limits = reddit.auth.limits
+        except Exception:
+            return
+        self.update(limits.get('remaining'), limits.get('used'))
+
+    def expect(self, kind: str, interval: float) -> None:
+        """Declare how often a consumer expects to make one request.
+
+        Args:
+            kind (str): Consumer name from PRIORITIES
+            interval (float): Seconds between its requests (0 to clear)
+        """
+        with self._lock:
+            self.rates[kind] = 1 / interval if interval > 0 else 0.0
+
+    def _window_state(self, now: float):
+        """Get (remaining, seconds to reset), treating a passed reset as a fresh window."""
+        if self.remaining is None:
+            return None, None
+        seconds_left = self.reset_at - now
+        if seconds_left <= 0:
+            # The window rolled over since the last response
+            return None, None
+        return self.remaining, seconds_left
+
+    def _reserved_above(self, kind: str, seconds_left: float) -> float:
+        reserved = 0.0
+        for other in PRIORITIES[:PRIORITIES.index(kind)]:
+            reserved += self.rates[other] * seconds_left
+        return reserved
+
+    def grant(self, kind: str, wanted: int = 1, now: Optional[float] = None) -> int:
+        """Ask for requests on behalf of a consumer.
+
+        Args:
+            kind (str): Consumer name from PRIORITIES
+            wanted (int): Requests the consumer would like to make
+            now (float, optional): Current wall-clock time
+
+        Returns:
+            int: Requests the consumer may make now (0..wanted)
+        """
+        now = clock.time() if now is None else now
+        with self._lock:
+            remaining, seconds_left = self._window_state(now)
+            if remaining is None:
+                granted = wanted
+            else:
+                available = remaining - self.reserve - self._reserved_above(kind, seconds_left)
+                granted = max(0, min(wanted, math.floor(available)))
+                self.remaining = remaining - granted
+            self.stats[kind]['granted'] += granted
+            if granted < wanted:
+                self.stats[kind]['denied'] += wanted - granted
+        if granted < wanted:
+            app_logger.info(f"Rate budget: granted {granted}/{wanted} {kind} requests ({remaining:.0f} remaining)")
+        return granted
+
+    def poll_interval(self, desired: float, requests_per_poll: float = 1.0, now: Optional[float] = None) -> float:
+        """Get the fastest poll interval that won't exhaust the window.
+
+        Args:
+            desired (float): Interval the poll scheduler would like
+            requests_per_poll (float): Reddit requests a poll is expected to make (a
+                head probe that escalates to a full page makes two)
+            now (float, optional): Current wall-clock time
+
+        Returns:
+            float: Seconds until the next poll (at least `desired`)
+        """
+        now = clock.time() if now is None else now
+        with self._lock:
+            remaining, seconds_left = self._window_state(now)
+            interval = desired
+            if remaining is not None:
+                budget = remaining - self.reserve
+                if budget < 1:
+                    # Out of requests: wait for the window to reset
+                    interval = max(desired, seconds_left)
+                elif seconds_left / desired * requests_per_poll > budget:
+                    interval = seconds_left * requests_per_poll / budget
+            self.rates['poll'] = requests_per_poll / interval
+            self.poll_interval_planned = interval
+        if interval > desired:
+            app_logger.info(f"Rate budget: stretching poll interval from {desired:.0f}s to {interval:.1f}s")
+        return interval
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Return the budget and per-consumer usage for monitoring."""
+        now = clock.time() if now is None else now
+        with self._lock:
+            remaining, seconds_left = self._window_state(now)
+            return {
+                'remaining': remaining,
+                'used': self.used,
+                'reset_in': round(seconds_left, 1) if seconds_left is not None else None,
+                'poll_interval': self.poll_interval_planned,
+                'consumers': {kind: {'rate': round(self.rates[kind], 4), **self.stats[kind]} for kind in PRIORITIES}
+            }
+
+# Create a global instance
+rate_governor = RateGovernor()
@@ -0,0 +1,171 @@
+"""Adaptive probe schedule for MP4 extraction.
+
+Records, per host, how long after the Reddit post the MP4 became available and
+uses that history to decide when to probe next: densely around the usual
+availability time, then backing off exponentially with jitter.
+"""
+
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.config import AVAILABILITY_FILE
+from src.utils.logger import app_logger
+from src.utils.persistence import save_data, load_data
+
+# Upper bounds (seconds since the post was created) of the histogram buckets;
+# a final overflow bucket catches anything slower
+AVAILABILITY_BUCKETS = [5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240, 300, 450, 600]
+
+class AvailabilityHistogram:
+    """Histogram of time-to-availability samples for one host."""
+
+    def __init__(self, counts: Optional[List[int]] = None):
+        self.counts = list(counts) if counts else [0] * (len(AVAILABILITY_BUCKETS) + 1)
+
+    @property
+    def total(self) -> int:
+        """Number of recorded samples."""
+        return sum(self.counts)
+
+    def record(self, seconds: float) -> None:
+        """Record a time-to-availability sample.
+
+        Args:
+            seconds (float): Seconds from post creation until the MP4 validated
+        """
+        for i, bound in enumerate(AVAILABILITY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def bucket_range(self, q: float) -> Tuple[float, float]:
+        """Get the bounds of the bucket containing the q-th quantile.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            tuple: (lower bound, upper bound) in seconds
+        """
+        target = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                lower = AVAILABILITY_BUCKETS[i - 1] if i > 0 else 0.0
+                upper = AVAILABILITY_BUCKETS[i] if i < len(AVAILABILITY_BUCKETS) else float('inf')
+                return float(lower), float(upper)
+        return 0.0, float(AVAILABILITY_BUCKETS[-1])
+
+class AvailabilityTracker:
+    """Per-host availability history and probe scheduling."""
+
+    def __init__(
+        self,
+        filename: Optional[str] = AVAILABILITY_FILE,
+        min_samples: int = 5,
+        dense_interval: float = 3.0,
+        backoff_factor: float = 1.5,
+        max_backoff: float = 60.0,
+        jitter: float = 0.2,
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the tracker, loading previously recorded history.
+
+        Args:
+            filename (str, optional): Pickle file to persist to, or None to keep in memory
+            min_samples (int): Samples needed before a host's history is trusted
+            dense_interval (float): Delay between probes inside the expected availability window
+            backoff_factor (float): Growth of the time past the window between successive probes
+            max_backoff (float): Longest delay between probes
+            jitter (float): Random +/- fraction applied to backoff delays
+            rng (random.Random, optional): Random source, for deterministic tests
+        """
+        self.filename = filename
+        stored = load_data(filename, dict()) if filename else {}
+        self.histograms: Dict[str, AvailabilityHistogram] = {
+            host: AvailabilityHistogram(counts) for host, counts in stored.items()
+        }
+        self.min_samples = min_samples
+        self.dense_interval = dense_interval
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def record(self, host: str, seconds: float) -> None:
+        """Record how long a host took to serve a valid MP4.
+
+        Args:
+            host (str): Host key
+            seconds (float): Seconds from post creation until the MP4 validated
+        """
+        with self._lock:
+            histogram = self.histograms.setdefault(host, AvailabilityHistogram())
+            histogram.record(max(0.0, seconds))
+            if self.filename:
+                save_data({h: hist.counts for h, hist in self.histograms.items()}, self.filename)
+        app_logger.debug(f"Recorded MP4 availability for {host}: {seconds:.1f}s")
+
+    def expected_window(self, host: str) -> Optional[Tuple[float, float]]:
+        """Get the window in which a host's MP4s usually become available.
+
+        Args:
+            host (str): Host key
+
+        Returns:
+            tuple: (start, end) in seconds since post creation, or None without enough history
+        """
+        histogram = self.histograms.get(host)
+        if not histogram or histogram.total < self.min_samples:
+            return None
+        start, _ = histogram.bucket_range(0.1)
+        _, end = histogram.bucket_range(0.9)
+        return start, min(end, float(AVAILABILITY_BUCKETS[-1]))
+
+    def next_delay(self, host: str, elapsed: float, remaining: float, default_delay: float) -> Optional[float]:
+        """Decide how long to wait before the next probe.
+
+        Args:
+            host (str): Host key
+            elapsed (float): Seconds since the post was created
+            remaining (float): Seconds left before the overall extraction deadline
+            default_delay (float): Fixed delay used for hosts without enough history
+
+        Returns:
+            float: Seconds to wait, or None if the deadline has passed
+        """
+        if remaining <= 0:
+            return None
+
+        window = self.expected_window(host)
+        if window is None:
+            delay = default_delay
+        else:
+            start, end = window
+            if elapsed < start:
+                # Too early - wait for the window to open
+                delay = min(start - elapsed, self.max_backoff)
+            elif elapsed <= end:
+                delay = self.dense_interval
+            else:
+                # Past the window: each gap is a fixed fraction of the time already
+                # spent past it, so probe spacing grows exponentially
+                delay = (elapsed - end) * (self.backoff_factor - 1)
+                delay = min(max(delay, self.dense_interval), self.max_backoff)
+                delay *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+
+        return min(delay, remaining)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return the learned window and sample count per host."""
+        with self._lock:
+            return {
+                host: {'samples': histogram.total, 'window': self.expected_window(host)}
+                for host, histogram in self.histograms.items()
+            }
+
+# Create a global instance
+availability_tracker = AvailabilityTracker()
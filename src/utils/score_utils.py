@@ -3,10 +3,13 @@
 import re
 import time
 import unicodedata
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from typing import Dict, Optional
 from src.utils.logger import app_logger
+from src.utils.tracing import tracer
+from src.config.teams import premier_league_teams
+from src.utils import clock
 
 def get_similarity_ratio(a: str, b: str) -> float:
     """Return a ratio of similarity between two strings.
@@ -135,6 +138,13 @@ def normalize_team_name(team_name: str) -> str:
             
     return name.strip()
 
+# Normalized names of Premier League teams, as produced by normalize_team_name
+EPL_TEAMS = {
+    normalize_team_name(alias)
+    for team in premier_league_teams.values()
+    for alias in [team['name']] + team['aliases']
+}
+
 def extract_goal_info(title: str) -> Optional[Dict[str, str]]:
     """Extract goal information from title.
     
@@ -220,8 +230,9 @@ def extract_minutes(minute_str: str) -> int:
         return int(base) + int(injury)
     return int(minute_str)
 
-def is_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], timestamp: datetime, url: Optional[str] = None) -> bool:
-    """Check if this goal has already been posted.
+@tracer.traced(attributes=lambda title, posted_scores, *args, **kwargs: {'posted_scores': len(posted_scores)}, result='duplicate')
+def find_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], timestamp: datetime, url: Optional[str] = None) -> Optional[str]:
+    """Find the already posted title of the same goal, if any.
     
     Primary matching criteria:
     1. EPL team name matches
@@ -238,13 +249,13 @@ def is_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], tim
         url (str, optional): URL of the post (used for logging)
         
     Returns:
-        bool: True if duplicate, False otherwise
+        str: Title of the matched original post, or None if not a duplicate
     """
     try:
         # Extract goal info from current title
         current_info = extract_goal_info(title)
         if not current_info:
-            return False
+            return None
             
         # Get the EPL team and score from current goal
         current_epl_team = None
@@ -254,7 +265,7 @@ def is_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], tim
             current_epl_team = current_info['team2']
             
         if not current_epl_team:
-            return False
+            return None
             
         for posted_title, data in posted_scores.items():
             # Extract goal info from posted title
@@ -322,13 +333,29 @@ def is_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], tim
             app_logger.info(f"Reddit URL: {data.get('reddit_url', 'Unknown')}")
             app_logger.info(f"Duplicate:  {title}")
             app_logger.info("-" * 40)
-            return True
+            return posted_title
                 
-        return False
+        return None
         
     except Exception as e:
         app_logger.error(f"Error checking duplicate score: {str(e)}")
-        return False
+        return None
+
+def is_duplicate_score(title: str, posted_scores: Dict[str, Dict[str, str]], timestamp: datetime, url: Optional[str] = None) -> bool:
+    """Check if this goal has already been posted.
+    
+    See `find_duplicate_score` for the matching criteria.
+    
+    Args:
+        title (str): Post title
+        posted_scores (dict): Dictionary mapping titles to timestamps and URLs
+        timestamp (datetime): Current timestamp (used for logging)
+        url (str, optional): URL of the post (used for logging)
+        
+    Returns:
+        bool: True if duplicate, False otherwise
+    """
+    return find_duplicate_score(title, posted_scores, timestamp, url) is not None
 
 def cleanup_old_scores(posted_scores: Dict[str, Dict[str, str]]) -> None:
     """Remove scores older than 5 minutes from the posted_scores dictionary.
@@ -338,7 +365,7 @@ def cleanup_old_scores(posted_scores: Dict[str, Dict[str, str]]) -> None:
     """
     try:
         app_logger.debug(f"Starting cleanup of old scores: {posted_scores}")
-        current_time = datetime.now(timezone.utc)
+        current_time = clock.now()
         # Create a list of items to remove
         to_remove = []
         
@@ -0,0 +1,320 @@
+"""Lightweight per-submission tracing.
+
+Every submission gets its own trace: a root span for `process_submission`
+with child spans for each stage (team matching, filters, dedup, the Discord
+post, every extraction attempt and the MP4 follow-up) and for every outbound
+HTTP request. The current span is kept in a context variable, so it follows
+awaits, tasks and `asyncio.to_thread`. Extraction jobs store the trace
+context of the submission that created them, so attempts made later by the
+scheduler's workers land in the same trace.
+
+Spans are written as OTLP/JSON (one `resourceSpans` export request per line)
+to TRACE_FILE, which OpenTelemetry collectors' file receivers, Jaeger and
+otel-desktop-viewer can read. Tracing is off when TRACE_FILE is not set, and
+child spans are only recorded inside a trace, so the instrumented functions
+cost one attribute check when called from anywhere else.
+
+Print the stages of the traced goals, slowest first:
+
+    python -m src.utils.tracing data/traces.jsonl --title "Saka"
+"""
+
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from src.config import TRACE_FILE
+from src.utils.logger import app_logger
+from src.utils import clock
+
+# (trace id, span id) of a span, as stored on extraction jobs
+SpanContext = Tuple[str, str]
+
+# OTLP span kinds
+INTERNAL = 1
+CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_id', 'name', 'kind', 'start', 'end', 'attributes',
+                 'links', 'status', 'message', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, trace_id: str, parent_id: Optional[str], kind: int,
+                 attributes: Dict[str, Any], links: List[SpanContext]):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = clock.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.links = links
+        self.status = STATUS_OK
+        self.message = ''
+        self._token = None
+
+    @property
+    def context(self) -> SpanContext:
+        return self.trace_id, self.span_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> 'Span':
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end = clock.time()
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.status = STATUS_ERROR
+            self.message = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.tracer._finish(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON form."""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(int(self.start * 1e9)),
+            'endTimeUnixNano': str(int(self.end * 1e9)),
+            'attributes': [{'key': key, 'value': _otlp_value(value)}
+                           for key, value in self.attributes.items() if value is not None],
+            'status': {'code': self.status, **({'message': self.message} if self.message else {})}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.links:
+            span['links'] = [{'traceId': trace_id, 'spanId': span_id} for trace_id, span_id in self.links]
+        return span
+
+class _NullSpan:
+    """Stand-in returned when nothing is being traced."""
+
+    context = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """Creates spans and exports finished ones to an OTLP/JSON file."""
+
+    def __init__(self, filename: Optional[str] = TRACE_FILE, service_name: str = 'goal-bot', batch_size: int = 64,
+                 flush_seconds: float = 5.0):
+        """Initialize the tracer.
+
+        Args:
+            filename (str, optional): File the spans are appended to; tracing is off if None
+            service_name (str): service.name resource attribute
+            batch_size (int): Finished spans buffered before they are written
+            flush_seconds (float): Longest time a finished span stays buffered
+        """
+        self.filename = filename
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.stats = {'spans': 0, 'traces': 0, 'exported': 0, 'errors': 0}
+        self._buffer: List[Span] = []
+        self._buffered_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.filename is not None
+
+    def span(self, name: str, root: bool = False, parent: Optional[SpanContext] = None, kind: int = INTERNAL,
+             **attributes: Any):
+        """Start a span; use it as a context manager.
+
+        Args:
+            name (str): Span name
+            root (bool): Start a new trace; it is linked to the current span, if any
+            parent (SpanContext, optional): Explicit parent, e.g. stored on a job
+            kind (int): INTERNAL or CLIENT
+            **attributes: Span attributes
+
+        Returns:
+            Span: The span, or a no-op stand-in when tracing is off or, for a
+                child span, when there is no trace to attach it to
+        """
+        if self.filename is None:
+            return NULL_SPAN
+        current = _current_span.get()
+        if root:
+            self.stats['traces'] += 1
+            links = [current.context] if current is not None else []
+            return Span(self, name, f"{random.getrandbits(128):032x}", None, kind, attributes, links)
+        if parent is None:
+            if current is None:
+                return NULL_SPAN
+            parent = current.context
+        return Span(self, name, parent[0], parent[1], kind, attributes, [])
+
+    def traced(self, name: Optional[str] = None, root: bool = False, kind: int = INTERNAL,
+               attributes: Optional[Callable[..., Dict[str, Any]]] = None, result: Optional[str] = None) -> Callable:
+        """Decorator running a function, sync or async, inside a span.
+
+        Args:
+            name (str, optional): Span name (default: the function's name)
+            root (bool): Start a new trace for every call
+            kind (int): INTERNAL or CLIENT
+            attributes (callable, optional): Gets the call's arguments, returns span attributes
+            result (str, optional): Attribute recording whether the call returned a truthy value
+        """
+        def decorator(fn: Callable) -> Callable:
+            span_name = name or fn.__name__
+
+            def start(args, kwargs):
+                extra = attributes(*args, **kwargs) if attributes is not None else {}
+                return self.span(span_name, root=root, kind=kind, **extra)
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if self.filename is None:
+                        return await fn(*args, **kwargs)
+                    with start(args, kwargs) as span:
+                        value = await fn(*args, **kwargs)
+                        if result:
+                            span.set_attribute(result, bool(value))
+                        return value
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.filename is None:
+                    return fn(*args, **kwargs)
+                with start(args, kwargs) as span:
+                    value = fn(*args, **kwargs)
+                    if result:
+                        span.set_attribute(result, bool(value))
+                    return value
+            return wrapper
+        return decorator
+
+    def context(self) -> Optional[SpanContext]:
+        """Context of the current span, to continue the trace elsewhere."""
+        current = _current_span.get()
+        return current.context if current is not None else None
+
+    def annotate(self, **attributes: Any) -> None:
+        """Set attributes on the current span, if any."""
+        current = _current_span.get()
+        if current is not None:
+            current.attributes.update(attributes)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.stats['spans'] += 1
+            self._buffer.append(span)
+            if self._buffered_since is None:
+                self._buffered_since = span.end
+            due = (span.parent_id is None or len(self._buffer) >= self.batch_size
+                   or span.end - self._buffered_since >= self.flush_seconds)
+        if due:
+            self.flush()
+
+    def export_request(self, spans: Iterable[Span]) -> Dict[str, Any]:
+        """OTLP/JSON ExportTraceServiceRequest for some spans."""
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': [span.to_otlp() for span in spans]}]
+        }]}
+
+    def flush(self) -> None:
+        """Write the buffered spans to the trace file."""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+            self._buffered_since = None
+            if not spans or self.filename is None:
+                return
+            try:
+                with open(self.filename, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(self.export_request(spans), separators=(',', ':')) + '\n')
+                self.stats['exported'] += len(spans)
+            except OSError as e:
+                self.stats['errors'] += 1
+                app_logger.error(f"Error writing traces to {self.filename}: {str(e)}")
+
+def load_traces(filename: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read an OTLP/JSON trace file into spans grouped by trace id."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource in json.loads(line).get('resourceSpans', []):
+                for scope in resource.get('scopeSpans', []):
+                    for span in scope.get('spans', []):
+                        traces.setdefault(span['traceId'], []).append(span)
+    return traces
+
+def span_attributes(span: Dict[str, Any]) -> Dict[str, Any]:
+    """Attributes of an OTLP/JSON span as a plain dictionary."""
+    return {item['key']: next(iter(item['value'].values())) for item in span.get('attributes', [])}
+
+def span_ms(span: Dict[str, Any]) -> float:
+    return (int(span['endTimeUnixNano']) - int(span['startTimeUnixNano'])) / 1e6
+
+def print_traces(filename: str, title: Optional[str] = None, limit: int = 10) -> None:
+    """Print the stages of the traced submissions, slowest stage first."""
+    shown = 0
+    for spans in load_traces(filename).values():
+        root = next((span for span in spans if 'parentSpanId' not in span and span['name'] == 'process_submission'), None)
+        if root is None:
+            continue
+        attributes = span_attributes(root)
+        if title and title.lower() not in str(attributes.get('submission.title', '')).lower():
+            continue
+        print(f"{attributes.get('submission.title')} ({span_ms(root):,.1f} ms, trace {root['traceId']})")
+        for span in sorted(spans, key=span_ms, reverse=True):
+            if span is not root:
+                print(f"  {span_ms(span):>10,.1f} ms  {span['name']}")
+        shown += 1
+        if shown >= limit:
+            break
+
+# Create a global instance
+tracer = Tracer()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show the stages of traced submissions, slowest first')
+    parser.add_argument('filename', help='OTLP/JSON trace file written with TRACE_FILE')
+    parser.add_argument('--title', help='Only goals whose title contains this text')
+    parser.add_argument('--limit', type=int, default=10, help='Number of goals to show')
+    args = parser.parse_args()
+    print_traces(args.filename, args.title, args.limit)
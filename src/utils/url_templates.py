@@ -0,0 +1,171 @@
+"""Learned per-host templates mapping clip page URLs to direct MP4 URLs.
+
+When a page parse finds the MP4 for e.g. https://streamin.one/v/abc123 at
+https://streamin.me/uploads/abc123.mp4, we store the template
+'/v/{id}' -> 'https://streamin.me/uploads/{id}.mp4' for the 'streamin' host.
+Later clips on that host can then be tried directly without fetching the page.
+A template whose prediction differs from the MP4 URL the page parse finds
+URL_TEMPLATE_MAX_MISSES times in a row is dropped, so a host that moves its
+uploads to URLs that can't be learned stops costing a wasted probe per clip.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urlparse
+from src.config import URL_TEMPLATES_FILE, URL_TEMPLATE_MAX_MISSES
+from src.config.filters import base_domains
+from src.utils.logger import app_logger
+from src.utils.persistence import save_data, load_data
+
+ID_PLACEHOLDER = '{id}'
+
+def get_host_key(url: str) -> str:
+    """Get the TLD-independent host key for a URL (e.g. 'streamin' for streamin.one).
+
+    Args:
+        url (str): URL to get the host key for
+
+    Returns:
+        str: Matching base domain, or the full host if none match
+    """
+    domain = urlparse(url).netloc.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    for base in sorted(base_domains, key=len, reverse=True):
+        if base in domain:
+            return base
+    return domain
+
+def split_source_url(url: str) -> Optional[Tuple[str, str]]:
+    """Split a clip page URL into its path pattern and video ID.
+
+    Args:
+        url (str): Clip page URL (e.g. https://streamin.one/v/abc123)
+
+    Returns:
+        tuple: (path pattern, video ID), e.g. ('/v/{id}', 'abc123'), or None if no ID
+    """
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    if not segments:
+        return None
+    video_id = segments[-1]
+    pattern = '/' + '/'.join(segments[:-1] + [ID_PLACEHOLDER])
+    return pattern, video_id
+
+class UrlTemplateStore:
+    """Persistent store of learned source-path -> MP4 URL templates per host."""
+
+    def __init__(self, filename: Optional[str] = URL_TEMPLATES_FILE, max_misses: int = URL_TEMPLATE_MAX_MISSES):
+        """Initialize the store, loading previously learned templates.
+
+        Args:
+            filename (str, optional): Pickle file to persist to, or None to keep in memory
+            max_misses (int): Consecutive misses after which a template is dropped
+        """
+        self.filename = filename
+        self.max_misses = max_misses
+        # host -> {source pattern -> {'template', 'hits', 'misses', 'consecutive_misses'}}
+        self.templates: Dict[str, Dict[str, Dict[str, Any]]] = load_data(filename, dict()) if filename else {}
+        self.stats = {'hits': 0, 'misses': 0, 'learned': 0, 'evicted': 0}
+        # Extractors run in worker threads
+        self._lock = threading.Lock()
+
+    def _save(self) -> None:
+        if self.filename:
+            save_data(self.templates, self.filename)
+
+    def learn(self, source_url: str, mp4_url: str) -> bool:
+        """Learn a template from a successful page parse.
+
+        Args:
+            source_url (str): Clip page URL that was parsed
+            mp4_url (str): MP4 URL found on the page
+
+        Returns:
+            bool: True if a template was stored
+        """
+        split = split_source_url(source_url)
+        if not split:
+            return False
+        pattern, video_id = split
+
+        parsed = urlparse(mp4_url)
+        # Signed or tokenised URLs can't be rebuilt from the video ID alone
+        if parsed.query or video_id not in parsed.path:
+            return False
+
+        template = f"{parsed.scheme}://{parsed.netloc}{parsed.path.replace(video_id, ID_PLACEHOLDER)}"
+        with self._lock:
+            host_templates = self.templates.setdefault(get_host_key(source_url), {})
+            entry = host_templates.get(pattern)
+            if entry and entry['template'] == template:
+                return True
+
+            host_templates[pattern] = {'template': template, 'hits': 0, 'misses': 0, 'consecutive_misses': 0}
+            self.stats['learned'] += 1
+            self._save()
+        app_logger.info(f"Learned URL template for {get_host_key(source_url)}: {pattern} -> {template}")
+        return True
+
+    def candidate(self, source_url: str) -> Optional[str]:
+        """Build the MP4 URL predicted by a learned template.
+
+        Args:
+            source_url (str): Clip page URL
+
+        Returns:
+            str: Predicted MP4 URL, or None if no template is known
+        """
+        split = split_source_url(source_url)
+        if not split:
+            return None
+        pattern, video_id = split
+        entry = self.templates.get(get_host_key(source_url), {}).get(pattern)
+        if not entry:
+            return None
+        return entry['template'].replace(ID_PLACEHOLDER, video_id)
+
+    def record(self, source_url: str, hit: bool) -> None:
+        """Record whether the template for a source URL predicted the right MP4.
+
+        A template that misses `max_misses` times in a row is dropped. The store
+        is only saved when the run of misses changes, not on every hit.
+
+        Args:
+            source_url (str): Clip page URL
+            hit (bool): True if the predicted URL validated, False if the page had a different one
+        """
+        split = split_source_url(source_url)
+        host = get_host_key(source_url)
+        key = 'hits' if hit else 'misses'
+        with self._lock:
+            self.stats[key] += 1
+            host_templates = self.templates.get(host, {})
+            entry = host_templates.get(split[0]) if split else None
+            if not entry:
+                return
+            entry[key] += 1
+            consecutive_misses = entry.get('consecutive_misses', 0)
+            entry['consecutive_misses'] = 0 if hit else consecutive_misses + 1
+            evicted = entry['consecutive_misses'] >= self.max_misses
+            if evicted:
+                del host_templates[split[0]]
+                if not host_templates:
+                    del self.templates[host]
+                self.stats['evicted'] += 1
+            if entry['consecutive_misses'] != consecutive_misses:
+                self._save()
+        if evicted:
+            app_logger.info(f"Dropped URL template for {host} after {self.max_misses} misses in a row: {split[0]}")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the learned templates as a flat list."""
+        with self._lock:
+            return [
+                {'host': host, 'pattern': pattern, **entry}
+                for host, patterns in self.templates.items()
+                for pattern, entry in patterns.items()
+            ]
+
+# Create a global instance
+url_templates = UrlTemplateStore()
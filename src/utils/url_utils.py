@@ -102,3 +102,32 @@ def get_base_domain(url: str) -> str:
         
     except Exception as e:
         return url  # Return original URL if parsing fails
+
+def canonical_source_url(url: str) -> str:
+    """Get a canonical form of a clip URL, so the same clip maps to the same key.
+    
+    Drops the scheme, 'www.', query string, fragment and trailing slash, and
+    replaces a supported host with its base domain so TLD variants
+    (e.g. streamin.one and streamin.me) of the same clip match.
+    
+    Args:
+        url (str): Clip URL
+        
+    Returns:
+        str: Canonical key (e.g. 'streamin/v/abc123')
+    """
+    try:
+        parsed = urlparse(url.strip())
+        domain = parsed.netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        if ':' in domain:
+            domain = domain.split(':')[0]
+            
+        matches = [base for base in base_domains if base in domain]
+        if matches:
+            domain = min(matches, key=len)
+            
+        return f"{domain}{parsed.path.rstrip('/')}"
+    except Exception:
+        return url
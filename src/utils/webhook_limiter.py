@@ -0,0 +1,99 @@
+"""Discord webhook rate-limit bucket.
+
+Discord reports each webhook's bucket through the X-RateLimit-* headers and
+answers 429 with a retry_after once it is empty. Messages are sent one at a
+time in the order they were queued, waiting for the bucket to reset when the
+last response said it was empty, so a burst of goals is delivered in order
+instead of being dropped on the first 429.
+"""
+
+import asyncio
+from typing import Any, Dict, Mapping, Optional
+from src.config import DISCORD_MAX_RETRIES
+from src.utils.logger import webhook_logger
+from src.utils import clock
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class WebhookLimiter:
+    """Serializes webhook sends and tracks the bucket Discord reports."""
+
+    def __init__(self, max_retries: int = DISCORD_MAX_RETRIES):
+        """Initialize the limiter.
+
+        Args:
+            max_retries (int): Retries of a message after 429 responses
+        """
+        self.max_retries = max_retries
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {'sent': 0, 'rate_limited': 0, 'retried': 0, 'dropped': 0, 'waited_seconds': 0.0}
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def lock(self) -> asyncio.Lock:
+        """Get the send lock of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the bucket reported in a response's X-RateLimit-* headers."""
+        remaining = _float(headers.get('X-RateLimit-Remaining'))
+        reset_after = _float(headers.get('X-RateLimit-Reset-After'))
+        if remaining is None:
+            return
+        self.remaining = int(remaining)
+        self.reset_at = clock.monotonic() + reset_after if reset_after is not None else None
+
+    def retry_after(self, headers: Mapping[str, str], body: Optional[Dict] = None) -> float:
+        """Seconds to wait after a 429, preferring the precise JSON value over the header."""
+        retry_after = _float((body or {}).get('retry_after'))
+        if retry_after is None:
+            retry_after = _float(headers.get('Retry-After'))
+        return max(0.0, retry_after if retry_after is not None else 1.0)
+
+    def delay(self) -> float:
+        """Seconds to wait before the next request may be sent."""
+        if self.remaining is None or self.remaining > 0 or self.reset_at is None:
+            return 0.0
+        return max(0.0, self.reset_at - clock.monotonic())
+
+    async def wait(self, seconds: Optional[float] = None) -> None:
+        """Wait for the bucket to reset (or for `seconds`)."""
+        seconds = self.delay() if seconds is None else seconds
+        if seconds > 0:
+            self.stats['waited_seconds'] += seconds
+            await clock.sleep(seconds)
+            # The bucket has reset; the next response reports the new one
+            self.remaining = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current bucket and counters for monitoring."""
+        return {
+            'remaining': self.remaining,
+            'reset_in': round(self.delay(), 3),
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            **self.stats
+        }
+
+    def log_rate_limited(self, retry_after: float, attempt: int) -> None:
+        self.stats['rate_limited'] += 1
+        if attempt < self.max_retries:
+            self.stats['retried'] += 1
+            webhook_logger.warning(f"Rate limited by Discord. Retrying after {retry_after:.2f} seconds")
+        else:
+            self.stats['dropped'] += 1
+            webhook_logger.warning(f"Rate limited by Discord. Giving up after {attempt} retries")
+
+# Create a global instance
+webhook_limiter = WebhookLimiter()
@@ -0,0 +1,75 @@
+"""Tests for the injectable clock and virtual-time runs."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from src.utils import clock
+from src.utils.clock import VirtualClock, run_virtual
+from src.utils.score_utils import cleanup_old_scores
+from simulation.matchday import run_matchday
+
+START = datetime(2024, 12, 28, 15, 0, tzinfo=timezone.utc).timestamp()
+
+def test_system_clock_by_default():
+    """Test that the default clock reads the system time."""
+    assert abs(clock.time() - time.time()) < 1
+    assert clock.now().tzinfo is not None
+
+def test_virtual_sleep_takes_no_real_time():
+    """Test that sleeps and timeouts advance virtual time instantly."""
+    async def scenario():
+        await clock.sleep(3600)
+        try:
+            await asyncio.wait_for(asyncio.Event().wait(), timeout=300)
+        except asyncio.TimeoutError:
+            pass
+        return clock.time(), clock.monotonic()
+
+    started = time.perf_counter()
+    now, elapsed = run_virtual(scenario(), start=START)
+
+    assert time.perf_counter() - started < 1
+    assert now == START + 3900
+    assert elapsed == 3900
+    assert abs(clock.time() - time.time()) < 1  # The system clock is back afterwards
+
+def test_virtual_concurrent_sleepers_wake_in_order():
+    """Test that concurrent sleepers wake at their virtual deadlines."""
+    woke = []
+
+    async def sleeper(seconds):
+        await clock.sleep(seconds)
+        woke.append((seconds, clock.monotonic()))
+
+    async def scenario():
+        await asyncio.gather(*(sleeper(seconds) for seconds in (30, 0.001, 10, 10.0000001)))
+
+    run_virtual(scenario(), start=START)
+    assert woke == [(0.001, 0.001), (10, 10), (10.0000001, 10.0000001), (30, 30)]
+
+def test_score_cleanup_window_in_virtual_time():
+    """Test the 5-minute score retention without waiting 5 minutes."""
+    async def scenario():
+        posted_scores = {"Arsenal [1] - 0 Chelsea - Saka 12'": {'timestamp': clock.now().isoformat(), 'url': 'https://streamff.live/v/a'}}
+        await clock.sleep(240)
+        cleanup_old_scores(posted_scores)
+        kept = len(posted_scores)
+        await clock.sleep(120)
+        cleanup_old_scores(posted_scores)
+        return kept, len(posted_scores)
+
+    assert run_virtual(scenario(), clock=VirtualClock(START)) == (1, 0)
+
+def test_matchday_simulation_is_fast_and_deterministic():
+    """Test that a simulated matchday posts every goal once and repeats exactly."""
+    first = run_matchday(matches=4, seed=3)
+    second = run_matchday(matches=4, seed=3)
+
+    assert first['goals'] > 0
+    assert first['goals_posted'] == first['goals']
+    assert first['goals_missed'] == []
+    assert first['goals_double_posted'] == []
+    assert first['pending_extractions'] == 0
+    assert first['wall_seconds'] < first['virtual_seconds'] / 100
+    assert {key: value for key, value in first.items() if key != 'wall_seconds'} == \
+           {key: value for key, value in second.items() if key != 'wall_seconds'}
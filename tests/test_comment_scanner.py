@@ -0,0 +1,118 @@
+"""Tests for scanning goal post comments for alternate clip mirrors."""
+
+import asyncio
+import time
+import pytest
+from src.services.comment_scanner import CommentScanner, collect_mirror_urls, extract_mirror_urls
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.utils.retry_schedule import AvailabilityTracker
+
+class MockComment:
+    """Mock Reddit comment."""
+    def __init__(self, body: str, author: str = "someone", stickied: bool = False, replies=None):
+        self.body = body
+        self.author = author
+        self.stickied = stickied
+        self.replies = replies or []
+
+class MockSubmission:
+    """Mock Reddit submission for testing."""
+    def __init__(self, submission_id: str, url: str):
+        self.id = submission_id
+        self.url = url
+        self.media = None
+        self.created_utc = time.time()
+
+class FakeCommentSubmission:
+    """Lazy submission whose load() serves canned comments."""
+    def __init__(self, reddit, submission_id: str):
+        self.reddit = reddit
+        self.id = submission_id
+        self.comment_limit = 2048
+        self.comments = []
+
+    async def load(self):
+        self.reddit.requests.append((self.id, self.comment_limit))
+        await asyncio.sleep(self.reddit.delay)
+        self.comments = self.reddit.comments.get(self.id, [])
+
+class FakeReddit:
+    """Fake asyncpraw client serving comments from a dictionary."""
+    def __init__(self, comments, delay: float = 0):
+        self.comments = comments
+        self.delay = delay
+        self.requests = []
+
+    async def submission(self, id, fetch=True):
+        return FakeCommentSubmission(self, id)
+
+AUTOMOD_THREAD = MockComment(
+    "**Mirrors / Alternate angles**\n\nPlease reply to this comment with mirrors.",
+    author="AutoModerator",
+    stickied=True,
+    replies=[
+        MockComment("Mirror: https://dubz.link/v/m1rr0r."),
+        MockComment("[alt angle](https://streamin.one/v/abc123) and https://example.com/not-a-host"),
+    ]
+)
+
+def test_extract_mirror_urls():
+    """Test that only supported links are kept and markdown is stripped."""
+    text = "Here [mirror](https://streamff.live/v/xyz) or https://www.youtube.com/watch?v=1, also https://dubz.co/v/abc."
+    assert extract_mirror_urls(text) == ["https://streamff.live/v/xyz", "https://dubz.co/v/abc"]
+    assert extract_mirror_urls(None) == []
+
+def test_collect_only_scans_replies_of_mirror_threads():
+    """Test that replies are read under AutoModerator's comment but not elsewhere."""
+    comments = [
+        AUTOMOD_THREAD,
+        MockComment("What a goal", replies=[MockComment("https://streamff.live/v/ignored")]),
+        MockComment("https://streamin.me/v/abc123/"),  # Same clip as the reply above
+    ]
+    assert collect_mirror_urls(comments) == ["https://dubz.link/v/m1rr0r", "https://streamin.one/v/abc123"]
+
+@pytest.mark.asyncio
+async def test_scan_attaches_mirrors_and_first_valid_mp4_wins():
+    """Test that a dead primary host is bypassed by a mirror from the comments."""
+    async def probe(source):
+        if "dubz" in source.url:
+            return "https://cdn.dubz.link/m1rr0r.mp4"
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=2, tracker=AvailabilityTracker(filename=None))
+    scanner = CommentScanner(scheduler=scheduler)
+    reddit = FakeReddit({"abc": [AUTOMOD_THREAD]})
+    try:
+        future = scheduler.submit(MockSubmission("abc", "https://streamff.live/v/dead"), max_retries=100, delay=0.02)
+        assert await scanner.scan_once(reddit) == 2
+        result = await asyncio.wait_for(future, 1)
+    finally:
+        await scheduler.stop()
+
+    assert result == "https://cdn.dubz.link/m1rr0r.mp4"
+    assert reddit.requests == [("abc", scanner.comment_limit)]
+    assert scheduler.stats["sources"] == 2
+    assert "dubz" not in scheduler.tracker.histograms  # A comment mirror has no post time to measure from
+    assert scheduler.snapshot()["in_flight_keys"] == 0
+
+@pytest.mark.asyncio
+async def test_scan_respects_request_and_time_budget():
+    """Test per-scan, per-post and per-request limits."""
+    async def probe(source):
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    scanner = CommentScanner(scheduler=scheduler, timeout=0.01, max_requests=2, max_per_post=1)
+    reddit = FakeReddit({}, delay=1)
+    try:
+        for i in range(3):
+            scheduler.submit(MockSubmission(f"s{i}", f"https://streamff.live/v/{i}"), max_retries=100, delay=10)
+        await scanner.scan_once(reddit)
+        await scanner.scan_once(reddit)
+        await scanner.scan_once(reddit)
+    finally:
+        await scheduler.stop()
+
+    assert len(reddit.requests) == 3
+    assert sorted(submission_id for submission_id, _ in reddit.requests) == ["s0", "s1", "s2"]
+    assert scanner.stats["timeouts"] == 3
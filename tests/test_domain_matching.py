@@ -1,7 +1,7 @@
 """Test domain matching with different TLDs."""
 
 import pytest
-from src.utils.url_utils import extract_base_domain, is_valid_domain
+from src.utils.url_utils import extract_base_domain, is_valid_domain, canonical_source_url
 
 # Test URLs with different TLDs and formats
 test_urls = [
@@ -39,3 +39,18 @@ def test_domain_matching(url, is_valid, expected_domain):
     else:
         with pytest.raises(ValueError):
             extract_base_domain(url)
+
+@pytest.mark.parametrize("url_a,url_b", [
+    ('https://streamin.one/v/abc123', 'https://streamin.me/v/abc123'),
+    ('https://streamff.live/v/abc123', 'http://www.streamff.com/v/abc123/'),
+    ('https://streamable.com/xyz?src=player#t=1', 'https://streamable.com/xyz'),
+])
+def test_canonical_source_url_matches_variants(url_a, url_b):
+    """Test that TLD and formatting variants of a clip URL share a canonical key."""
+    assert canonical_source_url(url_a) == canonical_source_url(url_b)
+
+def test_canonical_source_url_keeps_distinct_clips():
+    """Test that different clips and hosts keep different keys."""
+    assert canonical_source_url('https://streamin.one/v/abc') != canonical_source_url('https://streamin.one/v/ABC')
+    assert canonical_source_url('https://streamin.one/v/abc') != canonical_source_url('https://dubz.link/v/abc')
+    assert canonical_source_url('https://streamin.one/v/abc') == 'streamin/v/abc'
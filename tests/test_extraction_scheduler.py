@@ -0,0 +1,216 @@
+"""Tests for the central MP4 extraction scheduler."""
+
+import asyncio
+import time
+import pytest
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.utils.retry_schedule import AvailabilityTracker
+from src.utils.url_utils import canonical_source_url
+
+class MockSubmission:
+    """Mock Reddit submission for testing."""
+    def __init__(self, url: str):
+        self.url = url
+        self.media = None
+        self.created_utc = time.time()
+
+def make_scheduler(probe, workers: int = 2) -> ExtractionScheduler:
+    """Create a scheduler with an in-memory availability tracker."""
+    return ExtractionScheduler(probe=probe, workers=workers, tracker=AvailabilityTracker(filename=None))
+
+@pytest.mark.asyncio
+async def test_job_resolves_after_retries():
+    """Test that a job keeps probing until the MP4 appears."""
+    attempts = []
+
+    async def probe(job):
+        attempts.append(job.attempt)
+        return "https://cdn.example/clip.mp4" if job.attempt == 3 else None
+
+    scheduler = make_scheduler(probe)
+    try:
+        result = await scheduler.submit(MockSubmission("https://streamff.live/v/abc"), max_retries=10, delay=0.01)
+    finally:
+        await scheduler.stop()
+
+    assert result == "https://cdn.example/clip.mp4"
+    assert attempts == [1, 2, 3]
+    assert scheduler.stats["succeeded"] == 1
+    assert scheduler.tracker.histograms["streamff"].total == 1
+
+@pytest.mark.asyncio
+async def test_job_gives_up_at_deadline():
+    """Test that a job resolves to None once its deadline passes."""
+    async def probe(job):
+        return None
+
+    scheduler = make_scheduler(probe)
+    try:
+        result = await scheduler.submit(MockSubmission("https://dubz.link/v/abc"), max_retries=3, delay=0.02)
+    finally:
+        await scheduler.stop()
+
+    assert result is None
+    assert scheduler.stats["failed"] == 1
+    assert 2 <= scheduler.stats["probes"] <= 4
+
+@pytest.mark.asyncio
+async def test_probe_exceptions_are_retried():
+    """Test that a failing probe doesn't kill the job or the worker."""
+    async def probe(job):
+        if job.attempt == 1:
+            raise RuntimeError("mirror exploded")
+        return "https://cdn.example/ok.mp4"
+
+    scheduler = make_scheduler(probe, workers=1)
+    try:
+        result = await scheduler.submit(MockSubmission("https://streamin.one/v/abc"), max_retries=5, delay=0.01)
+    finally:
+        await scheduler.stop()
+    assert result == "https://cdn.example/ok.mp4"
+
+@pytest.mark.asyncio
+async def test_workers_bound_concurrency():
+    """Test that no more than `workers` probes run at once."""
+    running = 0
+    peak = 0
+
+    async def probe(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"https://cdn.example/{job.job_id}.mp4"
+
+    scheduler = make_scheduler(probe, workers=3)
+    try:
+        futures = [scheduler.submit(MockSubmission(f"https://dubz.link/v/{i}")) for i in range(20)]
+        assert scheduler.snapshot()["pending"] == 20
+        results = await asyncio.gather(*futures)
+    finally:
+        await scheduler.stop()
+
+    assert len(set(results)) == 20
+    assert peak == 3
+    assert scheduler.snapshot()["pending"] == 0
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_same_clip_are_coalesced():
+    """Test that callers for the same clip share a single job."""
+    probed = []
+
+    async def probe(job):
+        probed.append(job.url)
+        await asyncio.sleep(0.01)
+        return "https://cdn.example/clip.mp4" if job.attempt == 2 else None
+
+    scheduler = make_scheduler(probe)
+    try:
+        first = scheduler.submit(MockSubmission("https://streamin.one/v/abc123"), delay=0.01)
+        second = scheduler.submit(MockSubmission("https://streamin.me/v/abc123/"), delay=0.01)
+        other = scheduler.submit(MockSubmission("https://streamin.one/v/other"), delay=0.01)
+        assert first is second
+        assert other is not first
+        results = await asyncio.gather(first, second, other)
+    finally:
+        await scheduler.stop()
+
+    assert results[0] == results[1] == "https://cdn.example/clip.mp4"
+    assert probed.count("https://streamin.one/v/abc123") == 2
+    assert "https://streamin.me/v/abc123/" not in probed
+    assert scheduler.stats["coalesced"] == 1
+    assert scheduler.stats["submitted"] == 2
+
+@pytest.mark.asyncio
+async def test_finished_clip_can_be_requested_again():
+    """Test that coalescing only applies while a job is in flight."""
+    async def probe(job):
+        return "https://cdn.example/clip.mp4"
+
+    scheduler = make_scheduler(probe)
+    try:
+        submission = MockSubmission("https://dubz.link/v/abc")
+        await scheduler.submit(submission)
+        await scheduler.submit(submission)
+    finally:
+        await scheduler.stop()
+
+    assert scheduler.stats["coalesced"] == 0
+    assert scheduler.stats["probes"] == 2
+
+@pytest.mark.asyncio
+async def test_metadata_mp4_resolves_without_a_job():
+    """Test that MP4s already in the listing metadata never reach a mirror."""
+    async def probe(job):
+        pytest.fail("probe should not run")
+
+    scheduler = make_scheduler(probe)
+    submission = MockSubmission("https://v.redd.it/abc")
+    submission.media = {'reddit_video': {'fallback_url': 'https://v.redd.it/abc/DASH_720.mp4'}}
+    try:
+        assert await scheduler.submit(submission) == 'https://v.redd.it/abc/DASH_720.mp4'
+    finally:
+        await scheduler.stop()
+    assert scheduler.stats["submitted"] == 0
+
+@pytest.mark.asyncio
+async def test_stop_with_a_rescheduled_job_returns():
+    """Test that stop() finishes while the dispatcher waits for a job due later."""
+    async def probe(job):
+        return None
+
+    scheduler = make_scheduler(probe)
+    future = scheduler.submit(MockSubmission("https://streamff.live/v/later"), max_retries=100, delay=10)
+    job = next(iter(scheduler._pending.values()))
+    scheduler._schedule(job, time.monotonic() + 5)
+    await asyncio.wait_for(scheduler.stop(), 2)
+
+    assert await future is None
+    assert scheduler.snapshot()['in_flight_keys'] == 0
+
+@pytest.mark.asyncio
+async def test_refresh_during_probe_is_not_counted_twice():
+    """Test that a job resolved by a refresh mid-probe isn't recorded or rescheduled by the probe."""
+    probing, release = asyncio.Event(), asyncio.Event()
+
+    async def probe(job):
+        probing.set()
+        await release.wait()
+        return None
+
+    scheduler = make_scheduler(probe, workers=1)
+    submission = MockSubmission("https://v.redd.it/abc")
+    submission.id = "abc"
+    try:
+        future = scheduler.submit(submission, max_retries=100, delay=0.01)
+        await probing.wait()
+        submission.media = {"reddit_video": {"fallback_url": "https://v.redd.it/abc/DASH_720.mp4"}}
+        assert scheduler.refresh([submission]) == 1
+        release.set()
+        assert await future == "https://v.redd.it/abc/DASH_720.mp4"
+        await asyncio.sleep(0.05)
+    finally:
+        await scheduler.stop()
+
+    assert scheduler.stats["succeeded"] == 1 and scheduler.stats["failed"] == 0
+    assert scheduler.stats["probes"] == 1
+    assert not scheduler.tracker.histograms  # Reddit metadata says nothing about a mirror host
+
+@pytest.mark.asyncio
+async def test_alternate_availability_is_measured_from_its_own_post():
+    """Test that a late-posted alternate's delay isn't measured from the original post."""
+    async def probe(source):
+        return "https://cdn.example/clip.mp4" if "streamin" in source.url else None
+
+    scheduler = make_scheduler(probe)
+    original = MockSubmission("https://streamff.live/v/slow")
+    original.created_utc -= 600
+    try:
+        future = scheduler.submit(original, max_retries=100, delay=0.02)
+        scheduler.add_sources(canonical_source_url(original.url), ["https://streamin.one/v/fast"], created_utc=time.time())
+        assert await asyncio.wait_for(future, 1) == "https://cdn.example/clip.mp4"
+    finally:
+        await scheduler.stop()
+
+    assert scheduler.tracker.histograms["streamin"].counts[0] == 1
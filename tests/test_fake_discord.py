@@ -0,0 +1,82 @@
+"""Delivery tests against the local Discord webhook stand-in."""
+
+import asyncio
+import aiohttp
+import pytest
+import pytest_asyncio
+from src.services import discord_service
+from src.utils.webhook_limiter import WebhookLimiter
+from simulation.fake_discord import FakeDiscordWebhook
+
+@pytest_asyncio.fixture
+async def fake_discord(monkeypatch):
+    """Start the stand-in with a small bucket and point the webhook at it."""
+    server = FakeDiscordWebhook(limit=2, window=0.3)
+    await server.start()
+    monkeypatch.setattr(discord_service, "DISCORD_WEBHOOK_URL", server.webhook_url())
+    monkeypatch.setattr(discord_service, "webhook_limiter", WebhookLimiter(max_retries=3))
+    yield server
+    await server.stop()
+
+@pytest.mark.asyncio
+async def test_webhook_execute_wait_and_patch(fake_discord):
+    """Test ?wait=true returning the message and editing it with PATCH."""
+    url = fake_discord.webhook_url()
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json={'content': 'first'}) as response:
+            assert response.status == 204
+        async with session.post(f"{url}?wait=true", json={'content': 'second'}) as response:
+            assert response.status == 200
+            message = await response.json()
+        async with session.patch(f"{url}/messages/{message['id']}", json={'content': 'edited'}) as response:
+            assert response.status == 429  # Third request in the bucket
+            assert response.headers['X-RateLimit-Remaining'] == '0'
+            assert float(response.headers['X-RateLimit-Reset-After']) > 0
+            assert int(response.headers['Retry-After']) >= 1
+            assert (await response.json())['retry_after'] > 0
+        await asyncio.sleep(0.3)
+        async with session.patch(f"{url}/messages/{message['id']}", json={'content': 'edited'}) as response:
+            assert response.status == 200
+        async with session.patch(f"{url}/messages/123", json={'content': 'edited'}) as response:
+            assert response.status == 404
+
+    assert [m['content'] for m in fake_discord.messages] == ['first', 'edited']
+    assert fake_discord.stats['rate_limited'] == 1
+
+@pytest.mark.asyncio
+async def test_goal_burst_is_delivered_in_order(fake_discord):
+    """Test that a burst larger than the bucket is delivered completely and in order."""
+    titles = [f"Arsenal [{i}] - 0 Chelsea - Saka {i}'" for i in range(1, 7)]
+    results = await asyncio.gather(*(
+        discord_service.post_to_discord(f"{title}\nhttps://streamff.live/v/{i}\nhttps://reddit.com/{i}")
+        for i, title in enumerate(titles)
+    ))
+
+    assert results == [True] * 6
+    assert [m['embeds'][0]['title'] for m in fake_discord.messages] == titles
+    assert fake_discord.stats['rate_limited'] == 0  # The bucket headers were respected
+    assert discord_service.webhook_limiter.snapshot()['waiting'] == 0
+
+@pytest.mark.asyncio
+async def test_rate_limited_message_is_retried(fake_discord):
+    """Test that a 429 caused by another client is retried after retry_after."""
+    async with aiohttp.ClientSession() as session:
+        for _ in range(2):
+            async with session.post(fake_discord.webhook_url(), json={'content': 'other client'}):
+                pass
+
+    assert await discord_service.post_mp4_link("Goal", "https://ffedge.streamff.com/uploads/a.mp4")
+    assert fake_discord.messages[-1]['content'] == "https://ffedge.streamff.com/uploads/a.mp4"
+    assert discord_service.webhook_limiter.stats['retried'] == 1
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(fake_discord, monkeypatch):
+    """Test that a message still rate limited after the retries is reported as failed."""
+    monkeypatch.setattr(discord_service, "webhook_limiter", WebhookLimiter(max_retries=0))
+    async with aiohttp.ClientSession() as session:
+        for _ in range(2):
+            async with session.post(fake_discord.webhook_url(), json={'content': 'other client'}):
+                pass
+
+    assert not await discord_service.post_mp4_link("Goal", "https://ffedge.streamff.com/uploads/a.mp4")
+    assert discord_service.webhook_limiter.stats['dropped'] == 1
@@ -0,0 +1,54 @@
+"""VideoExtractor tests against the local mirror stand-in (no network)."""
+
+import time
+import pytest
+from src.services import video_service
+from src.services.video_service import VideoExtractor
+from src.utils.host_health import HostHealthRegistry
+from src.utils.url_templates import UrlTemplateStore
+from simulation.fake_mirrors import Behaviour, FakeMirrors, mirror_session
+
+@pytest.fixture
+def mirrors():
+    with FakeMirrors() as server:
+        yield server
+
+@pytest.fixture
+def extractor(mirrors, monkeypatch):
+    monkeypatch.setattr(video_service, "url_templates", UrlTemplateStore(filename=None))
+    monkeypatch.setattr(video_service, "host_health", HostHealthRegistry())
+    return VideoExtractor(session=mirror_session(mirrors))
+
+@pytest.mark.parametrize("host,expected", [
+    ("streamff", "https://ffedge.streamff.com/uploads/clip1.mp4"),
+    ("streamin", "https://streamin.fun/uploads/clip1.mp4"),
+    ("dubz", "https://cdn.squeelab.com/guest/videos/clip1.mp4"),
+    ("streamable", "https://cdn-cf-east.streamable.com/video/mp4/clip1.mp4?token=t0k3n"),
+])
+def test_extracts_mp4_from_each_host_layout(mirrors, extractor, host, expected):
+    """Test that every extractor finds the MP4 in its host's layout."""
+    url = mirrors.add_clip(host, "clip1")
+    assert extractor.extract_mp4_url(url) == expected
+
+def test_head_rejected_falls_back_to_range_request(mirrors, extractor):
+    """Test that a CDN rejecting HEAD is checked with a one-byte GET."""
+    url = mirrors.add_clip("streamff", "clip2", Behaviour(head_rejected=True))
+    assert extractor.extract_mp4_url(url) == "https://ffedge.streamff.com/uploads/clip2.mp4"
+    assert mirrors.requests == {"HEAD ffedge.streamff.com": 1, "GET ffedge.streamff.com": 1}
+
+@pytest.mark.parametrize("placeholder", [False, True])
+def test_not_found_until_available(mirrors, extractor, placeholder):
+    """Test that 404s and HTML placeholders aren't taken for the MP4."""
+    url = mirrors.add_clip("dubz", "clip3", Behaviour(available_after=0.3, placeholder=placeholder))
+    assert extractor.extract_mp4_url(url) is None
+    time.sleep(0.3)
+    assert extractor.extract_mp4_url(url) == "https://cdn.squeelab.com/guest/videos/clip3.mp4"
+
+def test_streamin_page_behind_redirect_is_parsed_and_learned(mirrors, extractor):
+    """Test the streamin.one -> streamin.me page redirect when the CDN guesses miss."""
+    url = mirrors.add_clip("streamin", "clip4", Behaviour(head_rejected=True))
+    # Make the range probe on the guessed CDN URLs miss as well, until the page has been parsed
+    extractor.probe_mp4_url = lambda mp4_url: mirrors.requests["GET streamin.one"] > 0
+    assert extractor.extract_mp4_url(url) == "https://streamin.me/uploads/clip4.mp4"
+    assert mirrors.requests["GET streamin.one"] == 1
+    assert video_service.url_templates.candidate("https://streamin.one/v/next") == "https://streamin.me/uploads/next.mp4"
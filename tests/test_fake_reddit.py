@@ -0,0 +1,86 @@
+"""End-to-end ingestion tests against the local Reddit stand-in."""
+
+import pytest
+import pytest_asyncio
+from src import main
+from src.services import reddit_service
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.listing_poller import ListingPoller
+from src.services.posted_state import PostedState
+from src.services.submission_refresher import fetch_submissions
+from src.utils.retry_schedule import AvailabilityTracker
+from simulation.fake_reddit import FakeRedditServer, synthetic_submissions
+
+GOAL = {
+    'id': 'goal1',
+    'title': "Arsenal [1] - 0 Chelsea - Bukayo Saka 12'",
+    'url': 'https://streamff.live/v/goal1',
+    'permalink': '/r/soccer/comments/goal1/x/',
+    'subreddit': 'soccer',
+    'author': 'fake_user'
+}
+
+@pytest_asyncio.fixture
+async def fake_reddit(monkeypatch):
+    """Start the stand-in and point create_reddit_client at it."""
+    server = FakeRedditServer(synthetic_submissions(120, goal_ratio=0), rate=None)
+    base_url = await server.start()
+    monkeypatch.setattr(reddit_service, "REDDIT_OAUTH_URL", base_url)
+    monkeypatch.setattr(reddit_service, "REDDIT_URL", base_url)
+    monkeypatch.setattr(reddit_service, "CLIENT_ID", "fake-id")
+    monkeypatch.setattr(reddit_service, "CLIENT_SECRET", "fake-secret")
+    monkeypatch.setattr(reddit_service, "USER_AGENT", "goal-bot-tests")
+    monkeypatch.setattr(reddit_service, "REDDIT_JSON_INGESTION", False)
+    yield server
+    await server.stop()
+
+@pytest.mark.asyncio
+async def test_asyncpraw_reads_listing_info_and_comments(fake_reddit):
+    """Test that asyncpraw works against the stand-in."""
+    fake_reddit.publish(GOAL, comments=[{'body': 'Mirror https://dubz.link/v/m', 'author': 'AutoModerator', 'stickied': True}])
+    reddit = await reddit_service.create_reddit_client()
+    try:
+        submissions = [s async for s in reddit_service.fetch_new_submissions(reddit, limit=110, subreddits=['soccer'])]
+        info = await fetch_submissions(reddit, ['goal1', 's00000003'])
+        submission = await reddit.submission(id='goal1', fetch=False)
+        await submission.load()
+        limits = reddit.auth.limits
+    finally:
+        await reddit.close()
+
+    assert len(submissions) == 110
+    assert submissions[0].id == 'goal1'
+    assert sorted(s.id for s in info) == ['goal1', 's00000003']
+    assert [c.body for c in submission.comments] == ['Mirror https://dubz.link/v/m']
+    assert limits['remaining'] is not None
+    assert fake_reddit.stats['token'] == 1
+
+@pytest.mark.asyncio
+async def test_check_new_posts_end_to_end(fake_reddit, monkeypatch):
+    """Test that a goal posted on the stand-in is processed and sent to Discord."""
+    posted = []
+
+    async def fake_post_to_discord(content, team_data=None):
+        posted.append(content)
+        return True
+
+    async def probe(job):
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    monkeypatch.setattr(main, "post_to_discord", fake_post_to_discord)
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    monkeypatch.setattr(main, "listing_poller", ListingPoller())
+
+    fake_reddit.publish(GOAL)
+    reddit = await reddit_service.create_reddit_client()
+    try:
+        await main.check_new_posts(None, reddit)
+    finally:
+        await reddit.close()
+        await scheduler.stop()
+
+    assert len(posted) == 1
+    assert posted[0].startswith("Arsenal [1] - 0 Chelsea - Bukayo Saka 12'\nhttps://streamff.live/v/goal1")
+    assert 'https://streamff.live/v/goal1' in main.posted_state.urls
@@ -0,0 +1,123 @@
+"""Tests for per-host circuit breaker and AIMD concurrency limiter."""
+
+import threading
+import time
+import pytest
+from src.utils import clock
+from src.utils.host_health import CircuitBreaker, AIMDLimiter, HostHealthRegistry
+
+def test_circuit_opens_after_threshold():
+    """Test that the circuit opens after repeated failures."""
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure(now=0)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow(now=0)
+
+    breaker.record_failure(now=0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow(now=30)
+
+def test_circuit_half_opens_after_cooldown():
+    """Test that an open circuit allows a single trial request after the cooldown."""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure(now=0)
+
+    assert breaker.allow(now=61)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow(now=61), "Only one trial request while half open"
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow(now=62)
+
+def test_failed_trial_reopens_circuit():
+    """Test that a failed trial request reopens the circuit."""
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    for _ in range(3):
+        breaker.record_failure(now=0)
+    assert breaker.allow(now=61)
+
+    breaker.record_failure(now=61)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow(now=100)
+
+def test_aimd_limit_grows_on_fast_success():
+    """Test additive increase on fast successful responses."""
+    limiter = AIMDLimiter(initial=2, maximum=4, latency_target=1.0)
+    for _ in range(20):
+        assert limiter.try_acquire()
+        limiter.release(latency=0.1, ok=True)
+    assert limiter.limit == pytest.approx(4)
+
+def test_aimd_limit_shrinks_on_error_or_slow_response():
+    """Test multiplicative decrease on errors and slow responses."""
+    limiter = AIMDLimiter(initial=8, maximum=8, latency_target=1.0)
+    limiter.try_acquire()
+    limiter.release(latency=5.0, ok=True)
+    assert limiter.limit == 4
+
+    limiter.try_acquire()
+    limiter.release(latency=0.1, ok=False)
+    assert limiter.limit == 2
+
+def test_aimd_rejects_when_saturated():
+    """Test that requests beyond the current limit are rejected."""
+    limiter = AIMDLimiter(initial=2)
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+def test_registry_skips_host_with_open_circuit():
+    """Test that the registry rejects requests to a failing host only."""
+    registry = HostHealthRegistry()
+    for _ in range(3):
+        assert registry.acquire('dubz.link', now=0)
+        registry.release('dubz.link', latency=10.0, ok=False, now=0)
+
+    assert not registry.acquire('dubz.link', now=1)
+    assert registry.acquire('streamff.live', now=1)
+
+    snapshot = registry.snapshot()
+    assert snapshot['dubz.link']['circuit'] == 'open'
+    assert snapshot['dubz.link']['rejected'] == 1
+    assert snapshot['dubz.link']['in_flight'] == 0
+    assert snapshot['streamff.live']['circuit'] == 'closed'
+
+def test_registry_waits_for_a_slot_on_a_saturated_host():
+    """Test that a saturated host is waited on, while an open circuit is rejected at once."""
+    registry = HostHealthRegistry()
+    assert registry.acquire('streamff.live')
+    assert registry.acquire('streamff.live')
+    assert not registry.acquire('streamff.live')  # No wait by default
+
+    releaser = threading.Timer(0.1, registry.release, args=('streamff.live',), kwargs={'latency': 0.1, 'ok': True})
+    releaser.start()
+    started = time.monotonic()
+    assert registry.acquire('streamff.live', timeout=2)
+    assert 0.05 < time.monotonic() - started < 1.5
+    assert not registry.acquire('streamff.live', timeout=0.05)
+    assert registry.snapshot()['streamff.live']['waited'] == 2
+
+    for _ in range(3):
+        assert registry.acquire('dubz.link')
+        registry.release('dubz.link', latency=10.0, ok=False)
+    started = time.monotonic()
+    assert not registry.acquire('dubz.link', timeout=2)
+    assert time.monotonic() - started < 0.5
+
+def test_slot_wait_is_timed_on_the_real_clock():
+    """Test that a slot wait ends on time while a virtual clock stands still."""
+    registry = HostHealthRegistry()
+    registry.acquire('streamff.live')
+    registry.acquire('streamff.live')
+    results = []
+    previous = clock.set_clock(clock.VirtualClock(start=0))
+    try:
+        waiter = threading.Thread(target=lambda: results.append(registry.acquire('streamff.live', timeout=0.1)),
+                                  daemon=True)
+        waiter.start()
+        waiter.join(2)
+    finally:
+        clock.set_clock(previous)
+    assert results == [False]
@@ -0,0 +1,116 @@
+"""Tests for two-tier polling of the new-posts listing."""
+
+import pytest
+from src.services.listing_poller import ListingPoller, SeenIds
+
+class MockSubmission:
+    """Mock Reddit submission for testing."""
+    def __init__(self, number: int):
+        self.id = f"p{number}"
+        self.url = f"https://streamff.live/v/{number}"
+
+class FakeSubreddit:
+    """Listing serving the newest posts first."""
+    def __init__(self, reddit):
+        self.reddit = reddit
+
+    async def new(self, limit=100):
+        self.reddit.limits.append(limit)
+        for submission in self.reddit.posts[::-1][:limit]:
+            yield submission
+
+class FakeReddit:
+    """Fake asyncpraw client recording listing limits."""
+    def __init__(self):
+        self.posts = []
+        self.limits = []
+
+    def publish(self, count: int):
+        start = len(self.posts)
+        self.posts += [MockSubmission(start + i) for i in range(count)]
+
+    async def subreddit(self, name):
+        return FakeSubreddit(self)
+
+def make_poller() -> ListingPoller:
+    """Create a poller with small limits."""
+    return ListingPoller(head_limit=5, full_limit=50, sweep_interval=60, seen_limit=100)
+
+@pytest.mark.asyncio
+async def test_head_probe_returns_only_new_posts():
+    """Test that steady-state polls read a small head and skip seen posts."""
+    reddit = FakeReddit()
+    reddit.publish(30)
+    poller = make_poller()
+
+    assert len(await poller.poll(reddit, now=0)) == 30  # First poll is a full sweep
+    reddit.publish(2)
+    new = await poller.poll(reddit, now=5)
+
+    assert [s.id for s in new] == ["p31", "p30"]
+    assert reddit.limits == [50, 5]
+    assert await poller.poll(reddit, now=10) == []
+
+@pytest.mark.asyncio
+async def test_burst_escalates_to_full_page():
+    """Test that a head full of unseen posts escalates to a full page."""
+    reddit = FakeReddit()
+    reddit.publish(10)
+    poller = make_poller()
+    await poller.poll(reddit, now=0)
+
+    reddit.publish(12)
+    new = await poller.poll(reddit, now=5)
+
+    assert len(new) == 12
+    assert reddit.limits == [50, 5, 50]
+    assert poller.stats["escalations"] == 1
+
+@pytest.mark.asyncio
+async def test_periodic_full_sweep():
+    """Test that a full page is read once the sweep interval passes."""
+    reddit = FakeReddit()
+    reddit.publish(10)
+    poller = make_poller()
+    await poller.poll(reddit, now=0)
+    await poller.poll(reddit, now=30)
+    await poller.poll(reddit, now=61)
+
+    assert reddit.limits == [50, 5, 50]
+    assert poller.stats == {"head": 1, "escalations": 0, "sweeps": 2, "new": 10}
+
+@pytest.mark.asyncio
+async def test_requests_per_poll_counts_escalations():
+    """Test that an escalated head probe counts as two listing requests."""
+    reddit = FakeReddit()
+    reddit.publish(10)
+    poller = make_poller()
+    assert poller.requests_per_poll() == 1.0
+
+    await poller.poll(reddit, now=0)
+    reddit.publish(6)
+    await poller.poll(reddit, now=5)  # Escalates
+
+    assert len(reddit.limits) == 3
+    assert poller.requests_per_poll() == 1.5
+
+def test_seen_ids_are_bounded():
+    """Test that the oldest ids are forgotten beyond the limit."""
+    seen = SeenIds(limit=3)
+    for submission_id in ["a", "b", "c", "d"]:
+        seen.add(submission_id)
+    assert len(seen) == 3
+    assert "a" not in seen
+    assert "d" in seen
+
+@pytest.mark.asyncio
+async def test_forgotten_post_is_returned_again():
+    """Test that a post whose processing failed comes back on the next poll."""
+    reddit = FakeReddit()
+    reddit.publish(10)
+    poller = make_poller()
+    await poller.poll(reddit, now=0)
+
+    poller.forget("p8")
+    assert [s.id for s in await poller.poll(reddit, now=5)] == ["p8"]
+    assert await poller.poll(reddit, now=10) == []
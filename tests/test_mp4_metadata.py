@@ -0,0 +1,52 @@
+"""Tests for finding MP4 links in submission metadata without network access."""
+
+import pytest
+from src.services import reddit_service
+from src.services.reddit_service import find_mp4_in_metadata, extract_mp4_link
+
+class MockSubmission:
+    """Mock Reddit submission with listing metadata."""
+    def __init__(self, url: str = "https://www.reddit.com/r/soccer/comments/abc/x/", **fields):
+        self.url = url
+        self.media = fields.pop('media', None)
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+REDDIT_VIDEO = {'reddit_video': {'fallback_url': 'https://v.redd.it/abc/DASH_720.mp4?source=fallback'}}
+
+@pytest.mark.parametrize("submission,expected", [
+    (MockSubmission(url="https://cdn.example.com/goal.mp4"), "https://cdn.example.com/goal.mp4"),
+    (MockSubmission(media=REDDIT_VIDEO), REDDIT_VIDEO['reddit_video']['fallback_url']),
+    (MockSubmission(secure_media=REDDIT_VIDEO), REDDIT_VIDEO['reddit_video']['fallback_url']),
+    (MockSubmission(preview={'reddit_video_preview': {'fallback_url': 'https://v.redd.it/p/DASH_480.mp4'}}),
+     "https://v.redd.it/p/DASH_480.mp4"),
+    (MockSubmission(preview={'images': [{'variants': {'mp4': {'source': {'url': 'https://preview.redd.it/g.gif?format=mp4'}}}}]}),
+     "https://preview.redd.it/g.gif?format=mp4"),
+    (MockSubmission(crosspost_parent_list=[{'url': 'https://v.redd.it/abc', 'secure_media': REDDIT_VIDEO}]),
+     REDDIT_VIDEO['reddit_video']['fallback_url']),
+    (MockSubmission(crosspost_parent_list=[{'url_overridden_by_dest': 'https://cdn.example.com/x.mp4?t=1'}]),
+     "https://cdn.example.com/x.mp4?t=1"),
+])
+def test_find_mp4_in_metadata(submission, expected):
+    """Test each MP4-bearing metadata field."""
+    assert find_mp4_in_metadata(submission) == expected
+
+@pytest.mark.parametrize("submission", [
+    MockSubmission(url="https://streamff.live/v/abc"),
+    MockSubmission(media={'oembed': {'thumbnail_url': 'https://x/y.jpg'}}),
+    MockSubmission(preview={'images': [{'source': {'url': 'https://preview.redd.it/a.jpg'}}]}),
+    MockSubmission(crosspost_parent_list=[{'url': 'https://streamin.one/v/abc', 'media': None}]),
+])
+def test_no_mp4_in_metadata(submission):
+    """Test submissions whose metadata has no MP4."""
+    assert find_mp4_in_metadata(submission) is None
+
+@pytest.mark.asyncio
+async def test_metadata_hit_skips_mirror(monkeypatch):
+    """Test that a metadata hit is served without calling the video extractor."""
+    monkeypatch.setattr(reddit_service, "extraction_stats", {'metadata': 0, 'mirror': 0})
+    monkeypatch.setattr(reddit_service.video_extractor, "extract_mp4_url", lambda url: pytest.fail("mirror called"))
+
+    submission = MockSubmission(url="https://streamff.live/v/abc", secure_media=REDDIT_VIDEO)
+    assert await extract_mp4_link(submission) == REDDIT_VIDEO['reddit_video']['fallback_url']
+    assert reddit_service.extraction_stats == {'metadata': 1, 'mirror': 0}
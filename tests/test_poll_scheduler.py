@@ -0,0 +1,49 @@
+"""Tests for match-calendar aware polling."""
+
+import json
+from datetime import datetime, timezone, timedelta
+from src.services.poll_scheduler import PollScheduler
+
+KICKOFF = datetime(2024, 12, 26, 15, 0, tzinfo=timezone.utc)
+
+def make_scheduler(tmp_path, fixtures=None) -> PollScheduler:
+    """Create a scheduler reading fixtures from a temporary file."""
+    filename = tmp_path / "fixtures.json"
+    if fixtures is not None:
+        filename.write_text(json.dumps(fixtures))
+    return PollScheduler(filename=str(filename), live_interval=5, idle_interval=300, default_interval=30,
+                         match_length_minutes=110, buffer_minutes=20)
+
+def test_no_fixtures_file_uses_fixed_interval(tmp_path):
+    """Test the fallback to the old fixed interval."""
+    scheduler = make_scheduler(tmp_path)
+    assert scheduler.plan(KICKOFF) == 30
+    assert scheduler.snapshot(KICKOFF)["mode"] == "fixed"
+
+def test_live_window_polls_fast(tmp_path):
+    """Test fast polling from kickoff until full time plus the stoppage buffer."""
+    scheduler = make_scheduler(tmp_path, [{"kickoff": "2024-12-26T15:00:00Z", "home": "Arsenal", "away": "Chelsea"}])
+
+    assert scheduler.plan(KICKOFF + timedelta(minutes=1)) == 5
+    snapshot = scheduler.snapshot(KICKOFF + timedelta(minutes=1))
+    assert snapshot["mode"] == "live"
+    assert snapshot["live"] == [{"home": "Arsenal", "away": "Chelsea", "kickoff": KICKOFF.isoformat()}]
+    assert snapshot["next_poll"] == (KICKOFF + timedelta(minutes=1, seconds=5)).isoformat()
+
+    assert scheduler.plan(KICKOFF + timedelta(minutes=129)) == 5
+    assert scheduler.plan(KICKOFF + timedelta(minutes=131)) == 300
+    assert scheduler.mode == "idle"
+
+def test_heartbeat_wakes_up_for_kickoff(tmp_path):
+    """Test that the idle heartbeat never sleeps past the next kickoff."""
+    scheduler = make_scheduler(tmp_path, [{"kickoff": "2024-12-26T15:00:00", "home": "Arsenal", "away": "Chelsea"}])
+
+    assert scheduler.plan(KICKOFF - timedelta(hours=3)) == 300
+    assert scheduler.plan(KICKOFF - timedelta(seconds=60)) == 60
+    assert scheduler.snapshot(KICKOFF - timedelta(seconds=60))["next_fixture"]["home"] == "Arsenal"
+
+def test_invalid_fixtures_file_is_ignored(tmp_path):
+    """Test that a broken fixtures file falls back to the fixed interval."""
+    (tmp_path / "fixtures.json").write_text("not json")
+    scheduler = make_scheduler(tmp_path)
+    assert scheduler.plan(KICKOFF) == 30
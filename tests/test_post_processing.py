@@ -2,7 +2,11 @@
 
 import pytest
 from datetime import datetime, timezone, timedelta
-from src.main import contains_goal_keyword, contains_excluded_term, process_submission
+from src import main
+from src.main import contains_goal_keyword, contains_excluded_term, process_submission, attach_duplicate_source
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.posted_state import PostedState
+from src.utils.retry_schedule import AvailabilityTracker
 
 class MockSubmission:
     """Mock Reddit submission for testing."""
@@ -115,3 +119,49 @@ async def test_url_domain_filtering(url: str, should_process: bool):
     
     result = await process_submission(submission)
     assert result == should_process, f"URL domain filtering failed for: {url}"
+
+@pytest.mark.asyncio
+async def test_duplicate_url_joins_original_extraction(monkeypatch):
+    """Test that a duplicate post's clip becomes an extra source for the original's job."""
+    async def probe(source):
+        return "https://cdn.example/fast.mp4" if "streamin" in source.url else None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    state = PostedState(None, None)
+    state.scores["Arsenal [1] - 0 Chelsea - Saka 12'"] = {'url': "https://streamff.com/v/slow"}
+    monkeypatch.setattr(main, "posted_state", state)
+    try:
+        original = MockSubmission("Arsenal [1] - 0 Chelsea - Saka 12'", "https://streamff.com/v/slow", 0)
+        future = scheduler.submit(original, max_retries=100, delay=0.02)
+        attach_duplicate_source("Arsenal [1] - 0 Chelsea - Saka 12'", "https://streamin.me/v/fast")
+        assert await future == "https://cdn.example/fast.mp4"
+    finally:
+        await scheduler.stop()
+
+@pytest.mark.asyncio
+async def test_duplicate_submission_is_skipped_and_joins_original_extraction(monkeypatch):
+    """Test that process_submission skips a repost of a posted goal and probes its clip for the original."""
+    async def probe(source):
+        return "https://cdn.example/fast.mp4" if "streamin" in source.url else None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    now = datetime.now(timezone.utc)
+    state = PostedState(None, None)
+    state.scores["Arsenal [1] - 0 Chelsea - Bukayo Saka 12'"] = {
+        'timestamp': now.isoformat(), 'url': "https://streamff.com/v/slow", 'reddit_url': "https://reddit.com/r/soccer/a"
+    }
+    monkeypatch.setattr(main, "posted_state", state)
+    try:
+        original = MockSubmission("Arsenal [1] - 0 Chelsea - Bukayo Saka 12'", "https://streamff.com/v/slow", 0)
+        future = scheduler.submit(original, max_retries=100, delay=0.02)
+        duplicate = MockSubmission("Arsenal [1] - 0 Chelsea - B. Saka 12'", "https://streamin.me/v/fast", now.timestamp())
+        duplicate.permalink = "/r/soccer/comments/b/x/"
+
+        assert await process_submission(duplicate) is False
+        assert state.stats['duplicates'] == 1
+        assert await future == "https://cdn.example/fast.mp4"
+    finally:
+        await scheduler.stop()
+        await state.stop()
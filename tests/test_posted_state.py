@@ -0,0 +1,208 @@
+"""Tests for the single-writer posted state and concurrent submission processing."""
+
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from src import main
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.listing_poller import ListingPoller
+from src.services.posted_state import DUPLICATE, IN_PROGRESS, URL_POSTED, PostedState
+from src.utils.retry_schedule import AvailabilityTracker
+
+GOAL = "Arsenal [1] - 0 Chelsea - Bukayo Saka 12'"
+REPOST = "Arsenal [1] - 0 Chelsea - B. Saka 12'"
+
+def record(url: str) -> dict:
+    return {'timestamp': datetime.now(timezone.utc).isoformat(), 'url': url, 'reddit_url': 'https://reddit.com/r/soccer/x'}
+
+class MockSubmission:
+    def __init__(self, id: str, title: str, url: str):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.created_utc = datetime.now(timezone.utc).timestamp()
+        self.permalink = f"/r/soccer/comments/{id}/"
+        self.media = None
+
+@pytest.mark.asyncio
+async def test_concurrent_reserves_of_one_goal_let_one_through():
+    """Test that of two simultaneous posts of the same goal only the first is reserved."""
+    state = PostedState(None, None)
+    now = datetime.now(timezone.utc)
+    try:
+        first, second = await asyncio.gather(
+            state.reserve(GOAL, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now),
+            state.reserve(REPOST, 'https://streamin.one/v/b', record('https://streamin.one/v/b'), now)
+        )
+        same_clip = await state.reserve(REPOST, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now)
+    finally:
+        await state.stop()
+
+    assert first.reserved
+    assert not second.reserved and second.reason == DUPLICATE and second.original_title == GOAL
+    assert same_clip.reason == IN_PROGRESS  # Reserved, though not posted yet
+    assert state.snapshot()['in_progress'] == 1
+
+@pytest.mark.asyncio
+async def test_commit_persists_and_release_frees_the_goal(tmp_path):
+    """Test that a committed post is saved and a released one can be posted again."""
+    urls_file, scores_file = str(tmp_path / "urls.pkl"), str(tmp_path / "scores.pkl")
+    state = PostedState(urls_file, scores_file)
+    now = datetime.now(timezone.utc)
+    try:
+        assert (await state.reserve(GOAL, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now)).reserved
+        await state.release(GOAL, 'https://streamff.live/v/a')
+        assert (await state.reserve(REPOST, 'https://streamin.one/v/b', record('https://streamin.one/v/b'), now)).reserved
+        await state.commit(REPOST, 'https://streamin.one/v/b', record('https://streamin.one/v/b'))
+    finally:
+        await state.stop()
+
+    reloaded = PostedState(urls_file, scores_file)
+    assert reloaded.urls == {'https://streamin.one/v/b'}
+    assert list(reloaded.scores) == [REPOST]
+    assert state.snapshot()['in_progress'] == 0
+    assert state.stats['released'] == 1 and state.stats['committed'] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_processing_posts_a_goal_once(monkeypatch):
+    """Test that reposts processed while the first post is still going out are skipped."""
+    posted = []
+
+    async def slow_post_to_discord(content, team_data=None):
+        await asyncio.sleep(0.05)
+        posted.append(content)
+        return True
+
+    async def probe(job):
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    monkeypatch.setattr(main, "post_to_discord", slow_post_to_discord)
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    submissions = [
+        MockSubmission('a', GOAL, 'https://streamff.live/v/a'),
+        MockSubmission('b', REPOST, 'https://streamin.one/v/b'),
+        MockSubmission('c', GOAL, 'https://streamff.live/v/a'),
+        MockSubmission('d', "Liverpool [2] - 1 Everton - Mohamed Salah 30'", 'https://streamff.live/v/d')
+    ]
+    try:
+        results = await main.process_submissions(submissions)
+    finally:
+        await scheduler.stop()
+        await main.posted_state.stop()
+
+    assert results == [True, False, False, True]
+    assert len(posted) == 2
+    assert main.posted_state.urls == {'https://streamff.live/v/a', 'https://streamff.live/v/d'}
+
+@pytest.mark.asyncio
+async def test_failed_post_lets_a_repost_through(monkeypatch):
+    """Test that a goal whose Discord post failed is posted from the next repost."""
+    results = [False, True]
+    posted = []
+
+    async def flaky_post_to_discord(content, team_data=None):
+        posted.append(content)
+        return results.pop(0)
+
+    async def probe(job):
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    poller = ListingPoller()
+    poller.seen.add('a')
+    monkeypatch.setattr(main, "post_to_discord", flaky_post_to_discord)
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    monkeypatch.setattr(main, "listing_poller", poller)
+    try:
+        assert not await main.process_submission(MockSubmission('a', GOAL, 'https://streamff.live/v/a'))
+        assert 'a' not in poller.seen  # The next poll returns it again
+        assert await main.process_submission(MockSubmission('b', REPOST, 'https://streamin.one/v/b'))
+    finally:
+        await scheduler.stop()
+        await main.posted_state.stop()
+
+    assert len(posted) == 2
+    assert main.posted_state.urls == {'https://streamin.one/v/b'}
+    assert list(main.posted_state.scores) == [REPOST]
+
+@pytest.mark.asyncio
+async def test_release_keeps_an_earlier_record():
+    """Test that releasing a forced re-reservation restores the record it replaced."""
+    state = PostedState(None, None)
+    now = datetime.now(timezone.utc)
+    original = record('https://streamff.live/v/a')
+    try:
+        await state.reserve(GOAL, 'https://streamff.live/v/a', original, now)
+        await state.commit(GOAL, 'https://streamff.live/v/a', original)
+        assert (await state.reserve(GOAL, 'https://streamin.one/v/b', record('https://streamin.one/v/b'), now,
+                                    ignore_duplicates=True)).reserved
+        await state.release(GOAL, 'https://streamin.one/v/b')
+    finally:
+        await state.stop()
+
+    assert state.scores == {GOAL: original}
+    assert state.urls == {'https://streamff.live/v/a'}
+
+@pytest.mark.asyncio
+async def test_duplicate_during_posting_joins_the_extraction(monkeypatch):
+    """Test that a duplicate arriving while the original is posted becomes a source of its extraction job."""
+    async def slow_post_to_discord(content, team_data=None):
+        await asyncio.sleep(0.05)
+        return True
+
+    probed = []
+
+    async def probe(source):
+        probed.append(source.url)
+        return "https://cdn.streamin.one/b.mp4" if "streamin" in source.url else None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    monkeypatch.setattr(main, "post_to_discord", slow_post_to_discord)
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+    mp4_posts = []
+
+    async def post_mp4_link(title, mp4_url, team_data=None):
+        mp4_posts.append(mp4_url)
+        return True
+
+    monkeypatch.setattr(main, "post_mp4_link", post_mp4_link)
+    try:
+        results = await main.process_submissions([
+            MockSubmission('a', GOAL, 'https://streamff.live/v/a'),
+            MockSubmission('b', REPOST, 'https://streamin.one/v/b')
+        ])
+        await asyncio.wait_for(scheduler.join(), 5)  # Only the held duplicate's clip has the MP4
+        await asyncio.gather(*main.mp4_followup_tasks)
+    finally:
+        await scheduler.stop()
+        await main.posted_state.stop()
+
+    assert results == [True, False]
+    assert 'https://streamin.one/v/b' in probed
+    assert mp4_posts == ["https://cdn.streamin.one/b.mp4"]
+    assert main.posted_state.reservations == {}
+
+@pytest.mark.asyncio
+async def test_forced_reservation_waits_for_the_post_in_progress():
+    """Test that ignoring duplicates can't take over a URL that is being posted."""
+    state = PostedState(None, None)
+    now = datetime.now(timezone.utc)
+    first = record('https://streamff.live/v/a')
+    try:
+        assert (await state.reserve(GOAL, 'https://streamff.live/v/a', first, now)).reserved
+        forced = await state.reserve(REPOST, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now,
+                                     ignore_duplicates=True)
+        await state.commit(GOAL, 'https://streamff.live/v/a', first)
+        after = await state.reserve(REPOST, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now)
+        assert (await state.reserve(REPOST, 'https://streamff.live/v/a', record('https://streamff.live/v/a'), now,
+                                    ignore_duplicates=True)).reserved
+    finally:
+        await state.stop()
+
+    assert not forced.reserved and forced.reason == IN_PROGRESS
+    assert after.reason == URL_POSTED
+    assert state.scores[GOAL] is first
@@ -0,0 +1,91 @@
+"""Tests for the on-demand sampling profiler and allocation snapshots."""
+
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from src import main
+from src.utils.profiler import SamplingProfiler
+
+def spin_in_thread(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+async def spin_on_loop(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        sum(range(2_000_000))  # Longer than the GIL switch interval
+        await asyncio.sleep(0)
+
+retained = []
+
+async def allocate_on_loop(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        retained.append(bytearray(1024))
+        await asyncio.sleep(0.001)
+
+@pytest.mark.asyncio
+async def test_profile_samples_threads_and_event_loop():
+    """Test that executor threads and coroutines on the event loop both show up."""
+    profiler = SamplingProfiler()
+    thread_stop, loop_stop = threading.Event(), asyncio.Event()
+    thread = threading.Thread(target=spin_in_thread, args=(thread_stop,), name='mirror-worker')
+    thread.start()
+    task = asyncio.create_task(spin_on_loop(loop_stop))
+    try:
+        collapsed = await profiler.profile(0.3, interval=0.005)
+    finally:
+        thread_stop.set()
+        loop_stop.set()
+        thread.join()
+        await task
+
+    lines = collapsed.splitlines()
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any(line.startswith('mirror-worker;') and 'spin_in_thread (tests/test_profiler.py' in line for line in lines)
+    assert any('spin_on_loop (tests/test_profiler.py' in line for line in lines)
+    assert profiler.last['rounds'] >= 3
+    assert not profiler.running
+
+@pytest.mark.asyncio
+async def test_allocations_reports_growth_during_window():
+    """Test that allocations held after the window are attributed to their line."""
+    profiler = SamplingProfiler()
+    stop = asyncio.Event()
+    task = asyncio.create_task(allocate_on_loop(stop))
+    try:
+        report = await profiler.allocations(0.2, limit=5)
+    finally:
+        stop.set()
+        await task
+        retained.clear()
+
+    top = report['top'][0]
+    assert 'tests/test_profiler.py' in top['location'][0]
+    assert top['size_diff_kib'] > 10
+    assert not report['traced_before']
+
+@pytest.mark.asyncio
+async def test_one_profile_at_a_time():
+    """Test that a second profile is refused while one is running."""
+    profiler = SamplingProfiler()
+    running = asyncio.create_task(profiler.profile(0.2))
+    await asyncio.sleep(0.05)
+    with pytest.raises(RuntimeError):
+        await profiler.allocations(0.1)
+    await running
+    assert (await profiler.allocations(0.01))['seconds'] == 0.01
+
+@pytest.mark.asyncio
+async def test_endpoints_hidden_unless_enabled(monkeypatch):
+    """Test that the profiling endpoints are 404 unless PROFILING_ENABLED is set."""
+    monkeypatch.setattr(main, "PROFILING_ENABLED", False)
+    for endpoint in (main.profile(0.01, 0.005), main.allocations(0.01, 5, 'lineno', 1)):
+        with pytest.raises(HTTPException) as error:
+            await endpoint
+        assert error.value.status_code == 404
+
+    monkeypatch.setattr(main, "PROFILING_ENABLED", True)
+    response = await main.profile(0.05, 0.005)
+    assert response.status_code == 200
+    assert response.headers['content-disposition'].endswith('.collapsed"')
+    assert b'MainThread;' in response.body
@@ -0,0 +1,71 @@
+"""Tests for the Reddit rate-limit budget governor."""
+
+from src.utils.rate_governor import RateGovernor
+
+NOW = 1_700_000_000.0
+
+class FakeAuth:
+    """Fake asyncpraw auth exposing rate limits."""
+    def __init__(self, remaining, used):
+        self.limits = {'remaining': remaining, 'used': used}
+
+class FakeReddit:
+    """Fake asyncpraw client with rate-limit info."""
+    def __init__(self, remaining, used):
+        self.auth = FakeAuth(remaining, used)
+
+def test_unknown_budget_allows_everything():
+    """Test that nothing is throttled before Reddit has reported limits."""
+    governor = RateGovernor(window=600, reserve=5)
+    assert governor.grant('comments', 10, now=NOW) == 10
+    assert governor.poll_interval(5, now=NOW) == 5
+
+def test_observe_reads_asyncpraw_limits():
+    """Test reading the budget from reddit.auth.limits, deriving the reset from the clock."""
+    governor = RateGovernor(window=600, reserve=5)
+    governor.observe(FakeReddit(remaining=400.0, used=200))
+    snapshot = governor.snapshot()
+    assert snapshot['remaining'] == 400.0
+    assert 0 < snapshot['reset_in'] <= 600
+
+    governor.observe(object())  # Clients without limits are ignored
+    assert governor.snapshot()['remaining'] == 400.0
+
+def test_poll_interval_stretches_to_fit_window():
+    """Test that polling slows down only when the desired rate would run out."""
+    governor = RateGovernor(window=600, reserve=5)
+    governor.update(remaining=605, used=0, reset_seconds=300, now=NOW)
+    assert governor.poll_interval(5, now=NOW) == 5  # 60 polls fit in 600 requests
+
+    governor.update(remaining=35, used=565, reset_seconds=300, now=NOW)
+    assert governor.poll_interval(5, now=NOW) == 10  # 30 requests left for 300s
+
+    governor.update(remaining=3, used=597, reset_seconds=120, now=NOW)
+    assert governor.poll_interval(5, now=NOW) == 120  # Wait for the reset
+
+def test_poll_interval_counts_escalated_polls():
+    """Test that polls making more than one request are stretched and reserved accordingly."""
+    governor = RateGovernor(window=600, reserve=5)
+    governor.update(remaining=65, used=535, reset_seconds=300, now=NOW)
+    assert governor.poll_interval(5, now=NOW) == 5  # 60 single-request polls fit
+    assert governor.poll_interval(5, requests_per_poll=1.5, now=NOW) == 7.5  # Every other poll escalates
+    assert governor.snapshot(now=NOW)['consumers']['poll']['rate'] == 0.2
+
+def test_lower_priorities_get_what_is_left():
+    """Test that refreshes and comment scans can't eat the polling budget."""
+    governor = RateGovernor(window=600, reserve=5)
+    governor.update(remaining=85, used=515, reset_seconds=300, now=NOW)
+    governor.poll_interval(5, now=NOW)  # Reserves 60 requests for polling
+    governor.expect('refresh', 20)      # Reserves 15 requests for refreshes
+
+    assert governor.grant('comments', 10, now=NOW) == 5
+    assert governor.grant('comments', 10, now=NOW) == 0
+    assert governor.grant('refresh', 3, now=NOW) == 3
+    assert governor.stats['comments'] == {'granted': 5, 'denied': 15}
+
+def test_budget_resets_with_the_window():
+    """Test that a passed reset time frees the budget until Reddit reports again."""
+    governor = RateGovernor(window=600, reserve=5)
+    governor.update(remaining=0, used=600, reset_seconds=10, now=NOW)
+    assert governor.grant('refresh', 2, now=NOW) == 0
+    assert governor.grant('refresh', 2, now=NOW + 11) == 2
@@ -0,0 +1,117 @@
+"""Tests for raw JSON Reddit ingestion."""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from src.services.reddit_json import RedditJSONClient, RedditJSONSession, SubmissionSnapshot
+from src.services.reddit_service import fetch_new_submissions, find_mp4_in_metadata
+from src.services.submission_refresher import fetch_submissions
+
+def listing(items, after=None):
+    """Wrap submission data dictionaries in a Reddit listing."""
+    return {'kind': 'Listing', 'data': {'after': after, 'children': [{'kind': 't3', 'data': item} for item in items]}}
+
+POSTS = [
+    {'id': f'p{i}', 'title': f'Arsenal [{i}] - 0 Chelsea', 'url': f'https://streamff.live/v/{i}',
+     'permalink': f'/r/soccer/comments/p{i}/x/', 'created_utc': 1000.0 - i, 'subreddit': 'soccer',
+     'media': None, 'score': 1, 'selftext': ''}
+    for i in range(150)
+]
+
+@pytest_asyncio.fixture
+async def reddit_server():
+    """Serve a token endpoint, a paged listing, /api/info and comments."""
+    calls = []
+
+    async def token(request):
+        calls.append('token')
+        return web.json_response({'access_token': 'tok', 'expires_in': 3600})
+
+    async def new(request):
+        assert request.headers['Authorization'] == 'bearer tok'
+        calls.append(f"new:{request.query['limit']}:{request.query.get('after', '')}")
+        start = int(request.query['after'][1:]) + 1 if 'after' in request.query else 0
+        items = POSTS[start:start + int(request.query['limit'])]
+        after = items[-1]['id'] if start + len(items) < len(POSTS) else None
+        return web.json_response(listing(items, after), headers={
+            'x-ratelimit-remaining': '590.0', 'x-ratelimit-used': '10', 'x-ratelimit-reset': '300'
+        })
+
+    async def info(request):
+        ids = request.query['id'].split(',')
+        return web.json_response(listing([post for post in POSTS if f"t3_{post['id']}" in ids]))
+
+    async def comments(request):
+        comment = {'kind': 't1', 'data': {'id': 'c1', 'body': 'https://dubz.link/v/m', 'author': 'AutoModerator',
+                                          'stickied': True, 'replies': ''}}
+        return web.json_response([listing(POSTS[:1]), {'kind': 'Listing', 'data': {'children': [comment, {'kind': 'more'}]}}])
+
+    app = web.Application()
+    app.router.add_post('/api/v1/access_token', token)
+    app.router.add_get('/r/{sub}/new', new)
+    app.router.add_get('/api/info', info)
+    app.router.add_get('/comments/{id}', comments)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    session = RedditJSONSession('id', 'secret', 'test', oauth_url=f'http://127.0.0.1:{port}',
+                                reddit_url=f'http://127.0.0.1:{port}')
+    yield RedditJSONClient(session), calls
+    await session.close()
+    await runner.cleanup()
+
+def test_snapshot_keeps_only_used_fields():
+    """Test that snapshots are slotted and drop unused fields."""
+    snapshot = SubmissionSnapshot.from_data(POSTS[0])
+    assert snapshot.title == 'Arsenal [0] - 0 Chelsea'
+    assert snapshot.preview is None
+    assert not hasattr(snapshot, '__dict__')
+    assert not hasattr(snapshot, 'score')
+    assert SubmissionSnapshot.from_submission(snapshot) is snapshot
+
+def test_snapshot_preview_keeps_only_mp4_parts():
+    """Test that image resolutions are dropped but MP4 variants still resolve."""
+    preview = {'images': [{'source': {'url': 'https://preview.redd.it/a.jpg'},
+                           'resolutions': [{'url': 'https://preview.redd.it/a-108.jpg'}],
+                           'variants': {'mp4': {'source': {'url': 'https://preview.redd.it/a.gif?format=mp4'}}}}]}
+    snapshot = SubmissionSnapshot.from_data({**POSTS[0], 'url': 'https://streamff.live/v/x', 'preview': preview})
+
+    assert find_mp4_in_metadata(snapshot) == 'https://preview.redd.it/a.gif?format=mp4'
+    assert 'resolutions' not in snapshot.preview['images'][0]
+    assert SubmissionSnapshot.from_data({**POSTS[0], 'preview': {'images': [{'source': {}}]}}).preview is None
+
+def test_snapshot_crosspost_parents_keep_only_mp4_fields():
+    """Test that crosspost parents are slimmed but their Reddit video still resolves."""
+    video = {'reddit_video': {'fallback_url': 'https://v.redd.it/abc/DASH_720.mp4'}}
+    parent = {**POSTS[0], 'url': 'https://v.redd.it/abc', 'secure_media': video, 'selftext': 'x' * 1000,
+              'preview': {'images': [{'source': {'url': 'https://preview.redd.it/a.jpg'}}]}}
+    snapshot = SubmissionSnapshot.from_data({**POSTS[0], 'url': 'https://www.reddit.com/r/soccer/comments/b/',
+                                             'crosspost_parent_list': [parent]})
+
+    assert find_mp4_in_metadata(snapshot) == 'https://v.redd.it/abc/DASH_720.mp4'
+    assert set(snapshot.crosspost_parent_list[0]) == {'url', 'url_overridden_by_dest', 'media', 'secure_media', 'preview'}
+    assert snapshot.crosspost_parent_list[0]['preview'] is None
+
+@pytest.mark.asyncio
+async def test_listing_is_paged_with_one_token(reddit_server):
+    """Test paging, token reuse and rate-limit headers."""
+    reddit, calls = reddit_server
+    submissions = [s async for s in fetch_new_submissions(reddit, limit=120, subreddits=['soccer'])]
+
+    assert [s.id for s in submissions] == [f'p{i}' for i in range(120)]
+    assert all(isinstance(s, SubmissionSnapshot) for s in submissions)
+    assert calls == ['token', 'new:100:', 'new:20:p99']
+    assert reddit.auth.limits == {'remaining': 590.0, 'used': 10}
+
+@pytest.mark.asyncio
+async def test_info_and_comments(reddit_server):
+    """Test /api/info batches and comment loading."""
+    reddit, _ = reddit_server
+    submissions = await fetch_submissions(reddit, ['p3', 't3_p5', 'missing'])
+    assert sorted(s.id for s in submissions) == ['p3', 'p5']
+
+    submission = await reddit.submission(id='p0', fetch=False)
+    await submission.load()
+    assert [(c.author, c.body, c.stickied) for c in submission.comments] == [('AutoModerator', 'https://dubz.link/v/m', True)]
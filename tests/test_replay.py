@@ -0,0 +1,76 @@
+"""Tests for submission recording and replay."""
+
+import pytest
+from src import main
+from src.services.reddit_json import SubmissionSnapshot
+from src.services.submission_recorder import SubmissionRecorder
+from simulation.fake_reddit import load_submissions
+from simulation.replay import replay
+
+RECORDS = [
+    {'id': 'a1', 'title': "Arsenal [1] - 0 Chelsea - Bukayo Saka 12'", 'url': 'https://streamff.live/v/a1',
+     'permalink': '/r/soccer/comments/a1/x/', 'created_utc': 1000.0, 'subreddit': 'soccer'},
+    {'id': 'a2', 'title': "Arsenal [1] - 0 Chelsea - Saka 12'", 'url': 'https://streamin.one/v/a2',
+     'permalink': '/r/soccer/comments/a2/x/', 'created_utc': 1001.0, 'subreddit': 'soccer'},
+    {'id': 'a3', 'title': 'Match Thread: Arsenal vs Chelsea', 'url': 'https://www.reddit.com/r/soccer/comments/a3/',
+     'permalink': '/r/soccer/comments/a3/x/', 'created_utc': 1002.0, 'subreddit': 'soccer'},
+]
+
+def test_recorder_writes_compact_jsonl(tmp_path):
+    """Test that recorded submissions load back as the same data."""
+    filename = tmp_path / 'recording.jsonl'
+    recorder = SubmissionRecorder(str(filename))
+
+    assert recorder.record(SubmissionSnapshot.from_data(record) for record in RECORDS[:2]) == 2
+    assert recorder.record([SubmissionSnapshot.from_data(RECORDS[2])]) == 1
+
+    loaded = load_submissions(str(filename))
+    assert [record['id'] for record in loaded] == ['a1', 'a2', 'a3']
+    assert loaded[0]['title'] == RECORDS[0]['title']
+    assert loaded[0]['media'] is None
+    assert '", "' not in filename.read_text()  # Compact separators
+
+def test_recorder_keeps_preview_and_crosspost_parents(tmp_path):
+    """Test that the fields Reddit-hosted MP4s are found in are recorded, slimmed."""
+    filename = tmp_path / 'recording.jsonl'
+    video = {'fallback_url': 'https://v.redd.it/abc/DASH_720.mp4'}
+    record = {**RECORDS[0], 'url': 'https://v.redd.it/abc',
+              'preview': {'reddit_video_preview': video, 'images': [{'source': {'url': 'https://i.redd.it/x.jpg'}}]},
+              'crosspost_parent_list': [{'url': 'https://v.redd.it/abc', 'secure_media': {'reddit_video': video},
+                                         'selftext': 'x' * 1000}]}
+
+    SubmissionRecorder(str(filename)).record([SubmissionSnapshot.from_data(record)])
+
+    loaded = load_submissions(str(filename))[0]
+    assert loaded['preview'] == {'reddit_video_preview': video}
+    assert loaded['crosspost_parent_list'][0]['secure_media'] == {'reddit_video': video}
+    assert 'selftext' not in loaded['crosspost_parent_list'][0]
+    assert SubmissionSnapshot.from_data(loaded).preview == {'reddit_video_preview': video}
+
+def test_recorder_disabled_without_file():
+    """Test that nothing is recorded without a file."""
+    recorder = SubmissionRecorder(None)
+    assert recorder.record([SubmissionSnapshot.from_data(RECORDS[0])]) == 0
+    assert recorder.recorded == 0
+
+@pytest.mark.asyncio
+async def test_replay_reports_decisions():
+    """Test that a replay runs the pipeline with stubs and reports its decisions."""
+    posted_state = main.posted_state
+
+    report = await replay(RECORDS, speed=None, wait_for_mp4=True)
+
+    assert report['submissions'] == 3
+    assert report['decisions'] == {'posted': 1, 'Duplicate score detected': 1, 'Not a goal post': 1}
+    assert report['discord_posts'] == 1
+    assert report['mp4_posts'] == 1
+    assert report['pending_extractions'] == 0
+    assert set(report['decision_latency_ms']) == {'p50', 'p90', 'p99', 'max'}
+    assert main.posted_state is posted_state  # The real state is restored
+
+@pytest.mark.asyncio
+async def test_replay_keeps_recorded_spacing():
+    """Test that replay spaces submissions by their recorded gaps divided by the speed."""
+    report = await replay(RECORDS, speed=20)
+    assert report['elapsed_seconds'] >= 0.1  # 2s of recorded traffic at 20x
+    assert report['feed_lag_ms']['max'] < 100
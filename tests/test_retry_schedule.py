@@ -0,0 +1,67 @@
+"""Tests for the adaptive MP4 probe schedule."""
+
+import random
+import pytest
+from src.utils.retry_schedule import AvailabilityHistogram, AvailabilityTracker
+
+def make_tracker(samples=None, **kwargs) -> AvailabilityTracker:
+    """Create an in-memory tracker with optional history for 'streamff'."""
+    tracker = AvailabilityTracker(filename=None, rng=random.Random(1), **kwargs)
+    for seconds in samples or []:
+        tracker.record('streamff', seconds)
+    return tracker
+
+def test_histogram_quantile_buckets():
+    """Test quantile bucket lookup."""
+    histogram = AvailabilityHistogram()
+    for seconds in [12, 14, 25, 28, 29, 700]:
+        histogram.record(seconds)
+    assert histogram.total == 6
+    assert histogram.bucket_range(0.1) == (10, 15)
+    assert histogram.bucket_range(0.5) == (20, 30)
+    assert histogram.bucket_range(1.0) == (600, float('inf'))
+
+def test_fixed_delay_without_history():
+    """Test that hosts without enough history keep the fixed delay."""
+    tracker = make_tracker(samples=[20, 25])
+    assert tracker.expected_window('streamff') is None
+    assert tracker.next_delay('streamff', elapsed=40, remaining=200, default_delay=10) == 10
+    assert tracker.next_delay('dubz', elapsed=40, remaining=200, default_delay=10) == 10
+
+def test_waits_for_window_then_probes_densely():
+    """Test sparse waiting before the window and dense probing inside it."""
+    tracker = make_tracker(samples=[50, 55, 58, 60, 60], dense_interval=3)
+    assert tracker.expected_window('streamff') == (45, 60)
+
+    assert tracker.next_delay('streamff', elapsed=10, remaining=280, default_delay=10) == 35
+    assert tracker.next_delay('streamff', elapsed=50, remaining=240, default_delay=10) == 3
+
+def test_backs_off_exponentially_after_window():
+    """Test that probe spacing grows after the expected window with bounded jitter."""
+    tracker = make_tracker(samples=[5] * 5, dense_interval=3, backoff_factor=2, max_backoff=60, jitter=0.2)
+    elapsed = 5.0
+    delays = []
+    for _ in range(6):
+        delay = tracker.next_delay('streamff', elapsed=elapsed, remaining=10_000, default_delay=10)
+        delays.append(delay)
+        elapsed += delay
+
+    assert delays[0] == pytest.approx(3, rel=0.2)
+    assert delays[3] > delays[1] > delays[0] * 0.8
+    assert all(delay <= 60 * 1.2 for delay in delays)
+
+def test_respects_overall_deadline():
+    """Test that delays never run past the deadline."""
+    tracker = make_tracker()
+    assert tracker.next_delay('streamff', elapsed=100, remaining=4, default_delay=10) == 4
+    assert tracker.next_delay('streamff', elapsed=100, remaining=0, default_delay=10) is None
+
+def test_history_persists(tmp_path):
+    """Test that availability history survives a restart."""
+    filename = str(tmp_path / "availability.pkl")
+    tracker = AvailabilityTracker(filename=filename)
+    for _ in range(5):
+        tracker.record('dubz', 100)
+
+    reloaded = AvailabilityTracker(filename=filename)
+    assert reloaded.expected_window('dubz') == (90, 120)
@@ -4,6 +4,7 @@ import unittest
 from datetime import datetime, timezone, timedelta
 from src.utils.score_utils import (
     is_duplicate_score,
+    find_duplicate_score,
     extract_goal_info,
     normalize_player_name,
     normalize_score_pattern
@@ -159,6 +160,20 @@ class TestScoreUtils(unittest.TestCase):
 
         self._run_duplicate_tests(test_cases)
 
+    def test_find_duplicate_score_returns_original_title(self):
+        """Test that the matched original title is returned for a duplicate."""
+        original = "Arsenal [3] - 1 Crystal Palace - Gabriel Jesus 81'"
+        self.posted_scores["Arsenal [1] - 0 Crystal Palace - Saka 12'"] = {'url': 'https://example.com/post0'}
+        self.posted_scores[original] = {'url': 'https://example.com/post1'}
+
+        self.assertEqual(
+            find_duplicate_score("Arsenal [3] - 1 Crystal Palace - G. Jesus 82'", self.posted_scores, self.base_time),
+            original
+        )
+        self.assertIsNone(
+            find_duplicate_score("Arsenal [4] - 1 Crystal Palace - Saka 88'", self.posted_scores, self.base_time)
+        )
+
     def _run_duplicate_tests(self, test_cases):
         """Helper method to run duplicate detection tests."""
         for case in test_cases:
@@ -0,0 +1,83 @@
+"""Tests for poll liveness tracking and the /status endpoint."""
+
+import asyncio
+import pytest
+from src import main
+from src.services.posted_state import PostedState
+from src.utils.poll_monitor import PollMonitor
+
+def test_poll_monitor_flags_a_stalled_loop():
+    """Test that polling counts as stalled only once it is late by more than the allowance."""
+    monitor = PollMonitor(stall_seconds=120)
+    monitor.start()
+    monitor.finish(posts=3)
+    monitor.expect_next(30)
+    assert not monitor.stalled
+    assert monitor.snapshot()['next_due_in'] > 29
+
+    monitor.expect_next(-100)  # Due 100 seconds ago
+    assert not monitor.stalled
+    monitor.expect_next(-121)
+    assert monitor.stalled
+    assert monitor.snapshot()['overdue'] >= 121
+
+def test_poll_monitor_counts_consecutive_errors():
+    """Test that errors are counted and a good poll resets the streak."""
+    monitor = PollMonitor()
+    for _ in range(2):
+        monitor.start()
+        monitor.finish(error="Error iterating through posts: 503")
+    assert monitor.consecutive_errors == 2
+    monitor.start()
+    monitor.finish(posts=1)
+    snapshot = monitor.snapshot()
+    assert snapshot['consecutive_errors'] == 0
+    assert snapshot['errors'] == 2 and snapshot['polls'] == 3 and snapshot['posts'] == 1
+    assert snapshot['last_error'] == "Error iterating through posts: 503"
+    assert snapshot['last_duration'] is not None and not snapshot['running']
+
+@pytest.mark.asyncio
+async def test_status_reports_failed_and_stalled_polls(monkeypatch):
+    """Test that /status shows a failing poll and turns degraded when polling stalls."""
+    monitor = PollMonitor(stall_seconds=120)
+    monkeypatch.setattr(main, "poll_monitor", monitor)
+    state = PostedState(None, None)
+    state.urls.add("https://streamff.live/v/a")
+    monkeypatch.setattr(main, "posted_state", state)
+
+    async def failing_poll(reddit):
+        raise RuntimeError("listing unavailable")
+    monkeypatch.setattr(main.listing_poller, "poll", failing_poll)
+
+    await main.check_new_posts(None, reddit=object())
+    status = await main.pipeline_status()
+    assert status['status'] == 'ok'
+    assert status['poll']['errors'] == 1
+    assert 'listing unavailable' in status['poll']['last_error']
+    assert status['state']['posted_urls'] == 1
+    assert status['queues']['discord_waiting'] == 0
+    assert status['queues']['extraction_probing'] == 0
+    assert status['extractions']['pending'] == 0
+    assert set(status['caches']) == {'seen_ids', 'url_templates'}
+
+    monitor.expect_next(-300)
+    assert (await main.pipeline_status())['status'] == 'degraded'
+
+@pytest.mark.asyncio
+async def test_status_flags_a_first_poll_that_never_finishes(monkeypatch):
+    """Test that polling stuck on its first cycle after startup shows as stalled."""
+    monitor = PollMonitor(stall_seconds=0.01)
+    monkeypatch.setattr(main, "poll_monitor", monitor)
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+
+    async def hanging_client():
+        await asyncio.Event().wait()
+    monkeypatch.setattr(main, "create_reddit_client", hanging_client)
+
+    task = asyncio.create_task(main.periodic_check())
+    try:
+        await asyncio.sleep(0.05)
+        assert (await main.pipeline_status())['status'] == 'degraded'
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
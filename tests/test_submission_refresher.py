@@ -0,0 +1,80 @@
+"""Tests for batched /api/info submission refreshes."""
+
+import time
+import pytest
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.submission_refresher import SubmissionRefresher, fetch_submissions
+from src.utils.retry_schedule import AvailabilityTracker
+
+class MockSubmission:
+    """Mock Reddit submission for testing."""
+    def __init__(self, submission_id: str, url: str = "https://v.redd.it/abc", media=None):
+        self.id = submission_id
+        self.url = url
+        self.media = media
+        self.created_utc = time.time()
+
+class FakeReddit:
+    """Fake asyncpraw client serving /api/info from a dictionary."""
+    def __init__(self, submissions):
+        self.submissions = {f"t3_{s.id}": s for s in submissions}
+        self.requests = []
+
+    async def info(self, fullnames):
+        self.requests.append(list(fullnames))
+        for fullname in fullnames:
+            if fullname in self.submissions:
+                yield self.submissions[fullname]
+
+@pytest.mark.asyncio
+async def test_fetch_submissions_batches_by_100():
+    """Test that ids are fetched in chunks of at most 100 fullnames."""
+    reddit = FakeReddit([MockSubmission(f"id{i}") for i in range(250)])
+    ids = [f"id{i}" for i in range(250)] + ["t3_id0", "missing"]
+
+    submissions = await fetch_submissions(reddit, ids)
+
+    assert [len(batch) for batch in reddit.requests] == [100, 100, 51]
+    assert all(name.startswith("t3_") for batch in reddit.requests for name in batch)
+    assert len(submissions) == 250
+
+@pytest.mark.asyncio
+async def test_refresh_resolves_job_when_video_finishes_processing():
+    """Test that fresh media from /api/info resolves a pending extraction."""
+    async def probe(job):
+        return None
+
+    scheduler = ExtractionScheduler(probe=probe, workers=1, tracker=AvailabilityTracker(filename=None))
+    refresher = SubmissionRefresher(scheduler=scheduler)
+    try:
+        future = scheduler.submit(MockSubmission("abc"), max_retries=100, delay=10)
+        assert scheduler.pending_submission_ids() == {"abc"}
+
+        # Still processing on Reddit's side
+        await refresher.refresh_once(FakeReddit([MockSubmission("abc")]))
+        assert not future.done()
+
+        processed = MockSubmission("abc", media={"reddit_video": {"fallback_url": "https://v.redd.it/abc/DASH_720.mp4"}})
+        reddit = FakeReddit([processed])
+        assert await refresher.refresh_once(reddit) == 1
+        assert await future == "https://v.redd.it/abc/DASH_720.mp4"
+        assert reddit.requests == [["t3_abc"]]
+    finally:
+        await scheduler.stop()
+
+    assert refresher.stats["resolved"] == 1
+    assert scheduler.pending_submission_ids() == set()
+
+@pytest.mark.asyncio
+async def test_refresh_includes_requested_ids_once():
+    """Test that explicitly requested ids are refreshed on the next cycle only."""
+    scheduler = ExtractionScheduler(tracker=AvailabilityTracker(filename=None))
+    refresher = SubmissionRefresher(scheduler=scheduler)
+    refresher.request(["x1", "x2"])
+    reddit = FakeReddit([MockSubmission("x1"), MockSubmission("x2")])
+
+    await refresher.refresh_once(reddit)
+    await refresher.refresh_once(reddit)
+
+    assert len(reddit.requests) == 1
+    assert sorted(reddit.requests[0]) == ["t3_x1", "t3_x2"]
@@ -0,0 +1,88 @@
+"""Tests for reading several subreddits as one merged listing."""
+
+import time
+import pytest
+from src import main
+from src.services.listing_poller import ListingPoller
+from src.services.reddit_service import fetch_new_submissions
+
+class MockSubmission:
+    """Mock Reddit submission for testing."""
+    def __init__(self, submission_id: str, url: str, subreddit: str, age: float = 0):
+        self.id = submission_id
+        self.url = url
+        self.subreddit = subreddit
+        self.title = f"Arsenal [1] - 0 Chelsea - {submission_id}"
+        self.created_utc = time.time() - age
+
+class FakeSubreddit:
+    """Combined listing over several subreddits, newest first."""
+    def __init__(self, reddit, name: str):
+        self.reddit = reddit
+        self.name = name
+
+    async def new(self, limit=100):
+        self.reddit.listings.append(self.name)
+        names = set(self.name.split('+'))
+        items = [s for s in self.reddit.submissions if s.subreddit in names]
+        for submission in sorted(items, key=lambda s: -s.created_utc)[:limit]:
+            yield submission
+
+class FakeReddit:
+    """Fake asyncpraw client recording listing requests."""
+    def __init__(self, submissions):
+        self.submissions = submissions
+        self.listings = []
+
+    async def subreddit(self, name):
+        return FakeSubreddit(self, name)
+
+    async def close(self):
+        pass
+
+SUBMISSIONS = [
+    MockSubmission("a1", "https://streamin.one/v/abc", "PremierLeague", age=10),
+    MockSubmission("a2", "https://streamin.me/v/abc/", "soccer", age=5),  # Same clip, other TLD
+    MockSubmission("b1", "https://dubz.link/v/xyz", "soccer", age=20),
+    MockSubmission("c1", "https://streamff.live/v/qqq", "Gunners", age=1),
+]
+
+@pytest.mark.asyncio
+async def test_merged_listing_uses_one_request_and_dedupes():
+    """Test that subreddits share one listing request and repeated clips are dropped."""
+    reddit = FakeReddit(SUBMISSIONS)
+
+    submissions = [s async for s in fetch_new_submissions(reddit, subreddits=["soccer", "PremierLeague"])]
+
+    assert reddit.listings == ["soccer+PremierLeague"]
+    assert [s.id for s in submissions] == ["a2", "b1"]
+
+@pytest.mark.asyncio
+async def test_listing_requests_stay_flat_as_subreddits_are_added():
+    """Test that watching more subreddits doesn't add listing requests."""
+    reddit = FakeReddit(SUBMISSIONS)
+
+    submissions = [s async for s in fetch_new_submissions(reddit, subreddits=["soccer", "PremierLeague", "Gunners"])]
+
+    assert len(reddit.listings) == 1
+    assert [s.id for s in submissions] == ["c1", "a2", "b1"]
+
+@pytest.mark.asyncio
+async def test_check_new_posts_processes_merged_stream(monkeypatch):
+    """Test that check_new_posts processes each unique recent submission once."""
+    processed = []
+
+    async def fake_process(submission, ignore_duplicates=False):
+        processed.append(submission.id)
+        return True
+
+    monkeypatch.setattr(main, "process_submission", fake_process)
+    monkeypatch.setattr(main, "listing_poller", ListingPoller())
+    monkeypatch.setattr(main, "SUBREDDITS", ["soccer", "PremierLeague"])
+    monkeypatch.setattr("src.services.reddit_service.SUBREDDITS", ["soccer", "PremierLeague"])
+    reddit = FakeReddit(SUBMISSIONS)
+
+    await main.check_new_posts(None, reddit)
+
+    assert processed == ["a2", "b1"]
+    assert reddit.listings == ["soccer+PremierLeague"]
@@ -0,0 +1,133 @@
+"""Tests for per-submission tracing spans and the OTLP/JSON export."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from src import main
+from src.services import discord_service, reddit_service, video_service
+from src.services.extraction_scheduler import ExtractionScheduler
+from src.services.posted_state import PostedState
+from src.services.video_service import VideoExtractor
+from src.utils import clock
+from src.utils.host_health import HostHealthRegistry
+from src.utils.tracing import STATUS_ERROR, Tracer, load_traces, span_attributes
+from src.utils.url_templates import UrlTemplateStore
+from src.utils.webhook_limiter import WebhookLimiter
+from simulation.fake_discord import FakeDiscordWebhook
+from simulation.fake_mirrors import FakeMirrors, mirror_session
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """Turn tracing on, writing to a temporary file."""
+    filename = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(main.tracer, "filename", str(filename))
+    yield filename
+    main.tracer.flush()
+
+def spans_by_name(filename):
+    spans = [span for trace in load_traces(str(filename)).values() for span in trace]
+    return {span['name']: span for span in spans}, spans
+
+@pytest.mark.asyncio
+async def test_spans_follow_tasks_threads_and_stored_contexts(tmp_path):
+    """Test parenting through tasks, to_thread and an explicit stored context."""
+    tracer = Tracer(filename=str(tmp_path / "t.jsonl"))
+
+    @tracer.traced()
+    def in_thread():
+        return tracer.context()
+
+    with tracer.span('poll', root=True) as poll:
+        with tracer.span('submission', root=True, title='Arsenal [1] - 0 Chelsea') as root:
+            stored = tracer.context()
+            thread_context = await asyncio.to_thread(in_thread)
+            await asyncio.create_task(asyncio.sleep(0))
+    with tracer.span('attempt', parent=stored):
+        pass
+    with tracer.span('orphan'):
+        pass
+    with pytest.raises(ValueError):
+        with tracer.span('failing', root=True):
+            raise ValueError("boom")
+    tracer.flush()
+
+    spans, all_spans = spans_by_name(tmp_path / "t.jsonl")
+    assert 'orphan' not in spans  # Child spans outside a trace are not recorded
+    assert spans['submission']['traceId'] != poll.trace_id
+    assert spans['submission']['links'] == [{'traceId': poll.trace_id, 'spanId': poll.span_id}]
+    assert spans['in_thread']['parentSpanId'] == root.span_id
+    assert thread_context[0] == root.trace_id
+    assert spans['attempt']['traceId'] == root.trace_id
+    assert spans['attempt']['parentSpanId'] == root.span_id
+    assert spans['failing']['status'] == {'code': STATUS_ERROR, 'message': 'ValueError: boom'}
+    assert span_attributes(spans['submission']) == {'title': 'Arsenal [1] - 0 Chelsea'}
+    assert len(all_spans) == 5
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    """Test that spans are no-ops without a trace file."""
+    tracer = Tracer(filename=None)
+
+    @tracer.traced(root=True)
+    def work():
+        return 42
+
+    assert work() == 42
+    with tracer.span('root', root=True) as span:
+        span.set_attribute('ignored', True)
+        assert tracer.context() is None
+    tracer.flush()
+    assert tracer.stats['spans'] == 0
+
+@pytest.mark.asyncio
+async def test_goal_trace_covers_every_stage(trace_file, monkeypatch):
+    """Test that one goal's trace holds every stage, its extraction attempts and HTTP calls."""
+    discord = FakeDiscordWebhook()
+    await discord.start()
+    monkeypatch.setattr(discord_service, "DISCORD_WEBHOOK_URL", discord.webhook_url())
+    monkeypatch.setattr(discord_service, "webhook_limiter", WebhookLimiter())
+    monkeypatch.setattr(main, "posted_state", PostedState(None, None))
+    monkeypatch.setattr(video_service, "url_templates", UrlTemplateStore(filename=None))
+    monkeypatch.setattr(video_service, "host_health", HostHealthRegistry())
+    scheduler = ExtractionScheduler()
+    monkeypatch.setattr(main, "extraction_scheduler", scheduler)
+
+    with FakeMirrors() as mirrors:
+        monkeypatch.setattr(reddit_service, "video_extractor", VideoExtractor(session=mirror_session(mirrors)))
+        url = mirrors.add_clip("streamff", "tr4ce")
+        submission = SimpleNamespace(id='tr4ce', title="Arsenal [1] - 0 Chelsea - Bukayo Saka 12'", url=url,
+                                     permalink='/r/soccer/comments/tr4ce/x/', created_utc=clock.time() - 20,
+                                     subreddit='soccer', media=None)
+        try:
+            assert await main.process_submission(submission)
+            await scheduler.join()
+            await asyncio.gather(*main.mp4_followup_tasks)
+        finally:
+            await scheduler.stop()
+            await discord.stop()
+    main.tracer.flush()
+
+    traces = load_traces(str(trace_file))
+    assert len(traces) == 1
+    spans = next(iter(traces.values()))
+    names = [span['name'] for span in spans]
+    for stage in ('process_submission', 'find_team_in_title', 'contains_excluded_term', 'contains_goal_keyword',
+                  'find_duplicate_score', 'post_to_discord', 'extraction attempt', 'extract_mp4_link',
+                  'HEAD ffedge.streamff.com', 'post_mp4_link'):
+        assert stage in names
+    assert names.count('POST discord webhook') == 2
+
+    root = next(span for span in spans if span['name'] == 'process_submission')
+    attributes = span_attributes(root)
+    assert attributes['submission.title'] == submission.title
+    assert attributes['processed'] is True
+    assert float(attributes['ingest.delay_seconds']) >= 20
+    by_id = {span['spanId']: span for span in spans}
+    extract = next(span for span in spans if span['name'] == 'extract_mp4_link')
+    assert by_id[extract['parentSpanId']]['name'] == 'extraction attempt'
+    assert span_attributes(next(s for s in spans if s['name'] == 'HEAD ffedge.streamff.com'))['http.status_code'] == '200'
+
+    with open(trace_file) as f:
+        request = json.loads(f.readline())
+    assert request['resourceSpans'][0]['resource']['attributes'][0] == \
+        {'key': 'service.name', 'value': {'stringValue': 'goal-bot'}}
@@ -0,0 +1,142 @@
+"""Tests for learned per-host MP4 URL templates."""
+
+from types import SimpleNamespace
+import pytest
+from src.services import video_service
+from src.services.video_service import VideoExtractor
+from src.utils.url_templates import UrlTemplateStore, get_host_key, split_source_url
+
+@pytest.mark.parametrize("url,expected", [
+    ("https://streamin.one/v/abc123", "streamin"),
+    ("https://streamin.me/v/abc123", "streamin"),
+    ("https://www.streamable.com/xyz", "streamable"),
+    ("https://example.com/v/abc", "example.com"),
+])
+def test_host_key_ignores_tld(url: str, expected: str):
+    """Test that host keys don't depend on the TLD."""
+    assert get_host_key(url) == expected
+
+def test_split_source_url():
+    """Test splitting a clip URL into path pattern and video ID."""
+    assert split_source_url("https://streamin.one/v/abc123") == ("/v/{id}", "abc123")
+    assert split_source_url("https://streamable.com/xyz") == ("/{id}", "xyz")
+    assert split_source_url("https://streamable.com/") is None
+
+def test_learned_template_applies_to_other_clips_and_tlds():
+    """Test that a learned template predicts MP4 URLs for new clips on the same host."""
+    store = UrlTemplateStore(filename=None)
+    assert store.learn("https://streamin.one/v/abc123", "https://streamin.me/uploads/abc123.mp4")
+
+    assert store.candidate("https://streamin.fun/v/zzz999") == "https://streamin.me/uploads/zzz999.mp4"
+    assert store.candidate("https://streamin.one/e/zzz999") is None
+    assert store.candidate("https://dubz.link/v/zzz999") is None
+
+def test_signed_urls_are_not_learned():
+    """Test that URLs with query signatures can't become templates."""
+    store = UrlTemplateStore(filename=None)
+    assert not store.learn(
+        "https://streamable.com/xyz",
+        "https://cdn-cf-east.streamable.com/video/mp4/xyz.mp4?Expires=1&Signature=abc"
+    )
+    assert not store.learn("https://streamin.one/v/abc123", "https://streamin.me/uploads/other.mp4")
+    assert store.snapshot() == []
+
+def test_templates_persist(tmp_path):
+    """Test that learned templates survive a restart."""
+    filename = str(tmp_path / "templates.pkl")
+    UrlTemplateStore(filename).learn("https://streamin.one/v/abc", "https://cdn.streamin.me/u/abc.mp4")
+
+    reloaded = UrlTemplateStore(filename)
+    assert reloaded.candidate("https://streamin.one/v/def") == "https://cdn.streamin.me/u/def.mp4"
+
+def test_extractor_uses_template_before_page_parse(monkeypatch):
+    """Test that a template hit skips the page fetch entirely."""
+    store = UrlTemplateStore(filename=None)
+    store.learn("https://streamin.one/v/abc123", "https://streamin.xyz/uploads/abc123.mp4")
+    monkeypatch.setattr(video_service, "url_templates", store)
+
+    extractor = VideoExtractor()
+    probed = []
+    monkeypatch.setattr(extractor, "probe_mp4_url", lambda url: probed.append(url) or True)
+    monkeypatch.setattr(extractor, "validate_mp4_url", lambda url: pytest.fail("should not validate"))
+    monkeypatch.setattr(extractor, "_request", lambda *args, **kwargs: pytest.fail("should not fetch page"))
+
+    assert extractor.extract_from_streamin("https://streamin.one/v/new456") == "https://streamin.xyz/uploads/new456.mp4"
+    assert probed == ["https://streamin.xyz/uploads/new456.mp4"]
+    assert store.stats["hits"] == 1
+
+def test_extractor_falls_back_when_template_misses(monkeypatch):
+    """Test that a template miss falls back to the regular extractor."""
+    store = UrlTemplateStore(filename=None)
+    store.learn("https://streamable.com/abc", "https://cdn.streamable.com/video/abc.mp4")
+    monkeypatch.setattr(video_service, "url_templates", store)
+
+    extractor = VideoExtractor()
+    monkeypatch.setattr(extractor, "probe_mp4_url", lambda url: False)
+    monkeypatch.setattr(extractor, "_request", lambda *args, **kwargs: None)
+
+    for _ in range(5):  # Not up yet, or host unavailable: not the template's fault
+        assert extractor.extract_from_streamable("https://streamable.com/def") is None
+    assert store.stats["misses"] == 0
+    assert store.candidate("https://streamable.com/ghi") == "https://cdn.streamable.com/video/ghi.mp4"
+
+def test_template_misses_when_the_page_has_another_url(monkeypatch):
+    """Test that a template is dropped once page parses keep finding a different MP4 URL."""
+    store = UrlTemplateStore(filename=None, max_misses=2)
+    store.learn("https://streamable.com/abc", "https://cdn.streamable.com/video/abc.mp4")
+    monkeypatch.setattr(video_service, "url_templates", store)
+    signed = "https://cdn-cf-east.streamable.com/video/mp4/{}.mp4?Expires=1&Signature=abc"
+
+    def page(method, url, **kwargs):
+        video_id = url.rsplit('/', 1)[-1]
+        return SimpleNamespace(text=f'<video><source src="{signed.format(video_id)}"></video>',
+                               status_code=200, raise_for_status=lambda: None)
+
+    extractor = VideoExtractor()
+    monkeypatch.setattr(extractor, "probe_mp4_url", lambda url: False)
+    monkeypatch.setattr(extractor, "validate_mp4_url", lambda url: "Signature" in url)
+    monkeypatch.setattr(extractor, "_request", page)
+
+    assert extractor.extract_from_streamable("https://streamable.com/def") == signed.format("def")
+    assert store.stats["misses"] == 1 and store.candidate("https://streamable.com/x")
+    extractor.extract_from_streamable("https://streamable.com/ghi")
+    assert store.stats["evicted"] == 1
+    assert store.candidate("https://streamable.com/x") is None
+
+def test_template_is_dropped_after_consecutive_misses(tmp_path):
+    """Test that a template is dropped after max_misses misses in a row, and a hit resets the streak."""
+    filename = str(tmp_path / "templates.pkl")
+    store = UrlTemplateStore(filename, max_misses=2)
+    store.learn("https://streamin.one/v/abc", "https://cdn.streamin.me/u/abc.mp4")
+
+    store.record("https://streamin.one/v/def", hit=False)
+    store.record("https://streamin.one/v/ghi", hit=True)
+    store.record("https://streamin.one/v/jkl", hit=False)
+    reloaded = UrlTemplateStore(filename)
+    assert reloaded.snapshot()[0]['hits'] == 1 and reloaded.snapshot()[0]['consecutive_misses'] == 1
+
+    store.record("https://streamin.one/v/mno", hit=False)
+    assert store.candidate("https://streamin.one/v/pqr") is None
+    assert store.stats["evicted"] == 1
+    assert UrlTemplateStore(filename).snapshot() == []
+
+def test_streamin_page_url_is_learned_only_once_validated(monkeypatch):
+    """Test that an og:video URL that fails validation doesn't become a template."""
+    store = UrlTemplateStore(filename=None)
+    monkeypatch.setattr(video_service, "url_templates", store)
+    page = SimpleNamespace(
+        text='<meta property="og:video" content="https://cdn.streamin.pro/v2/abc123.mp4">',
+        url="https://streamin.one/v/abc123", status_code=200, headers={}, raise_for_status=lambda: None
+    )
+    valid = {"https://cdn.streamin.pro/v2/abc123.mp4": False}
+
+    extractor = VideoExtractor()
+    monkeypatch.setattr(extractor, "validate_mp4_url", lambda url: valid.get(url, False))
+    monkeypatch.setattr(extractor, "_request", lambda *args, **kwargs: page)
+
+    assert extractor.extract_from_streamin("https://streamin.one/v/abc123") == "https://cdn.streamin.pro/v2/abc123.mp4"
+    assert store.snapshot() == []
+
+    valid["https://cdn.streamin.pro/v2/abc123.mp4"] = True
+    extractor.extract_from_streamin("https://streamin.one/v/abc123")
+    assert store.candidate("https://streamin.one/v/new456") == "https://cdn.streamin.pro/v2/new456.mp4"